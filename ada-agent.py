@@ -2,10 +2,18 @@
 """
 Ada - Local Voice AI Agent
 A fully local, privacy-first voice AI agent built with LiveKit.
+
+Only the standard library is imported up front, so --help and argument
+errors return immediately; the agent stack loads once arguments are valid.
 """
-import argparse
 import sys
-import asyncio
+
+if "--profile-startup" in sys.argv:
+    # Before any other import, so the breakdown covers everything
+    from src.startup_profiler import enable_startup_profiling
+    enable_startup_profiling()
+
+import argparse
 import logging
 from pathlib import Path
 from datetime import datetime
@@ -13,8 +21,6 @@ from datetime import datetime
 # Ensure src is in path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from src.agent import run_agent
-
 
 def setup_logging(log_level: str = "INFO", log_file: str = None):
     """Setup logging configuration"""
@@ -48,6 +54,7 @@ Examples:
   %(prog)s                    # Start agent with default room
   %(prog)s --room my-room     # Connect to specific room
   %(prog)s --debug           # Enable debug logging
+  %(prog)s --profile-startup # Print an import/startup time breakdown
         """
     )
 
@@ -75,6 +82,12 @@ Examples:
         help="Enable debug mode (equivalent to --log-level DEBUG)"
     )
 
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Print import times per package and startup phase timings"
+    )
+
     args = parser.parse_args()
 
     if args.debug:
@@ -93,6 +106,11 @@ Examples:
     print()
     print("🔧 Initializing components...")
     
+    import asyncio
+    from src import startup_profiler
+    from src.agent import run_agent
+    startup_profiler.mark("agent imported")
+
     try:
         # Run the agent
         asyncio.run(run_agent(args.room))
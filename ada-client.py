@@ -1,5 +1,16 @@
 #!/usr/bin/env python3
-"""Enhanced Ada Voice Client with Rich interface and proper input handling"""
+"""Enhanced Ada Voice Client with Rich interface and proper input handling
+
+Rich, LiveKit and the audio stack are imported after the arguments are
+parsed, so --help and argument errors return immediately.
+"""
+import sys
+
+if "--profile-startup" in sys.argv:
+    # Before any other import, so the breakdown covers everything
+    from src.startup_profiler import enable_startup_profiling
+    enable_startup_profiling()
+
 import asyncio
 import threading
 import time
@@ -7,134 +18,6 @@ from datetime import datetime
 import argparse
 import logging
 import os
-import queue
-from typing import List, Tuple
-
-# Rich imports for UI
-from rich.console import Console
-from rich.layout import Layout
-from rich.panel import Panel
-from rich.text import Text
-from rich.live import Live
-from rich import box
-
-# Local imports
-from src.client import VoiceClient, StatusDisplay
-
-
-class ChatInterface:
-    """Chat interface with proper input handling"""
-    
-    def __init__(self):
-        self.conversation_history: List[Tuple[str, str, str]] = []  # (role, text, timestamp)
-        self.status_text = "📡 Connecting..."
-        self.text_input_queue = queue.Queue()
-        self.console = Console()
-        self.layout = Layout()
-        self.client = None
-        self.max_messages = 20
-        
-        self.create_layout()
-        
-    def create_layout(self):
-        """Create the layout structure"""
-        self.layout.split_column(
-            Layout(name="header", size=3),    # Title and status
-            Layout(name="main"),              # Conversation area
-            Layout(name="footer", size=5)     # Controls and input area
-        )
-        
-    def get_header_panel(self):
-        """Create header panel with title and status"""
-        header_text = Text()
-        header_text.append("🎯 Ada Voice Client - Enhanced Chat", style="bold blue")
-        header_text.append(f"\n{self.status_text}", style="green")
-        
-        return Panel(
-            header_text,
-            title="Status",
-            border_style="blue",
-            box=box.ROUNDED
-        )
-        
-    def get_conversation_panel(self):
-        """Create conversation panel with message history"""
-        if not self.conversation_history:
-            content = Text(
-                "💭 Conversation will appear here...\n\n"
-                "🎙️ Speak to Ada or use the input commands below", 
-                style="dim", justify="center")
-        else:
-            content = Text()
-            # Show recent messages
-            recent_messages = self.conversation_history[-self.max_messages:]
-            for role, text, timestamp in recent_messages:
-                if role == "user":
-                    content.append(f"[{timestamp}] ", style="dim")
-                    content.append("👤 You: ", style="cyan bold")
-                    content.append(f"{text}\n", style="cyan")
-                elif role == "agent":
-                    content.append(f"[{timestamp}] ", style="dim")
-                    content.append("🤖 Ada: ", style="green bold")
-                    content.append(f"{text}\n", style="green")
-                elif role == "system":
-                    content.append(f"[{timestamp}] ", style="dim")
-                    content.append("ℹ️  ", style="yellow")
-                    content.append(f"{text}\n", style="yellow")
-                content.append("\n")
-        
-        return Panel(
-            content,
-            title="Conversation",
-            border_style="white",
-            box=box.ROUNDED
-        )
-        
-    def get_footer_panel(self):
-        """Create footer panel with instructions"""
-        footer_text = Text()
-        footer_text.append("📝 INPUT METHODS:\n", style="bold yellow")
-        footer_text.append("  🎤 Voice: ", style="green")
-        footer_text.append("Speak naturally (default)\n", style="white")
-        footer_text.append("  💬 Text: ", style="cyan")
-        footer_text.append("Press 't' + Enter, then type message + Enter\n", style="white")
-        footer_text.append("  📋 Commands: ", style="magenta")
-        footer_text.append("'h' for help, 'q' to quit", style="white")
-        
-        return Panel(
-            footer_text,
-            title="Controls",
-            border_style="cyan",
-            box=box.ROUNDED
-        )
-        
-    def update_layout(self):
-        """Update the layout with current content"""
-        self.layout["header"].update(self.get_header_panel())
-        self.layout["main"].update(self.get_conversation_panel())
-        self.layout["footer"].update(self.get_footer_panel())
-        
-    def add_message(self, role: str, text: str):
-        """Add a message to the conversation history"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.conversation_history.append((role, text, timestamp))
-        
-    def update_status(self, status: str):
-        """Update the status text"""
-        self.status_text = status
-
-
-class EnhancedVoiceClient(VoiceClient):
-    """Enhanced voice client with chat integration"""
-    
-    def __init__(self, status, chat_interface, conversation_callback=None):
-        super().__init__(status, conversation_callback)
-        self.chat_interface = chat_interface
-        
-    async def send_text_message(self, message: str):
-        """Override to show sent messages in chat"""
-        await super().send_text_message(message)
-        self.chat_interface.add_message("user", f"💬 {message}")
 
 
 def setup_logging(log_level: str) -> str:
@@ -167,8 +50,7 @@ def setup_logging(log_level: str) -> str:
     return log_file
 
 
-async def main():
-    """Enhanced main function with chat interface"""
+def parse_args():
     parser = argparse.ArgumentParser(
         description="Ada Voice Client - Enhanced Chat")
     parser.add_argument("--room", default="test-room", 
@@ -176,8 +58,20 @@ async def main():
     parser.add_argument(
         "--log-level", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
         default="INFO", help="Logging level")
-    
-    args = parser.parse_args()
+    parser.add_argument(
+        "--profile-startup", action="store_true",
+        help="Print import times per package and startup phase timings on exit")
+    return parser.parse_args()
+
+
+async def main(args):
+    """Enhanced main function with chat interface"""
+    from rich.console import Console
+    from rich.live import Live
+    from src import startup_profiler
+    from src.chat_interface import ChatInterface, EnhancedVoiceClient
+    from src.client import StatusDisplay
+    startup_profiler.mark("client imported")
     
     # Setup logging
     log_file = setup_logging(args.log_level)
@@ -293,26 +187,25 @@ async def main():
         input_thread = threading.Thread(target=handle_input, daemon=True)
         input_thread.start()
         
-        # Create live display with slower refresh to reduce conflicts
-        with Live(chat_interface.layout, refresh_per_second=2, screen=True):
-            chat_interface.update_status("🔗 Connecting to Ada...")
-            chat_interface.update_layout()
-            
-            # Connect to Ada
-            await client.connect(args.room)
-            
+        @client.room.on("connected")
+        def on_connected():
+            startup_profiler.mark("room connected")
             chat_interface.update_status("✅ Connected - Voice & Text Ready")
             chat_interface.add_message(
                 "system",
                 "Connected! You can now speak to Ada or use text input")
-            chat_interface.update_layout()
+        
+        # Redraws happen only when something changes, coalesced by the scheduler
+        with Live(chat_interface.layout, auto_refresh=False, screen=True) as live:
+            render_task = asyncio.create_task(chat_interface.scheduler.run(live))
+            chat_interface.update_status("🔗 Connecting to Ada...")
             
-            # Main loop with reduced update frequency
-            while (client.room.connection_state == 
-                   client.room.ConnectionState.CONN_CONNECTED):
-                # Update display less frequently
-                chat_interface.update_layout()
-                await asyncio.sleep(0.5)  # 2fps instead of 4fps
+            try:
+                # Runs until the room disconnects
+                await client.connect(args.room)
+            finally:
+                render_task.cancel()
+                logger.info("Render stats: %s", chat_interface.scheduler.stats())
                 
     except KeyboardInterrupt:
         chat_interface.add_message("system", "Disconnecting...")
@@ -324,8 +217,10 @@ async def main():
     finally:
         if hasattr(client, 'disconnect'):
             await client.disconnect()
+        status.close()
         chat_interface.add_message("system", "Client stopped")
+        chat_interface.conversation_history.close()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main(parse_args()))
\ No newline at end of file
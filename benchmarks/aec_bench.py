@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Echo canceller CPU budget and convergence benchmark.
+
+Runs EchoCanceller over synthetic far-end speech played through a simulated
+room (bulk delay plus a decaying random impulse response) with a near-end
+talker joining halfway, block by block as the agent ingest path does, and
+reports per-block processing time against the frame duration along with the
+echo return loss enhancement (ERLE):
+
+  python benchmarks/aec_bench.py --sample-rate 48000 --frame-ms 10 --tail-ms 300 -o aec.json
+
+Exits non-zero when the p95 block time exceeds --budget-pct of a frame.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.echo_canceller import EchoCanceller
+from src.turn_tracer import percentile
+
+
+def speech_like(seconds, sample_rate, rng, f0=140.0, amplitude=6000.0):
+    """Harmonic signal with a syllable-rate envelope, gaps and a little noise"""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    pitch = f0 * (1 + 0.1 * np.sin(2 * np.pi * 0.7 * t))
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 10))
+    envelope = np.clip(np.sin(2 * np.pi * 3.5 * t), 0, None)
+    return amplitude * voiced * envelope / 2 + rng.normal(0, amplitude * 0.02, len(t))
+
+
+def room_response(sample_rate, rng, delay_ms, tail_ms, gain):
+    """Direct path after ``delay_ms`` followed by an exponentially decaying tail"""
+    delay = int(delay_ms / 1000 * sample_rate)
+    length = int(tail_ms / 1000 * sample_rate)
+    decay = np.exp(-np.arange(length) / (0.03 * sample_rate))
+    response = np.zeros(delay + length)
+    # Reverberant tail with half the energy of the direct path
+    response[delay:] = rng.normal(0, 1, length) * decay * np.sqrt(0.5 / np.sum(decay ** 2))
+    response[delay] = 1.0
+    return gain * response
+
+
+def run(args):
+    rng = np.random.default_rng(args.seed)
+    rate = args.sample_rate
+    block = int(rate * args.frame_ms / 1000)
+    far = speech_like(args.seconds, rate, rng)
+    echo = np.convolve(far, room_response(rate, rng, args.echo_delay_ms, args.echo_tail_ms, args.echo_gain))[:len(far)]
+
+    # The user starts talking over the agent for the last quarter
+    near_talk = np.zeros_like(far)
+    talk_start = int(len(far) * 0.75)
+    near_talk[talk_start:] = speech_like(args.seconds * 0.25, rate, rng, f0=210.0)[:len(far) - talk_start]
+    near = np.clip(echo + near_talk + rng.normal(0, 20, len(far)), -32768, 32767).astype(np.int16)
+
+    aec = EchoCanceller(block, rate, tail_ms=args.tail_ms)
+    times, false_double_talk, double_talk, talk_blocks = [], 0, 0, 0
+    outputs = []
+    for start in range(0, len(far) - block + 1, block):
+        near_block = near[start:start + block]
+        began = time.perf_counter()
+        out = aec.process(near_block, far[start:start + block])
+        times.append(time.perf_counter() - began)
+        outputs.append(out)
+        if start < talk_start:
+            false_double_talk += aec.double_talk
+        else:
+            double_talk += aec.double_talk
+            talk_blocks += 1
+
+    frame_seconds = block / rate
+    p95 = percentile(times, 95)
+    output = np.concatenate(outputs).astype(np.float64)
+
+    def erle(start, end):
+        return float(aec.erle_db(near[start:end], output[start:end]))
+
+    residual = output[talk_start:] - near_talk[talk_start:len(output)]
+    return {
+        "config": vars(args),
+        "block_samples": block,
+        "partitions": aec.partitions,
+        "block_ms": {
+            "p50": percentile(times, 50) * 1000,
+            "p95": p95 * 1000,
+            "max": max(times) * 1000,
+        },
+        "cpu_share_of_frame_p95": p95 / frame_seconds,
+        "within_budget": p95 / frame_seconds <= args.budget_pct / 100,
+        "erle_db": {
+            "first_second": erle(0, rate),
+            "before_double_talk": erle(talk_start - rate, talk_start),
+        },
+        "false_double_talk_share": false_double_talk / (len(times) - talk_blocks),
+        "double_talk_detected_share": double_talk / talk_blocks if talk_blocks else None,
+        "near_talker_to_residual_db": float(10 * np.log10(
+            np.mean(near_talk[talk_start:len(output)] ** 2) / (np.mean(residual ** 2) + 1e-9))),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Echo canceller benchmark")
+    parser.add_argument("--sample-rate", type=int, default=48000)
+    parser.add_argument("--frame-ms", type=float, default=10, help="Ingest frame size (default: 10)")
+    parser.add_argument("--tail-ms", type=float, default=300, help="Canceller filter length (default: 300)")
+    parser.add_argument("--seconds", type=float, default=12.0)
+    parser.add_argument("--echo-delay-ms", type=float, default=40)
+    parser.add_argument("--echo-tail-ms", type=float, default=150)
+    parser.add_argument("--echo-gain", type=float, default=0.3)
+    parser.add_argument("--budget-pct", type=float, default=10.0,
+                        help="Allowed p95 CPU time per block, in percent of the frame duration")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    report = run(args)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+        print(f"✅ Results written to {args.output}", file=sys.stderr)
+    print(output)
+    if not report["within_budget"]:
+        print(f"❌ p95 block time {report['block_ms']['p95']:.3f} ms exceeds "
+              f"{args.budget_pct}% of a {args.frame_ms} ms frame", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
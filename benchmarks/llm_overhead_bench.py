@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+LLM token-loop overhead benchmark: our code against raw backend throughput.
+
+A synthetic backend yields LiveKit-style chat chunks as fast as the event
+loop allows, so every microsecond measured is spent in our code rather than
+in a model. Each stage consumes the same stream:
+
+  raw        iterate the native chunks, reading ``chunk.delta.content``
+  ladder     the old per-chunk ``hasattr`` ladder and f-string debug logging
+  adapter    OpenAICompatibleBackend.stream (typed adapter -> LLMChunk)
+  agent      ConversationAgent.generate_response with an ``on_token`` callback
+             (generation limits disabled, but still checked per chunk)
+
+and reports tokens/sec plus the overhead per token relative to ``raw``:
+
+  python benchmarks/llm_overhead_bench.py --tokens 20000 --repeats 5 -o llm_overhead.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.generation_policy import GenerationPolicy
+from src.llm_backends import OpenAICompatibleBackend
+
+logger = logging.getLogger("llm_overhead_bench")
+
+
+class SyntheticLLM:
+    """Stands in for the OpenAI plugin's LLM: ``chat`` streams ``tokens`` chunks"""
+
+    def __init__(self, tokens: int):
+        # Text ends a sentence every 15 tokens, as replies do
+        self.chunks = [SimpleNamespace(id="bench", delta=SimpleNamespace(
+                           role="assistant", content=" end." if i % 15 == 14 else " tok"))
+                       for i in range(tokens)]
+
+    async def chat(self, chat_ctx=None):
+        for chunk in self.chunks:
+            yield chunk
+
+
+class SyntheticBackend(OpenAICompatibleBackend):
+    """The real backend loop, minus building a LiveKit ChatContext"""
+
+    def _chat(self, messages):
+        return self.llm.chat()
+
+
+def ladder_text(chunk) -> str:
+    """Chunk handling as generate_response did it before typed adapters"""
+    logger.debug(f"LLM chunk received: {type(chunk)} - {chunk}")
+    content = None
+    if hasattr(chunk, 'choices') and chunk.choices:
+        choice = chunk.choices[0]
+        if hasattr(choice, 'delta') and hasattr(choice.delta, 'content'):
+            content = choice.delta.content
+    elif hasattr(chunk, 'delta') and chunk.delta:
+        if hasattr(chunk.delta, 'content'):
+            content = chunk.delta.content
+    elif hasattr(chunk, 'content'):
+        content = chunk.content
+    elif hasattr(chunk, 'text'):
+        content = chunk.text
+    else:
+        logger.debug(f"Unhandled chunk format: {dir(chunk)}")
+    if isinstance(content, list):
+        content = "".join(str(c) for c in content)
+    return content or ""
+
+
+async def stage_raw(llm):
+    parts = []
+    async for chunk in llm.chat():
+        parts.append(chunk.delta.content)
+    return parts
+
+
+async def stage_ladder(llm):
+    parts = []
+    async for chunk in llm.chat():
+        text = ladder_text(chunk)
+        if text:
+            parts.append(text)
+    return parts
+
+
+async def stage_adapter(llm):
+    parts = []
+    async for chunk in SyntheticBackend(llm, "bench").stream([]):
+        if chunk.text:
+            parts.append(chunk.text)
+    return parts
+
+
+def make_agent_stage(llm):
+    from src.conversation_agent import ConversationAgent
+
+    status = SimpleNamespace(set_thinking=lambda thinking: None)
+    agent = ConversationAgent(status, conversation_callback=lambda role, text: None)
+    agent.llm = SyntheticBackend(llm, "bench")
+    # Limits off, so the whole stream is consumed (the limiter's cost is still included)
+    agent.generation = GenerationPolicy(max_tokens=0, max_sentences=0, deadline=0)
+    system = agent.messages[:1]
+
+    async def stage_agent(_llm):
+        agent.messages = list(system)
+        tokens = []
+        reply = await agent.generate_response("hello", on_token=tokens.append)
+        return tokens if reply else []
+    return stage_agent
+
+
+async def measure(stage, llm, repeats):
+    await stage(llm)  # Warm-up
+    times = []
+    for _ in range(repeats):
+        began = time.perf_counter()
+        parts = await stage(llm)
+        times.append(time.perf_counter() - began)
+        if len(parts) != len(llm.chunks):
+            raise RuntimeError(f"{stage.__name__} produced {len(parts)} of {len(llm.chunks)} tokens")
+    return min(times)
+
+
+async def run(args):
+    llm = SyntheticLLM(args.tokens)
+    stages = {"raw": stage_raw, "ladder": stage_ladder, "adapter": stage_adapter,
+              "agent": make_agent_stage(llm)}
+    seconds = {}
+    for name, stage in stages.items():
+        print(f"⏱️  {name}...", file=sys.stderr)
+        seconds[name] = await measure(stage, llm, args.repeats)
+
+    raw = seconds["raw"]
+    return {
+        "config": vars(args),
+        "stages": {name: {"tokens_per_s": args.tokens / s,
+                          "overhead_us_per_token": (s - raw) / args.tokens * 1e6}
+                   for name, s in seconds.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM token-loop overhead benchmark")
+    parser.add_argument("--tokens", type=int, default=20000, help="Chunks per streamed reply")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per stage; the fastest is reported")
+    parser.add_argument("--log-level", default="WARNING",
+                        help="Logging level during the run (DEBUG shows what chunk logging costs)")
+    parser.add_argument("-o", "--output", help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level, stream=sys.stderr)
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+        print(f"✅ Results written to {args.output}", file=sys.stderr)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
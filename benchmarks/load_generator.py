@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Headless load generator for the Ada agent.
+
+Starts many SyntheticVoiceClient participants from one process, spread over
+several rooms, each streaming prerecorded utterances with realistic pauses.
+Reports the time from the end of each utterance until Ada's audio track
+starts responding. Run one agent per room against `livekit-server --dev`:
+
+  python benchmarks/load_generator.py samples/*.wav --clients 200 --rooms 50
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.synthetic_client import SAMPLE_RATE, SyntheticVoiceClient, run_synthetic_client
+from src.turn_tracer import percentile
+from src.wav_utils import load_wav
+
+
+def _distribution(values):
+    if not values:
+        return None
+    return {
+        "count": len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "max": max(values),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Simulate many concurrent Ada voice clients")
+    parser.add_argument("wav", nargs="+", help="16-bit PCM WAV utterances to stream")
+    parser.add_argument("--clients", type=int, default=10, help="Number of simulated participants")
+    parser.add_argument("--rooms", type=int, default=1, help="Number of rooms to spread clients over")
+    parser.add_argument("--room-prefix", default="load", help="Room name prefix (rooms are PREFIX-N)")
+    parser.add_argument("--turns", type=int, help="Utterances per client (default: one per WAV file)")
+    parser.add_argument("--ramp-up", type=float, default=10.0, help="Seconds over which clients join")
+    parser.add_argument("--pause-mean", type=float, default=2.0, help="Mean think time between turns")
+    parser.add_argument("--pause-jitter", type=float, default=1.0, help="Std dev of think time")
+    parser.add_argument("--response-threshold", type=int, default=300,
+                        help="RMS level that counts as Ada responding")
+    parser.add_argument("--response-timeout", type=float, default=15.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="Write JSON results to this file")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, args.log_level.upper()))
+
+    utterances = [load_wav(path, SAMPLE_RATE) for path in args.wav]
+    clients = [
+        SyntheticVoiceClient(
+            utterances,
+            turns=args.turns,
+            pause_mean=args.pause_mean,
+            pause_jitter=args.pause_jitter,
+            response_threshold=args.response_threshold,
+            response_timeout=args.response_timeout,
+            seed=args.seed + i,
+        )
+        for i in range(args.clients)
+    ]
+    step = args.ramp_up / max(1, args.clients)
+
+    print(f"🚀 Starting {args.clients} clients across {args.rooms} room(s)...", file=sys.stderr)
+    started = time.monotonic()
+    # VoiceClient prints connection progress; keep the terminal readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = await asyncio.gather(
+            *(
+                run_synthetic_client(client, f"{args.room_prefix}-{i % args.rooms}", i * step)
+                for i, client in enumerate(clients)
+            ),
+            return_exceptions=True,
+        )
+    wall = time.monotonic() - started
+
+    errors = [repr(r) for r in results if isinstance(r, Exception)]
+    latencies = [latency for client in clients for latency in client.latencies]
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "config": {
+            "clients": args.clients,
+            "rooms": args.rooms,
+            "turns": args.turns or len(utterances),
+            "wav": [str(p) for p in args.wav],
+            "ramp_up": args.ramp_up,
+        },
+        "wall_seconds": wall,
+        "connected_clients": sum(1 for c in clients if c.connected_at is not None),
+        "errors": len(errors),
+        "error_samples": errors[:5],
+        "responses": len(latencies),
+        "timeouts": sum(c.timeouts for c in clients),
+        "response_latency_s": _distribution(latencies),
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
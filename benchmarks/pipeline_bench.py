@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Offline end-to-end pipeline benchmark.
+
+Feeds recorded WAV utterances through the real VoicePipeline.process_audio →
+ConversationAgent.transcribe → generate_response → tts.synthesize path, with
+the LiveKit pieces swapped out:
+
+  * a fake rtc.AudioStream that yields frames from the WAV files
+  * a local stub of the OpenAI-compatible chat endpoint (streams a canned reply)
+  * a fake AudioSource that "plays" frames in real time
+
+Whisper and Piper are the real local models. Results are printed as JSON so
+runs can be diffed between commits:
+
+  python benchmarks/pipeline_bench.py samples/*.wav --sessions 1 2 4 -o bench.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from livekit import rtc
+
+from src.agent import VoicePipeline
+from src.conversation_agent import ConversationAgent
+from src.metrics import AgentMetrics
+from src.status_indicator import StatusIndicator
+from src.turn_tracer import TurnTracer, percentile
+from src.wav_utils import iter_frames, load_wav
+
+logger = logging.getLogger("pipeline_bench")
+
+INPUT_SAMPLE_RATE = 48000
+STUB_REPLY = (
+    "Sure, that sounds like a great idea. "
+    "Let me know if there is anything else I can help you with today."
+)
+
+
+class QuietStatus(StatusIndicator):
+    """Status indicator that keeps state but never prints"""
+
+    def _print_status(self, values):
+        pass
+
+
+class FakeAudioStream:
+    """Stands in for rtc.AudioStream, yielding frames from recorded utterances"""
+
+    def __init__(self, utterances, frame_ms=20, trailing_silence=1.5, realtime=False):
+        self._utterances = utterances
+        self._samples_per_frame = INPUT_SAMPLE_RATE * frame_ms // 1000
+        self._frame_seconds = frame_ms / 1000
+        self._silence = np.zeros(int(INPUT_SAMPLE_RATE * trailing_silence), dtype=np.int16)
+        self._realtime = realtime
+
+    async def __aiter__(self):
+        start = time.monotonic()
+        sent = 0
+        for audio in self._utterances:
+            for samples in iter_frames(np.concatenate([audio, self._silence]), self._samples_per_frame):
+                frame = rtc.AudioFrame(
+                    data=samples.tobytes(),
+                    sample_rate=INPUT_SAMPLE_RATE,
+                    num_channels=1,
+                    samples_per_channel=len(samples),
+                )
+                yield rtc.AudioFrameEvent(frame=frame)
+                sent += 1
+                if self._realtime:
+                    delay = start + sent * self._frame_seconds - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                else:
+                    # Let other sessions and the audio sender run
+                    await asyncio.sleep(0)
+
+
+class FakeAudioSource:
+    """Stands in for rtc.AudioSource, simulating real-time playout"""
+
+    def __init__(self, sample_rate=48000):
+        self.sample_rate = sample_rate
+        self._playout_done = time.monotonic()
+        self.frames = 0
+
+    async def capture_frame(self, frame):
+        now = time.monotonic()
+        self._playout_done = max(now, self._playout_done) + frame.samples_per_channel / frame.sample_rate
+        self.frames += 1
+
+    async def wait_for_playout(self):
+        delay = self._playout_done - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class StubLLMServer:
+    """Local OpenAI-compatible /v1/chat/completions endpoint streaming a canned reply"""
+
+    def __init__(self, reply=STUB_REPLY, tokens_per_second=60.0, first_token_delay=0.15):
+        self.reply = reply
+        self.tokens_per_second = tokens_per_second
+        self.first_token_delay = first_token_delay
+        self._runner = None
+        self.port = None
+
+    async def start(self):
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self._chat)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    async def _chat(self, request):
+        from aiohttp import web
+
+        body = await request.json()
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        await asyncio.sleep(self.first_token_delay)
+        tokens = self.reply.split(" ")
+        for i, token in enumerate(tokens):
+            chunk = {
+                "id": "bench",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": body.get("model", "stub"),
+                "choices": [{
+                    "index": 0,
+                    "delta": {"role": "assistant", "content": token if i == 0 else " " + token},
+                    "finish_reason": None,
+                }],
+            }
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            await asyncio.sleep(1.0 / self.tokens_per_second)
+        final = {
+            "id": "bench",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+        }
+        await response.write(f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n".encode())
+        await response.write_eof()
+        return response
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+
+
+class CollectingExporter:
+    """Keeps finished traces in memory"""
+
+    def __init__(self):
+        self.traces = []
+
+    def export(self, trace):
+        self.traces.append(trace)
+
+    def close(self):
+        pass
+
+
+def _distribution(values):
+    if not values:
+        return None
+    return {"count": len(values), "p50": percentile(values, 50), "p95": percentile(values, 95)}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+
+
+async def run_sessions(base_agent, utterances, sessions, args):
+    """Run several concurrent sessions over the same utterances"""
+    collector = CollectingExporter()
+    tracer = TurnTracer([collector])
+    pipelines = []
+    for i in range(sessions):
+        metrics = AgentMetrics()
+        status = QuietStatus(metrics)
+        agent = ConversationAgent(status, conversation_callback=lambda role, text: None, metrics=metrics)
+        # Share the loaded models; per-session state stays separate
+        agent.stt, agent.tts, agent.llm = base_agent.stt, base_agent.tts, base_agent.llm
+        pipeline = VoicePipeline(
+            agent, status, tracer, metrics,
+            audio_stream_factory=lambda track: FakeAudioStream(
+                utterances, args.frame_ms, args.trailing_silence, args.realtime),
+        )
+        pipelines.append(pipeline)
+
+    sources = [FakeAudioSource() for _ in pipelines]
+    senders = [asyncio.create_task(p.audio_sender(src)) for p, src in zip(pipelines, sources)]
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    cpu_before = time.process_time()
+    wall_before = time.monotonic()
+
+    await asyncio.gather(*(
+        p.process_audio(track=None, participant=SimpleNamespace(identity=f"bench-{i}"))
+        for i, p in enumerate(pipelines)
+    ))
+    for p in pipelines:
+        await p.audio_queue.put(None)
+    await asyncio.gather(*senders)
+
+    wall = time.monotonic() - wall_before
+    cpu = time.process_time() - cpu_before
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    for p in pipelines:
+        p.status.close()
+
+    stt_rtf, tts_rtf, e2e = [], [], []
+    for trace in collector.traces:
+        stages = trace.stages()
+        if "stt" in stages and trace.attributes.get("utterance_seconds"):
+            stt_rtf.append(stages["stt"] / trace.attributes["utterance_seconds"])
+        if "tts" in stages and trace.attributes.get("tts_audio_seconds"):
+            tts_rtf.append(stages["tts"] / trace.attributes["tts_audio_seconds"])
+        if "response" in stages:
+            e2e.append(stages["response"])
+
+    outcomes = {}
+    for trace in collector.traces:
+        outcomes[trace.outcome] = outcomes.get(trace.outcome, 0) + 1
+
+    return {
+        "sessions": sessions,
+        "turns": len(collector.traces),
+        "outcomes": outcomes,
+        "wall_seconds": wall,
+        "stages_ms": tracer.summary(),
+        "real_time_factor": {"stt": _distribution(stt_rtf), "tts": _distribution(tts_rtf)},
+        "response_latency_s": _distribution(e2e),
+        "cpu_seconds_per_session": cpu / sessions,
+        "cpu_utilization": cpu / wall if wall else None,
+        # ru_maxrss is in KiB on Linux
+        "max_rss_mb": rss_after / 1024,
+        "rss_growth_mb_per_session": (rss_after - rss_before) / 1024 / sessions,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Offline Ada pipeline benchmark")
+    parser.add_argument("wav", nargs="+", help="16-bit PCM WAV utterances to feed")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1],
+                        help="Concurrent session counts to run (default: 1)")
+    parser.add_argument("--frame-ms", type=int, default=20, help="Input frame size (default: 20)")
+    parser.add_argument("--trailing-silence", type=float, default=1.5,
+                        help="Silence appended after each utterance in seconds (default: 1.5)")
+    parser.add_argument("--realtime", action="store_true",
+                        help="Feed input at real-time pace instead of as fast as consumed")
+    parser.add_argument("--llm-url", help="Use this OpenAI-compatible endpoint instead of the stub")
+    parser.add_argument("--stub-tokens-per-second", type=float, default=60.0)
+    parser.add_argument("--stub-first-token-delay", type=float, default=0.15)
+    parser.add_argument("-o", "--output", help="Write JSON results to this file")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, args.log_level.upper()))
+
+    utterances = [load_wav(path, INPUT_SAMPLE_RATE) for path in args.wav]
+
+    stub = None
+    if args.llm_url:
+        os.environ["OLLAMA_BASE_URL"] = args.llm_url
+    else:
+        stub = StubLLMServer(
+            tokens_per_second=args.stub_tokens_per_second,
+            first_token_delay=args.stub_first_token_delay,
+        )
+        os.environ["OLLAMA_BASE_URL"] = await stub.start()
+
+    try:
+        base_agent = ConversationAgent(QuietStatus())
+        await base_agent.initialize()
+
+        results = []
+        for sessions in args.sessions:
+            print(f"▶️  Running {sessions} concurrent session(s)...", file=sys.stderr)
+            results.append(await run_sessions(base_agent, utterances, sessions, args))
+    finally:
+        if stub:
+            await stub.stop()
+
+    report = {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "config": {
+            "wav": [str(p) for p in args.wav],
+            "utterance_seconds": [len(u) / INPUT_SAMPLE_RATE for u in utterances],
+            "whisper_model": os.getenv("WHISPER_MODEL", "base"),
+            "llm": args.llm_url or "stub",
+            "frame_ms": args.frame_ms,
+            "realtime": args.realtime,
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+        print(f"✅ Results written to {args.output}", file=sys.stderr)
+    print(output)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+TTS engine benchmark: Piper against Coqui on the same sentences.
+
+Each engine synthesizes every sentence through its async ``synthesize`` API
+(what the agent calls), after one warm-up call. Per engine it reports model
+load time, synthesis latency, real-time factor (synthesis time / audio
+time) and output rate; for engines that stream, the time to the first
+sentence of each multi-sentence paragraph against the time for all of it:
+
+  python benchmarks/tts_bench.py --engines piper coqui --coqui-model tts_models/multilingual/multi-dataset/xtts_v2 \\
+      --coqui-speaker-wav voice.wav -o tts.json
+
+An engine that is not installed is reported with its error instead of
+failing the run.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.turn_tracer import percentile
+
+SENTENCES = [
+    "Sure.",
+    "The meeting is at three o'clock tomorrow afternoon.",
+    "I couldn't find a file with that name, would you like me to create it?",
+    "It's about twenty two degrees and sunny right now, with light wind from the west.",
+    "Dr. Smith said the results should be ready by Friday, so we can go over them next week.",
+]
+PARAGRAPHS = [
+    "Here is what I found. The library opens at nine. It closes at six on weekdays "
+    "and at four on Saturdays, and it is closed on Sundays.",
+    "Good question. Whisper runs locally on your machine, so nothing you say leaves it. "
+    "The language model runs locally too.",
+]
+
+
+def build_engine(name, args):
+    if name == "piper":
+        from src.local_piper_tts import LocalPiperTTS
+        return LocalPiperTTS(
+            model_path=args.piper_model,
+            config_path=args.piper_config,
+            sample_rate=args.sample_rate or 48000,  # What the agent publishes
+        )
+    if name == "coqui":
+        from src.local_coqui_tts import LocalCoquiTTS
+        return LocalCoquiTTS(
+            model_name=args.coqui_model,
+            speaker_wav=args.coqui_speaker_wav,
+            device=args.coqui_device,
+            sample_rate=args.sample_rate,
+        )
+    raise ValueError(f"Unknown engine: {name}")
+
+
+def audio_seconds(result):
+    frame = result.frame
+    return frame.samples_per_channel / frame.sample_rate
+
+
+async def bench_engine(name, args, sentences):
+    began = time.perf_counter()
+    try:
+        engine = build_engine(name, args)
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+    load_seconds = time.perf_counter() - began
+
+    await engine.synthesize("Warming up.")
+    latencies, factors, rows = [], [], []
+    for sentence in sentences:
+        began = time.perf_counter()
+        result = await engine.synthesize(sentence)
+        elapsed = time.perf_counter() - began
+        seconds = audio_seconds(result)
+        latencies.append(elapsed)
+        factors.append(elapsed / seconds if seconds else float("inf"))
+        rows.append({"chars": len(sentence), "synth_ms": elapsed * 1000, "audio_s": seconds})
+
+    report = {
+        "load_s": load_seconds,
+        "sample_rate": engine.sample_rate,
+        "native_sample_rate": getattr(engine, "native_sample_rate", engine.sample_rate),
+        "synth_ms": {"p50": percentile(latencies, 50) * 1000, "p95": percentile(latencies, 95) * 1000},
+        "rtf": {"p50": percentile(factors, 50), "max": max(factors)},
+        "sentences": rows,
+    }
+
+    if hasattr(engine, "synthesize_stream"):
+        streamed = []
+        for paragraph in PARAGRAPHS:
+            began = time.perf_counter()
+            first = None
+            async for _ in engine.synthesize_stream(paragraph):
+                first = first or time.perf_counter() - began
+            streamed.append({"first_chunk_ms": first * 1000,
+                             "total_ms": (time.perf_counter() - began) * 1000})
+        report["streaming"] = streamed
+    return report
+
+
+async def run(args):
+    sentences = SENTENCES
+    if args.text_file:
+        sentences = [line.strip() for line in Path(args.text_file).read_text().splitlines() if line.strip()]
+    results = {}
+    for name in args.engines:
+        print(f"🔊 Benchmarking {name}...", file=sys.stderr)
+        results[name] = await bench_engine(name, args, sentences)
+    return {"config": vars(args), "engines": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TTS engine benchmark")
+    parser.add_argument("--engines", nargs="+", default=["piper", "coqui"], choices=["piper", "coqui"])
+    parser.add_argument("--text-file", help="Sentences to synthesize, one per line")
+    parser.add_argument("--sample-rate", type=int, default=None,
+                        help="Output rate to request (default: Piper 48000, Coqui native)")
+    parser.add_argument("--piper-model", default=os.getenv("PIPER_MODEL_PATH"))
+    parser.add_argument("--piper-config", default=os.getenv("PIPER_CONFIG_PATH"))
+    parser.add_argument("--coqui-model", default=os.getenv("COQUI_MODEL", "tts_models/en/ljspeech/tacotron2-DDC"))
+    parser.add_argument("--coqui-speaker-wav", default=os.getenv("COQUI_SPEAKER_WAV"))
+    parser.add_argument("--coqui-device", default=os.getenv("COQUI_DEVICE", "cpu"))
+    parser.add_argument("-o", "--output", help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+        print(f"✅ Results written to {args.output}", file=sys.stderr)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,7 @@ from pathlib import Path
 from typing import Optional, Callable
 import logging
 
-from rich.console import Console
+from rich.console import Console, Group
 from rich.live import Live
 from rich.layout import Layout
 from rich.panel import Panel
@@ -18,9 +18,11 @@ from rich.columns import Columns
 from rich.prompt import Prompt
 import rich.box
 
+from . import startup_profiler
 from .conversation_manager import ConversationManager
 from .voice_client import VoiceClient
 from .gui_status_display import GUIStatusDisplay
+from .render_scheduler import IncrementalText, RenderScheduler
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +38,16 @@ class AdaGUIClient:
         self.input_handler = None
         self.live = None
         self.pending_input = ""
+        self.scheduler = RenderScheduler(self.layout)
+        self.conversation_text = IncrementalText(
+            self._format_message, max_items=15,
+            placeholder=Text("💬 Conversation will appear here...", style="dim italic"))
+        self._conversation_cursor = 0
+        self.partial = {}  # role -> text still streaming in
+        self.scheduler.add_panel("header", self._create_header_panel)
+        self.scheduler.add_panel("conversation", self._create_conversation_panel)
+        self.scheduler.add_panel("status", self._create_status_panel)
+        self.scheduler.add_panel("input", self._create_input_panel)
         
     def _create_layout(self) -> Layout:
         """Create the main layout"""
@@ -72,31 +84,38 @@ class AdaGUIClient:
             title_align="left"
         )
         
+    def _format_message(self, msg) -> Text:
+        """Format one message; called once per message"""
+        content = Text()
+        content.append(f"[{self.conversation.timestamp(msg)}] ", style="dim")
+        if msg.role == 'user':
+            content.append("👤 You: ", style="bold green")
+            content.append(msg.text, style="white")
+        elif msg.role == 'agent':
+            content.append("🤖 Ada: ", style="bold blue")
+            content.append(msg.text, style="cyan")
+        else:  # system
+            content.append("ℹ️  ", style="yellow")
+            content.append(msg.text, style="yellow dim")
+        return content
+        
     def _create_conversation_panel(self) -> Panel:
         """Create conversation display panel"""
-        messages = self.conversation.get_recent_messages(15)
+        # Only format messages added since the last render
+        new_messages, self._conversation_cursor = self.conversation.messages_since(
+            self._conversation_cursor)
+        for msg in new_messages[-15:]:
+            self.conversation_text.append(msg)
+        content = self.conversation_text.render()
         
-        if not messages:
-            content = Text("💬 Conversation will appear here...", style="dim italic")
-        else:
-            content = Text()
-            for i, msg in enumerate(messages):
-                if i > 0:
-                    content.append("\n")
-                    
-                # Timestamp
-                content.append(f"[{msg['timestamp']}] ", style="dim")
-                
-                # Message based on type
-                if msg['type'] == 'user':
-                    content.append("👤 You: ", style="bold green")
-                    content.append(msg['text'], style="white")
-                elif msg['type'] == 'agent':
-                    content.append("🤖 Ada: ", style="bold blue")  
-                    content.append(msg['text'], style="cyan")
-                else:  # system
-                    content.append("ℹ️  ", style="yellow")
-                    content.append(msg['text'], style="yellow dim")
+        # Transcript / reply text still streaming in, drawn after the cached history
+        if self.partial:
+            partial_text = Text()
+            for role, text in self.partial.items():
+                label, style = ("👤 You: ", "dim green") if role == "user" else ("🤖 Ada: ", "dim cyan")
+                partial_text.append("\n" + label, style="bold")
+                partial_text.append(text, style=style)
+            content = Group(content, partial_text)
                     
         return Panel(
             content,
@@ -113,13 +132,15 @@ class AdaGUIClient:
         table.add_column("Value")
         
         if self.status_display:
+            _, status = self.status_display.state.read()
+            
             # Connection status
-            conn_color = "green" if "Connected" in self.status_display.connection_status else "yellow"
+            conn_color = "green" if "Connected" in status["connection_status"] else "yellow"
             table.add_row("🔗 Connection:", 
-                         Text(self.status_display.connection_status, style=conn_color))
+                         Text(status["connection_status"], style=conn_color))
             
             # Microphone level
-            mic_level = self.status_display.mic_level
+            mic_level = status["mic_level"]
             if mic_level < 300:
                 mic_status = Text("🔇 Silent", style="dim")
             elif mic_level < 1000:
@@ -131,7 +152,7 @@ class AdaGUIClient:
             table.add_row("📊 Level:", f"{mic_level:,}")
             
             # Agent status
-            if self.status_display.agent_speaking:
+            if status["agent_speaking"]:
                 agent_status = Text("🤖 SPEAKING", style="blue bold")
             else:
                 agent_status = Text("👂 Listening", style="dim")
@@ -173,21 +194,38 @@ class AdaGUIClient:
             style="blue"
         )
         
-    def _update_display(self):
-        """Update the display layout"""
-        if self.live:
-            self.layout["header"].update(self._create_header_panel())
-            self.layout["conversation"].update(self._create_conversation_panel())
-            self.layout["status"].update(self._create_status_panel())
-            self.layout["input"].update(self._create_input_panel())
+    def _on_conversation_update(self):
+        """Conversation changed (any thread)"""
+        self.scheduler.mark_dirty("conversation")
+        
+    def _on_conversation(self, role: str, text: str):
+        """Final transcript or reply received from the agent"""
+        if role == "agent":
+            self.conversation.add_agent_message(text)
+        else:
+            self.conversation.add_user_message(text)
+            
+    def _on_partial(self, role: str, text: str):
+        """Streaming transcript or reply text received from the agent"""
+        if text:
+            self.partial[role] = text
+        else:
+            self.partial.pop(role, None)
+        self.scheduler.mark_dirty("conversation")
+        
+    def _on_status_update(self):
+        """Status changed (called from the status publisher thread)"""
+        self.scheduler.mark_dirty("status")
             
     async def connect_voice(self, room_name: str):
         """Connect voice client"""
-        self.status_display = GUIStatusDisplay(self._update_display)
-        self.voice_client = VoiceClient(self.status_display, self.conversation)
+        self.status_display = GUIStatusDisplay(self._on_status_update)
+        self.voice_client = VoiceClient(
+            self.status_display, self._on_conversation, partial_callback=self._on_partial)
         
         self.conversation.add_system_message(f"Connecting to room: {room_name}")
         await self.voice_client.connect(room_name)
+        startup_profiler.mark("room connected")
         self.conversation.add_system_message("✅ Voice connection established")
         
     def handle_text_input(self, text: str):
@@ -204,16 +242,15 @@ class AdaGUIClient:
     async def run(self, room_name: str = "ada-room"):
         """Run the GUI client"""
         # Set up callbacks
-        self.conversation.set_update_callback(self._update_display)
+        self.conversation.set_update_callback(self._on_conversation_update)
         
-        with Live(self.layout, console=self.console, refresh_per_second=10, 
+        # Redraws are driven by the scheduler, not a fixed refresh timer
+        with Live(self.layout, console=self.console, auto_refresh=False,
                   screen=True) as live:
             self.live = live
+            render_task = asyncio.create_task(self.scheduler.run(live))
             
             try:
-                # Initial display
-                self._update_display()
-                
                 # Connect voice
                 await self.connect_voice(room_name)
                 
@@ -226,8 +263,13 @@ class AdaGUIClient:
                     
             except KeyboardInterrupt:
                 self.conversation.add_system_message("👋 Shutting down...")
-                self._update_display()
+                self.scheduler.render_now()
                 await asyncio.sleep(0.5)
+            finally:
+                render_task.cancel()
+                if self.status_display:
+                    self.status_display.close()
+                logger.info(f"Render stats: {self.scheduler.stats()}")
                 
     def _start_input_handling(self):
         """Start handling keyboard input"""
@@ -1,87 +1,208 @@
 #!/usr/bin/env python3
 """Agent with comprehensive status indicators - fixed version"""
 import asyncio
+import collections
 import logging
 import sys
 from pathlib import Path
-from livekit import api, rtc, agents
 import os
 from dotenv import load_dotenv
-import numpy as np
 import time
 from datetime import datetime
 import queue
+from typing import TYPE_CHECKING
 
-from .local_whisper_stt import LocalWhisperSTT
-from .local_piper_tts import LocalPiperTTS
 from .status_indicator import StatusIndicator
 from .conversation_agent import ConversationAgent
-from livekit.plugins import openai
+from .data_protocol import DataChannel, MessageType, ProtocolError, decode
+from .transcript_streamer import create_streamer_from_env
+from .speech_detector import END as SPEECH_END, START as SPEECH_START, create_speech_detector_from_env
+from .turn_pipeline import Turn, TurnPipeline, turn_queue_size_from_env
+from .turn_tracer import create_tracer_from_env
+from .metrics import AgentMetrics, start_metrics_server_from_env
+from . import startup_profiler
 
 load_dotenv()
 
+# numpy, LiveKit and the numpy-based audio modules are imported where they
+# are used, so importing this module stays cheap
+if TYPE_CHECKING:
+    from livekit import agents
+
 # Logger will be configured by main CLI
 logger = logging.getLogger(__name__)
 
-async def run_agent(room_name="test-room"):
-    """Run the conversational agent"""
-    print("\n🚀 Starting Ada - Conversational AI Agent")
-    print("="*60)
-    
-    # Create status indicator
-    status = StatusIndicator()
-    
-    # Create agent
-    agent = ConversationAgent(status)
-    await agent.initialize()
-    
-    # Get connection details
-    url = os.getenv("LIVEKIT_URL", "ws://localhost:7880")
-    api_key = os.getenv("LIVEKIT_API_KEY", "devkey")
-    api_secret = os.getenv("LIVEKIT_API_SECRET", "secret")
-    
-    # Create token
-    token = api.AccessToken(api_key, api_secret)
-    token.with_identity("ada-agent").with_name("Ada")
-    token.with_grants(api.VideoGrants(
-        room_join=True,
-        room=room_name,
-        can_publish=True,
-        can_subscribe=True,
-        agent=True,
-    ))
+
+class VoicePipeline:
+    """Speech detection, STT and playout for one agent session.
     
-    # Create room
-    room = rtc.Room()
+    Transcripts and chat messages are submitted as turns to a TurnPipeline,
+    which routes, answers and speaks them one at a time.
+
+    The audio stream factory is injectable, so recorded audio can be pushed
+    through exactly the same path as live tracks (see benchmarks/).
+    """
     
-    # Create audio output queue
-    audio_queue = asyncio.Queue()
+    def __init__(self, agent, status, tracer, metrics, audio_stream_factory=None, streamer=None,
+                 ready=None):
+        from livekit import rtc
+        from .echo_canceller import FarEndReference, aec_enabled, reference_delay_from_env
+        self.agent = agent
+        self.status = status
+        self.tracer = tracer
+        self.metrics = metrics
+        self.audio_stream_factory = audio_stream_factory or rtc.AudioStream
+        # Optional TranscriptStreamer publishing transcripts and reply tokens
+        self.streamer = streamer
+        # Audio output queue of (frame, turn trace, None) items; each reply
+        # ends with a (None, turn trace, played future) marker
+        self.audio_queue = asyncio.Queue()
+        # With echo cancellation the microphone stays open while Ada talks, using
+        # the published audio as the far-end reference; users can barge in
+        self.echo_reference = FarEndReference(48000) if aec_enabled() else None
+        self.reference_delay = reference_delay_from_env()
+        self.audio_source = None
+        self._playing_turn = None
+        # Completes once the agent's models are loaded; audio and turns wait for it
+        self.ready = ready
+        # Voice and text turns are routed, answered and spoken one at a time
+        timing = dict(hold_factor=1.0, min_hold=0.0, echo_tail=0.0) if self.echo_reference else {}
+        self.turns = TurnPipeline(agent, status, tracer, metrics, self.speak, streamer,
+                                  max_pending=turn_queue_size_from_env(), ready=ready, **timing)
     
-    async def audio_sender(audio_source):
+    async def audio_sender(self, audio_source):
         """Handle sending audio to avoid conflicts"""
+        import numpy as np
+        self.audio_source = audio_source
         while True:
-            audio_frame = await audio_queue.get()
-            if audio_frame is None:
+            item = await self.audio_queue.get()
+            self.metrics.queue_depth.set(self.audio_queue.qsize(), queue="audio_out")
+            if item is None:
                 break
+            audio_frame, turn, played = item
+            if audio_frame is None:
+                # End of a reply's audio: the turn is over once it has played out
+                self._playing_turn = turn
+                try:
+                    await audio_source.wait_for_playout()
+                    if turn:
+                        turn.mark("last_frame_played")
+                except Exception as e:
+                    logger.error(f"Error waiting for playout: {e}")
+                    if turn:
+                        turn.outcome = "playout_error"
+                finally:
+                    self._playing_turn = None
+                    if not played.done():
+                        played.set_result(None)
+                if turn:
+                    self.tracer.finish(turn)
+                continue
+            self._playing_turn = turn
             try:
+                if turn:
+                    turn.mark("first_frame_published")
+                if self.echo_reference is not None:
+                    self.echo_reference.push(np.frombuffer(audio_frame.data, dtype=np.int16))
                 await audio_source.capture_frame(audio_frame)
             except Exception as e:
                 logger.error(f"Error sending audio: {e}")
+                self.metrics.dropped_frames.inc(path="egress")
+                if turn:
+                    turn.outcome = "playout_error"
+            finally:
+                self._playing_turn = None
+    
+    def barge_in(self, participant_identity):
+        """The user talked over Ada: drop the reply, its queued audio and what is still playing.
+
+        Turns other participants are still waiting on keep their place.
+        """
+        print(f"\n✋ Barge-in from {participant_identity}")
+        logger.info(f"Barge-in from {participant_identity} - cancelling the current reply")
+        self.metrics.barge_ins.inc()
+        self.turns.cancel(participant_identity)
+        while not self.audio_queue.empty():
+            item = self.audio_queue.get_nowait()
+            if item is None:
+                self.audio_queue.put_nowait(None)  # Keep the shutdown sentinel
+                break
+            audio_frame, turn, played = item
+            if audio_frame is None:
+                # Each queued reply ends with one marker; finish its turn there
+                self.tracer.finish(turn, "interrupted")
+                if not played.done():
+                    played.set_result(None)
+        if self._playing_turn:
+            # audio_sender finishes it once playout stops
+            self._playing_turn.outcome = "interrupted"
+        if self.audio_source:
+            self.audio_source.clear_queue()
+        if self.echo_reference is not None:
+            self.echo_reference.clear()
+    
+    async def speak(self, response, turn=None):
+        """Synthesize a response and queue it for playout.
+
+        Streaming TTS engines queue audio sentence by sentence, so playout
+        starts before the whole response is synthesized. A ``(None, turn,
+        played)`` marker ends the reply; audio_sender finishes the turn
+        there and resolves ``played`` once the audio has played out.
+        Returns the audio duration and ``played``.
+        """
+        engine = self.agent.tts.choose(response)
+        if turn:
+            turn.mark("tts_start")
+            turn.set("tts_engine", engine)
+        audio_duration = 0.0
+        async for tts_result in self.agent.tts.synthesize_stream(response, engine=engine):
+            frame = tts_result.frame
+            if turn and not audio_duration:
+                turn.mark("tts_first_chunk")
+            audio_duration += frame.samples_per_channel / frame.sample_rate
+            await self.audio_queue.put((frame, turn, None))
+            self.metrics.queue_depth.set(self.audio_queue.qsize(), queue="audio_out")
+        if turn:
+            turn.mark("tts_last_chunk")
+            turn.set("tts_audio_seconds", audio_duration)
+        played = asyncio.get_running_loop().create_future()
+        await self.audio_queue.put((None, turn, played))
+        return audio_duration, played
     
     # Process audio function
-    async def process_audio(track, participant):
+    async def process_audio(self, track, participant):
         """Process incoming audio"""
         print(f"\n🎤 Processing audio from {participant.identity}")
         logger.info(f"Started processing audio from {participant.identity}")
+        if self.ready is not None:
+            await asyncio.shield(self.ready)
         
-        audio_stream = rtc.AudioStream(track)
-        
-        # Thresholds - more sensitive to actual speech
-        SPEECH_THRESHOLD = 500  # Increased to avoid noise triggering
-        MIN_SPEECH_FRAMES = 10  # 0.2 seconds - shorter to catch quick speech
-        MAX_SILENCE_FRAMES = 30  # 0.6 seconds - shorter pause detection
+        audio_stream = self.audio_stream_factory(track)
+        self.metrics.active_sessions.inc()
+        try:
+            await self._consume_audio(audio_stream, participant)
+            # Let turns already submitted by this participant finish
+            await self.turns.join(participant.identity)
+        finally:
+            self.metrics.active_sessions.dec()
+    
+    async def _consume_audio(self, audio_stream, participant):
+        """Run speech detection and the turn pipeline over an audio stream"""
+        import numpy as np
+        from livekit import rtc
+        from .echo_canceller import create_echo_canceller_from_env
+        from .utterance_gate import create_gate_from_env
+        # Per-participant detector, pre-STT gate and echo canceller
+        detector = None
+        gate = None
+        aec = None
+        # Per-participant pre-roll and recording; the start time travels with the Turn
+        pre_roll = collections.deque(maxlen=50)  # Last second of frames
+        recording = None  # Frames of the utterance being recorded
+        recording_started = None  # monotonic time the recording began
         
         frame_count = 0
+        turn = None
         
         first_frame = True
         detected_sample_rate = 16000
@@ -94,127 +215,162 @@ async def run_agent(room_name="test-room"):
                 if first_frame:
                     first_frame = False
                     detected_sample_rate = event.frame.sample_rate
+                    detector = create_speech_detector_from_env(
+                        1000 * event.frame.samples_per_channel / event.frame.sample_rate)
+                    gate = create_gate_from_env(self.metrics)
+                    if self.echo_reference is not None:
+                        aec = create_echo_canceller_from_env(
+                            event.frame.samples_per_channel, event.frame.sample_rate)
                     logger.info(f"Audio format: {event.frame.sample_rate}Hz, {event.frame.num_channels}ch, {event.frame.samples_per_channel} samples/channel")
                 
                 # Get audio
                 audio_data = np.frombuffer(event.frame.data, dtype=np.int16)
+                if aec and self.echo_reference.active and len(audio_data) == aec.block:
+                    far = self.echo_reference.read(
+                        aec.block, detected_sample_rate, time.monotonic() - self.reference_delay)
+                    audio_data = aec.process(audio_data, far)
                 rms = int(np.sqrt(np.mean(audio_data.astype(float)**2)))
                 
                 # Update status display
-                status.update_audio_level(rms)
+                self.status.update_audio_level(rms)
                 
                 # Log periodically with more detail
                 if frame_count % 100 == 0:  # Every 2 seconds
-                    logger.info(f"Frame {frame_count}: RMS={rms}, Speech={agent.speech_count}, "
-                              f"Silence={agent.silence_count}, Recording={agent.is_recording}, "
-                              f"AgentSpeaking={agent.is_agent_speaking}")
+                    logger.info(f"Frame {frame_count}: RMS={rms}, Floor={detector.floor.value:.0f}, "
+                              f"Start>{detector.start_threshold:.0f}, Hangover={detector.hangover_frames}f, "
+                              f"Recording={recording is not None}, AgentSpeaking={self.agent.is_agent_speaking}")
+                    self.metrics.noise_floor.set(detector.floor.value)
                 
-                # Skip processing if agent is speaking
-                if agent.is_agent_speaking:
-                    # Reset counters while agent speaks
-                    agent.speech_count = 0
-                    agent.silence_count = 0
-                    if agent.is_recording:
-                        agent.stop_recording(detected_sample_rate)
+                # Without echo cancellation, skip processing while the agent is speaking
+                if self.agent.is_agent_speaking and not aec:
+                    self.metrics.dropped_frames.inc(path="ingest_while_speaking")
+                    # Forget partial speech while the agent speaks; its echo must not feed the floor
+                    detector.reset()
+                    if recording is not None:
+                        recording = None
+                        self.status.set_recording(False)
                         logger.info("Stopped recording - agent started speaking")
                     continue
                 
                 # Always add to a circular buffer for pre-recording
-                agent.pre_buffer.append(audio_data)
-                if len(agent.pre_buffer) > 50:  # Keep last 1 second
-                    agent.pre_buffer.pop(0)
+                pre_roll.append(audio_data)
                 
                 # Detect speech/silence
-                if rms > SPEECH_THRESHOLD:
-                    agent.speech_count += 1
-                    agent.silence_count = 0
-                    
-                    # Start recording after consistent speech
-                    if agent.speech_count >= MIN_SPEECH_FRAMES and not agent.is_recording:
-                        agent.start_recording()
-                        # Add pre-buffer to recording
-                        for pre_audio in agent.pre_buffer:
-                            agent.add_audio(pre_audio)
-                    
-                    if agent.is_recording:
-                        agent.add_audio(audio_data)
-                    
-                else:  # Silence
-                    agent.silence_count += 1
+                event_type = detector.feed(rms)
+                if event_type == SPEECH_START and self.agent.is_agent_speaking:
+                    echo_possible = self.echo_reference.active and aec.far_active
+                    if aec.double_talk or not echo_possible:
+                        self.barge_in(participant.identity)
+                    else:
+                        # Residual echo of Ada's own voice, not the user
+                        detector.reset()
+                        event_type = None
+                if event_type == SPEECH_START and recording is None:
+                    # Start with the pre-roll (already includes this frame)
+                    recording = list(pre_roll)
+                    recording_started = time.monotonic()
+                    self.status.set_recording(True)
+                    logger.info(f"Started recording {participant.identity}")
+                    turn = self.tracer.start_turn(participant.identity)
+                    turn.mark("speech_start")
+                    continue
+                
+                if recording is not None:
+                    recording.append(audio_data)
                     
-                    if agent.is_recording:
-                        agent.add_audio(audio_data)
+                    # Stop after the adaptive hangover
+                    if event_type == SPEECH_END:
+                        audio_to_process = np.concatenate(recording)
+                        recording = None
+                        self.status.set_recording(False)
+                        logger.info(f"Stopped recording {participant.identity} - "
+                                    f"{len(audio_to_process) / detected_sample_rate:.1f} seconds, "
+                                    f"{len(audio_to_process)} samples at {detected_sample_rate}Hz")
+                        if turn:
+                            turn.mark("endpoint")
                         
-                        # Stop after enough silence
-                        if agent.silence_count >= MAX_SILENCE_FRAMES:
-                            audio_to_process = agent.stop_recording(detected_sample_rate)
-                            agent.speech_count = 0
+                        decision = None
+                        if gate:
+                            decision = gate.check(audio_to_process, detected_sample_rate, detector.stop_threshold)
+                        if len(audio_to_process) <= 3200:
+                            self.tracer.finish(turn, "too_short")
+                            turn = None
+                        elif decision and not decision.accepted:
+                            # Noise burst, cough or clicks: not worth a Whisper decode
+                            if turn:
+                                turn.set("gate_reason", decision.reason)
+                            self.tracer.finish(turn, "gated")
+                            turn = None
+                        else:
+                            logger.info(f"Processing audio: {len(audio_to_process)} samples")
+                            # Transcribe, streaming interim text to participants
+                            transcript = self.streamer.transcript() if self.streamer else None
+                            text = await self.agent.transcribe(
+                                audio_to_process, detected_sample_rate, turn=turn,
+                                on_interim=transcript.update if transcript else None)
+                            if transcript:
+                                transcript.finish(text)
+                            if decision:
+                                gate.feedback(decision, self.agent.last_segments if text else [])
                             
-                            if audio_to_process is not None and len(audio_to_process) > 3200:
-                                logger.info(f"Processing audio: {len(audio_to_process)} samples")
-                                # Transcribe
-                                text = await agent.transcribe(audio_to_process, detected_sample_rate)
-                                
-                                if text and len(text) > 2:
-                                    logger.info(f"STT SUCCESS: '{text}' - proceeding to LLM")
-                                    # Check if in dictation mode
-                                    if agent.is_dictating:
-                                        # Check for dictation commands
-                                        command, param = agent.detect_dictation_commands(text)
-                                        
-                                        if command == "save_dictation":
-                                            success, result = agent.save_dictation(param)
-                                            if success:
-                                                response = f"Dictation saved to {result}"
-                                            else:
-                                                response = f"Failed to save dictation: {result}"
-                                        elif command == "cancel_dictation":
-                                            success, result = agent.cancel_dictation()
-                                            response = result
-                                        else:
-                                            # Add to dictation
-                                            agent.add_to_dictation(text)
-                                            continue  # Don't generate response, just continue listening
-                                    else:
-                                        # Check for start dictation command
-                                        command, param = agent.detect_dictation_commands(text)
-                                        
-                                        if command == "start_dictation":
-                                            agent.start_dictation()
-                                            response = "Starting dictation. Please begin speaking. Say 'Ada, save dictation as filename' when finished."
-                                        else:
-                                            # Normal conversation mode
-                                            logger.info(f"Sending to LLM: '{text}'")
-                                            response = await agent.generate_response(text)
-                                            logger.info(f"LLM response received: '{response}'")
-                                    
-                                    if response:
-                                        # Speak response - Set speaking flag EARLY
-                                        agent.is_agent_speaking = True
-                                        status.set_speaking(True)
-                                        logger.info("Agent started speaking - blocking audio processing")
-                                        
-                                        try:
-                                            tts_result = await agent.tts.synthesize(response)
-                                            await audio_queue.put(tts_result.frame)
-                                            
-                                            # Calculate actual audio duration with more accurate timing
-                                            audio_duration = len(tts_result.frame.data) / (48000 * 2)  # 48kHz, 16-bit
-                                            buffer_time = max(1.0, audio_duration * 1.2)  # Reduced buffer: 1 second minimum or 20% extra
-                                            
-                                            logger.info(f"Audio duration: {audio_duration:.2f}s, waiting {buffer_time:.2f}s for playback + echo clearance")
-                                            await asyncio.sleep(buffer_time)
-                                            
-                                        except Exception as e:
-                                            logger.error(f"TTS error: {e}")
-                                            # Even on error, wait a bit to prevent immediate processing
-                                            await asyncio.sleep(1.0)
-                                        finally:
-                                            # Reduced extra delay to prevent long blocking
-                                            await asyncio.sleep(0.5)  # Reduced from 1.0 to 0.5 seconds
-                                            agent.is_agent_speaking = False
-                                            status.set_speaking(False)
-                                            logger.info("Agent finished speaking - resuming audio processing")
+                            self.turns.submit(Turn(
+                                text or "", participant.identity, "voice", turn,
+                                self.agent.last_segments, recording_started))
+                            turn = None
+    
+    def process_text_message(self, message, participant_identity):
+        """Queue a text message from the data channel as a turn"""
+        turn = self.tracer.start_turn(participant_identity, source="text")
+        turn.mark("endpoint")
+        return self.turns.submit(Turn(message, participant_identity, "text", turn))
+
+
+async def run_agent(room_name="test-room"):
+    """Run the conversational agent"""
+    from livekit import api, rtc
+    print("\n🚀 Starting Ada - Conversational AI Agent")
+    print("="*60)
+    
+    # Metrics shared by the status line, the tracer and the /metrics endpoint
+    metrics = AgentMetrics()
+    metrics_server = await start_metrics_server_from_env(metrics.registry)
+    
+    # Create status indicator
+    status = StatusIndicator(metrics)
+    
+    # Per-turn latency tracing
+    tracer = create_tracer_from_env()
+    tracer.add_exporter(metrics)
+    
+    # Create agent; its models load while we connect to the room
+    agent = ConversationAgent(status, metrics=metrics)
+    initialized = asyncio.create_task(agent.initialize())
+    
+    # Get connection details
+    url = os.getenv("LIVEKIT_URL", "ws://localhost:7880")
+    api_key = os.getenv("LIVEKIT_API_KEY", "devkey")
+    api_secret = os.getenv("LIVEKIT_API_SECRET", "secret")
+    
+    # Create token
+    token = api.AccessToken(api_key, api_secret)
+    token.with_identity("ada-agent").with_name("Ada")
+    token.with_grants(api.VideoGrants(
+        room_join=True,
+        room=room_name,
+        can_publish=True,
+        can_subscribe=True,
+        agent=True,
+    ))
+    
+    # Create room
+    room = rtc.Room()
+    
+    # Data channel and voice pipeline for this room; transcripts and reply
+    # tokens are streamed to participants as they are produced
+    channel = DataChannel(room)
+    streamer = create_streamer_from_env(channel)
+    streamer.start()
+    pipeline = VoicePipeline(agent, status, tracer, metrics, streamer=streamer, ready=initialized)
     
     # Event handlers
     @room.on("connected")
@@ -225,88 +381,38 @@ async def run_agent(room_name="test-room"):
     @room.on("participant_connected")
     def on_participant_connected(participant):
         print(f"\n👤 {participant.identity} joined the room")
+        if agent.memory:
+            agent.memory.preload(participant.identity)
         # Check for existing tracks
         for publication in participant.track_publications.values():
             if publication.kind == rtc.TrackKind.KIND_AUDIO and publication.track:
                 print(f"   🎤 Found existing audio track, processing...")
-                asyncio.create_task(process_audio(publication.track, participant))
+                asyncio.create_task(pipeline.process_audio(publication.track, participant))
                 
     @room.on("data_received")
     def on_data_received(data: rtc.DataPacket):
-        """Handle incoming text messages from clients"""
+        """Handle incoming protocol messages (and legacy raw text) from clients"""
+        if not channel.accepts(data):
+            return
+        participant_identity = data.participant.identity if data.participant else "unknown"
         try:
-            message = data.data.decode('utf-8')
-            participant_identity = data.participant.identity if data.participant else "unknown"
+            messages = decode(data.data)
+        except (ProtocolError, UnicodeDecodeError) as e:
+            logger.warning(f"Dropping malformed data packet from {participant_identity}: {e}")
+            return
             
-            logger.info(f"Received text message from {participant_identity}: {message}")
-            print(f"\n💬 Text from {participant_identity}: {message}")
+        for message in messages:
+            if message.type not in (MessageType.USER_TEXT, MessageType.COMMAND):
+                logger.debug(f"Ignoring {message.type.name} from {participant_identity}")
+                continue
             
-            # Process the text message through the LLM pipeline
-            async def process_text_message():
-                try:
-                    if message.strip():
-                        # Check for dictation commands
-                        if agent.is_dictating:
-                            command, param = agent.detect_dictation_commands(message)
-                            
-                            if command == "save_dictation":
-                                success, result = agent.save_dictation(param)
-                                if success:
-                                    response = f"Dictation saved to {result}"
-                                else:
-                                    response = f"Failed to save dictation: {result}"
-                            elif command == "cancel_dictation":
-                                success, result = agent.cancel_dictation()
-                                response = result
-                            else:
-                                # Add to dictation
-                                agent.add_to_dictation(message)
-                                return  # Don't generate response
-                        else:
-                            # Check for start dictation command
-                            command, param = agent.detect_dictation_commands(message)
-                            
-                            if command == "start_dictation":
-                                agent.start_dictation()
-                                response = "Starting dictation. Please begin speaking. Say 'Ada, save dictation as filename' when finished."
-                            else:
-                                # Normal conversation mode - process through LLM
-                                response = await agent.generate_response(message)
-                        
-                        if response:
-                            # Speak the response
-                            agent.is_agent_speaking = True
-                            status.set_speaking(True)
-                            logger.info("Agent started speaking (text response)")
-                            
-                            try:
-                                tts_result = await agent.tts.synthesize(response)
-                                await audio_queue.put(tts_result.frame)
-                                
-                                # Calculate timing
-                                audio_duration = len(tts_result.frame.data) / (48000 * 2)
-                                buffer_time = max(2.0, audio_duration * 2.0)
-                                
-                                logger.info(f"Text response audio duration: {audio_duration:.2f}s, waiting {buffer_time:.2f}s")
-                                await asyncio.sleep(buffer_time)
-                                
-                            except Exception as e:
-                                logger.error(f"TTS error for text response: {e}")
-                                await asyncio.sleep(1.0)
-                            finally:
-                                await asyncio.sleep(1.0)  # Extra buffer
-                                agent.is_agent_speaking = False
-                                status.set_speaking(False)
-                                logger.info("Agent finished speaking (text response)")
-                                
-                except Exception as e:
-                    logger.error(f"Error processing text message: {e}")
-            
-            # Run the text processing asynchronously
-            asyncio.create_task(process_text_message())
+            logger.info(f"Received text message from {participant_identity}: {message.text}")
+            print(f"\n💬 Text from {participant_identity}: {message.text}")
             
-        except Exception as e:
-            logger.error(f"Error handling data message: {e}")
+            if not message.legacy and data.participant:
+                asyncio.create_task(channel.ack(message, participant_identity))
+            # Queued behind any turn in progress, so replies never overlap
+            pipeline.process_text_message(message.text, participant_identity)
     
     @room.on("participant_disconnected")
     def on_participant_disconnected(participant):
@@ -329,7 +435,7 @@ async def run_agent(room_name="test-room"):
     def on_track_subscribed(track, publication, participant):
         if track.kind == rtc.TrackKind.KIND_AUDIO:
             print(f"\n🎧 Successfully subscribed to audio from {participant.identity}")
-            asyncio.create_task(process_audio(track, participant))
+            asyncio.create_task(pipeline.process_audio(track, participant))
     
     # Connect with auto-subscribe enabled
     print(f"\n📡 Connecting to {url}...")
@@ -337,6 +443,7 @@ async def run_agent(room_name="test-room"):
         auto_subscribe=True,
         dynacast=True,
     ))
+    startup_profiler.mark("room connected")
     
     # Create audio output
     audio_source = rtc.AudioSource(48000, 1)
@@ -344,31 +451,29 @@ async def run_agent(room_name="test-room"):
     await room.local_participant.publish_track(audio_track)
     print("🔊 Audio track published")
     
+    try:
+        await initialized
+    except BaseException:
+        await room.disconnect()
+        raise
+    startup_profiler.mark("models loaded")
+    
     # Start audio sender task
-    audio_sender_task = asyncio.create_task(audio_sender(audio_source))
+    audio_sender_task = asyncio.create_task(pipeline.audio_sender(audio_source))
     
     # Send greeting
     print("\n🎤 Sending greeting...")
     greeting = "Hello! I'm Ada. How can I help you today?"
-    agent.is_agent_speaking = True
-    status.set_speaking(True)
-    try:
-        result = await agent.tts.synthesize(greeting)
-        await audio_queue.put(result.frame)
-        print(f"🤖 ADA: {greeting}")
-        # Wait for greeting to finish
-        await asyncio.sleep(len(result.frame.data) / (48000 * 2 * 1.2))
-    except Exception as e:
-        logger.error(f"TTS error: {e}")
-    finally:
-        agent.is_agent_speaking = False
-        status.set_speaking(False)
+    pipeline.turns.submit(Turn(greeting, "ada-agent", "greeting", reply=greeting))
+    await pipeline.turns.join()
+    print(f"🤖 ADA: {greeting}")
     
     print("\n" + "="*60)
     print("PIPELINE STATUS:")
     print("="*60)
     
     print("\n🎯 Agent ready! Waiting for participants...")
+    startup_profiler.report()
     
     # Keep running
     try:
@@ -377,7 +482,18 @@ async def run_agent(room_name="test-room"):
     except KeyboardInterrupt:
         print("\n\nShutting down...")
     finally:
+        await pipeline.turns.close()
+        await agent.aclose()
         await room.disconnect()
+        status.close()
+        if metrics_server:
+            await metrics_server.stop()
+        if tracer.turns_finished:
+            print("\n\nTURN LATENCY SUMMARY:")
+            print(tracer.format_summary())
+        if agent.generation.replies:
+            print(f"\nLLM replies: {agent.generation.stats()}")
+        tracer.close()
 
 
 async def main():
@@ -389,14 +505,16 @@ async def main():
     await run_agent(args.room)
 
 
-async def entrypoint(ctx: agents.JobContext):
+async def entrypoint(ctx: "agents.JobContext"):
     """LiveKit agent entrypoint function"""
-    await ctx.connect(auto_subscribe=agents.AutoSubscribe.AUDIO_ONLY)
-    
-    # Create status indicator and agent
+    from livekit import agents
+    # Create status indicator and agent; load models while connecting
     status = StatusIndicator()
     agent = ConversationAgent(status)
-    await agent.initialize()
+    await asyncio.gather(
+        ctx.connect(auto_subscribe=agents.AutoSubscribe.AUDIO_ONLY),
+        agent.initialize(),
+    )
     
     # Set up the conversation agent for the room
     # This is simplified - in practice you'd integrate with the room events
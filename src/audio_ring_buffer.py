@@ -0,0 +1,70 @@
+"""Preallocated single-producer/single-consumer ring buffer for int16 audio"""
+import numpy as np
+
+
+class Int16RingBuffer:
+    """Lock-free ring buffer for one writer thread and one reader thread.
+
+    The writer only advances ``_write_pos`` and the reader only advances
+    ``_read_pos``. Both are plain ints that only ever grow, and each is
+    published with a single assignment after the samples are copied, so
+    neither side needs a lock (assignment is atomic under the GIL).
+    """
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._buffer = np.zeros(capacity, dtype=np.int16)
+        self._write_pos = 0
+        self._read_pos = 0
+
+    @property
+    def read_pos(self) -> int:
+        """Samples read or discarded so far"""
+        return self._read_pos
+
+    @property
+    def write_pos(self) -> int:
+        """Samples written so far"""
+        return self._write_pos
+
+    def available(self) -> int:
+        """Samples ready to be read"""
+        return self._write_pos - self._read_pos
+
+    def free(self) -> int:
+        """Samples that can be written without overflowing"""
+        return self.capacity - (self._write_pos - self._read_pos)
+
+    def write(self, samples: np.ndarray) -> int:
+        """Append samples (writer side). Returns the number of samples dropped
+        because the buffer was full."""
+        count = min(len(samples), self.free())
+        if count:
+            start = self._write_pos % self.capacity
+            first = min(count, self.capacity - start)
+            self._buffer[start:start + first] = samples[:first]
+            if count > first:
+                self._buffer[:count - first] = samples[first:count]
+            self._write_pos += count
+        return len(samples) - count
+
+    def read(self, out: np.ndarray) -> int:
+        """Fill ``out`` with the oldest samples (reader side). Returns the
+        number of samples copied, which is less than len(out) on underrun."""
+        count = min(len(out), self.available())
+        if count:
+            start = self._read_pos % self.capacity
+            first = min(count, self.capacity - start)
+            out[:first] = self._buffer[start:start + first]
+            if count > first:
+                out[first:count] = self._buffer[:count - first]
+            self._read_pos += count
+        return count
+
+    def discard(self, count: int) -> int:
+        """Drop up to ``count`` of the oldest samples (reader side)"""
+        count = min(count, self.available())
+        self._read_pos += count
+        return count
@@ -0,0 +1,157 @@
+"""Rich chat interface and voice client used by ada-client.py"""
+import queue
+
+from rich import box
+from rich.console import Console, Group
+from rich.layout import Layout
+from rich.panel import Panel
+from rich.text import Text
+
+from .client import VoiceClient
+from .conversation_store import create_store_from_env
+from .render_scheduler import IncrementalText, RenderScheduler
+
+
+class ChatInterface:
+    """Chat interface with proper input handling"""
+    
+    def __init__(self):
+        self.max_messages = 20
+        self.conversation_history = create_store_from_env(self.max_messages)
+        self.status_text = "📡 Connecting..."
+        self.text_input_queue = queue.Queue()
+        self.console = Console()
+        self.layout = Layout()
+        self.client = None
+        self.partial = {}  # role -> text still streaming in
+        
+        self.create_layout()
+        self.scheduler = RenderScheduler(self.layout, max_fps=4)
+        self.conversation_text = IncrementalText(
+            self.format_message, max_items=self.max_messages, separator="",
+            placeholder=Text(
+                "💭 Conversation will appear here...\n\n"
+                "🎙️ Speak to Ada or use the input commands below",
+                style="dim", justify="center"))
+        self.scheduler.add_panel("header", self.get_header_panel)
+        self.scheduler.add_panel("main", self.get_conversation_panel)
+        self.scheduler.add_panel("footer", self.get_footer_panel)
+        
+    def create_layout(self):
+        """Create the layout structure"""
+        self.layout.split_column(
+            Layout(name="header", size=3),    # Title and status
+            Layout(name="main"),              # Conversation area
+            Layout(name="footer", size=5)     # Controls and input area
+        )
+        
+    def get_header_panel(self):
+        """Create header panel with title and status"""
+        header_text = Text()
+        header_text.append("🎯 Ada Voice Client - Enhanced Chat", style="bold blue")
+        header_text.append(f"\n{self.status_text}", style="green")
+        
+        return Panel(
+            header_text,
+            title="Status",
+            border_style="blue",
+            box=box.ROUNDED
+        )
+        
+    def format_message(self, message) -> Text:
+        """Format one conversation record; called once per message"""
+        role, text = message.role, message.text
+        timestamp = self.conversation_history.clock(message)
+        content = Text()
+        if role == "user":
+            content.append(f"[{timestamp}] ", style="dim")
+            content.append("👤 You: ", style="cyan bold")
+            content.append(f"{text}\n", style="cyan")
+        elif role == "agent":
+            content.append(f"[{timestamp}] ", style="dim")
+            content.append("🤖 Ada: ", style="green bold")
+            content.append(f"{text}\n", style="green")
+        elif role == "system":
+            content.append(f"[{timestamp}] ", style="dim")
+            content.append("ℹ️  ", style="yellow")
+            content.append(f"{text}\n", style="yellow")
+        content.append("\n")
+        return content
+        
+    def get_conversation_panel(self):
+        """Create conversation panel with message history"""
+        content = self.conversation_text.render()
+        
+        # Text still streaming in from Ada, drawn after the cached history
+        if self.partial:
+            partial_text = Text()
+            for role, text in self.partial.items():
+                if role == "user":
+                    partial_text.append("🎤 You: ", style="cyan bold")
+                    partial_text.append(f"{text}\n", style="dim cyan")
+                else:
+                    partial_text.append("🤖 Ada: ", style="green bold")
+                    partial_text.append(f"{text}\n", style="dim green")
+            content = Group(content, partial_text)
+        
+        return Panel(
+            content,
+            title="Conversation",
+            border_style="white",
+            box=box.ROUNDED
+        )
+        
+    def get_footer_panel(self):
+        """Create footer panel with instructions"""
+        footer_text = Text()
+        footer_text.append("📝 INPUT METHODS:\n", style="bold yellow")
+        footer_text.append("  🎤 Voice: ", style="green")
+        footer_text.append("Speak naturally (default)\n", style="white")
+        footer_text.append("  💬 Text: ", style="cyan")
+        footer_text.append("Press 't' + Enter, then type message + Enter\n", style="white")
+        footer_text.append("  📋 Commands: ", style="magenta")
+        footer_text.append("'h' for help, 'q' to quit", style="white")
+        
+        return Panel(
+            footer_text,
+            title="Controls",
+            border_style="cyan",
+            box=box.ROUNDED
+        )
+        
+    def update_layout(self):
+        """Redraw everything on the next frame"""
+        self.scheduler.mark_dirty()
+        
+    def add_message(self, role: str, text: str):
+        """Add a message to the conversation history"""
+        message = self.conversation_history.append(role, text)
+        self.conversation_text.append(message)
+        self.scheduler.mark_dirty("main")
+        
+    def set_partial(self, role: str, text: str):
+        """Show (or clear, when empty) a transcript or reply still streaming in"""
+        if text:
+            self.partial[role] = text
+        else:
+            self.partial.pop(role, None)
+        self.scheduler.mark_dirty("main")
+        
+    def update_status(self, status: str):
+        """Update the status text"""
+        self.status_text = status
+        self.scheduler.mark_dirty("header")
+
+
+class EnhancedVoiceClient(VoiceClient):
+    """Enhanced voice client with chat integration"""
+    
+    def __init__(self, status, chat_interface, conversation_callback=None):
+        super().__init__(status, conversation_callback,
+                         partial_callback=chat_interface.set_partial)
+        self.chat_interface = chat_interface
+        
+    async def send_text_message(self, message: str):
+        """Override to show sent messages in chat"""
+        await super().send_text_message(message)
+        self.chat_interface.add_message("user", f"💬 {message}")
@@ -0,0 +1,48 @@
+"""Typed conversion of LLM stream chunks to text deltas.
+
+Each backend picks its adapter once, from the first chunk it sees, so the
+token loop is a single function call per chunk with no ``hasattr`` probing.
+"""
+from typing import Callable
+
+ChunkAdapter = Callable[[object], str]
+
+
+def livekit_delta(chunk) -> str:
+    """livekit-agents ChatChunk: ``chunk.delta.content``"""
+    delta = chunk.delta
+    return (delta.content or "") if delta is not None else ""
+
+
+def openai_choices(chunk) -> str:
+    """OpenAI SDK objects: ``chunk.choices[0].delta.content`` (a string or a list of parts)"""
+    if not chunk.choices:
+        return ""
+    content = chunk.choices[0].delta.content
+    if isinstance(content, list):
+        return "".join(part if isinstance(part, str) else (part.text or "") for part in content)
+    return content or ""
+
+
+def openai_dict(chunk) -> str:
+    """Decoded OpenAI-style JSON, as llama-cpp-python yields it"""
+    choices = chunk["choices"]
+    return (choices[0]["delta"].get("content") or "") if choices else ""
+
+
+def plain_text(chunk) -> str:
+    """Objects carrying the delta as ``chunk.text``"""
+    return chunk.text or ""
+
+
+def select_adapter(chunk) -> ChunkAdapter:
+    """The adapter for a stream whose first chunk is ``chunk``"""
+    if isinstance(chunk, dict):
+        return openai_dict
+    if hasattr(chunk, "delta"):
+        return livekit_delta
+    if hasattr(chunk, "choices"):
+        return openai_choices
+    if hasattr(chunk, "text"):
+        return plain_text
+    raise TypeError(f"Unsupported LLM chunk type: {type(chunk).__name__}")
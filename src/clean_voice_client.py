@@ -11,6 +11,8 @@ import threading
 import queue
 import time
 
+from .data_protocol import DataChannel, MessageType
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -28,6 +30,7 @@ class CleanVoiceClient:
         self.speaker_stream = None
         self.audio_queue = queue.Queue()
         self.playback_thread = None
+        self.channel = DataChannel(self.room)
         
         # Setup room events
         self.setup_room_events()
@@ -220,12 +223,8 @@ class CleanVoiceClient:
         """Send text message to agent via data channel"""
         if self.room and self.room.connection_state == rtc.ConnectionState.CONN_CONNECTED:
             try:
-                data_packet = rtc.DataPacket(
-                    data=message.encode('utf-8'),
-                    kind=rtc.DataPacketKind.LOSSY,
-                    destination=[participant.sid for participant in self.room.remote_participants.values()]
-                )
-                await self.room.local_participant.publish_data(data_packet)
+                # Chat must not be dropped, so it goes over the reliable channel
+                await self.channel.send(MessageType.USER_TEXT, message, reliable=True)
                 logger.info(f"📤 Sent text message: '{message}'")
                 if self.conversation:
                     self.conversation.add_system_message(f"📤 Sent: {message}")
@@ -5,7 +5,6 @@ import sys
 from pathlib import Path
 import logging
 from livekit import api, rtc
-import pyaudio
 import numpy as np
 from dotenv import load_dotenv
 import os
@@ -50,6 +49,7 @@ async def main():
         print("\n\nExiting...")
     finally:
         await client.disconnect()
+        status.close()
         print("\n👋 Disconnected")
 
 
@@ -0,0 +1,170 @@
+"""Voice/text command routing with one compiled matcher.
+
+Trigger phrases are written with placeholders, e.g. ``"{save} {dictation}
+{filename}"``. Vocabulary placeholders expand to alternations of the words
+and common Whisper misspellings; slot placeholders capture an argument.
+All phrases of all commands are compiled into a single regex with one named
+group per phrase, so a transcript is scanned once however many commands
+are registered.
+"""
+import inspect
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Modes a command can be restricted to
+CHAT = "chat"
+DICTATION = "dictation"
+
+# Words and the spelling variants Whisper produces for them
+VOCABULARY = {
+    "start": r"start(?:s|ed|ing)?|begin(?:s|ning)?|take|takes",
+    "save": r"save[sd]?|saving|safe",
+    "cancel": r"cancel(?:l?ed|s)?|cancell|stop(?:s|ped)?",
+    "dictation": r"(?:(?:the|a|my|this)\s+)?"
+                 r"(?:dict(?:ation|ations|ating|ate|aion|acion)|diction|dick\s?tation|dectation)",
+}
+
+
+def to_filename(text: str, extension: str = ".txt") -> str:
+    """Spoken file name to a file name: "meeting notes dot txt" -> "meeting notes.txt" """
+    words = text.split()
+    if words and words[-1] == extension.lstrip("."):
+        words = words[:-2] if len(words) > 1 and words[-2] == "dot" else words[:-1]
+    name = " ".join(words).strip(" -_'")
+    return name + extension if name else ""
+
+
+# Slots capture an optional trailing argument: (pattern, converter)
+SLOTS = {
+    "filename": (r"(?:as|to|called|named)\s+(?P<{group}>.+)", to_filename),
+}
+
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, turn punctuation into spaces and collapse whitespace"""
+    return " ".join(re.sub(r"[^\w\s'-]", " ", text.lower()).split())
+
+
+@dataclass
+class CommandMatch:
+    name: str
+    text: str  # Normalized input
+    args: Dict[str, str] = field(default_factory=dict)
+    span: Tuple[int, int] = (0, 0)
+
+
+@dataclass
+class Command:
+    name: str
+    phrases: Tuple[str, ...]
+    handler: Callable
+    modes: Optional[Tuple[str, ...]] = None  # None: every mode
+
+    def allowed(self, mode: Optional[str]) -> bool:
+        return self.modes is None or mode is None or mode in self.modes
+
+
+class CommandRouter:
+    """Matches text against registered commands and runs their handlers.
+
+    Handlers are registered with the ``command`` decorator, receive the
+    ``CommandMatch`` and return the reply text (or None); they may be
+    coroutines.
+    """
+
+    def __init__(self, vocabulary: Optional[Dict[str, str]] = None):
+        self.vocabulary = dict(VOCABULARY if vocabulary is None else vocabulary)
+        self.commands: List[Command] = []
+        # Group name -> (command, slot name, slot converter)
+        self._groups: Dict[str, Tuple[Command, Optional[str], Optional[Callable]]] = {}
+        self._pattern: Optional[re.Pattern] = None
+
+    def command(self, name: str, *phrases: str, modes: Optional[Iterable[str]] = None):
+        """Decorator registering ``handler`` for ``phrases``"""
+        def decorator(handler):
+            self.add(name, phrases, handler, modes)
+            return handler
+        return decorator
+
+    def add(self, name: str, phrases: Iterable[str], handler: Callable,
+            modes: Optional[Iterable[str]] = None):
+        phrases = tuple(phrases)
+        if not phrases:
+            raise ValueError(f"Command {name} needs at least one phrase")
+        self.commands.append(Command(name, phrases, handler, tuple(modes) if modes else None))
+        self._pattern = None  # Recompile on next match
+
+    def _compile_phrase(self, phrase: str, group: str) -> Tuple[str, Optional[str], Optional[Callable]]:
+        slot, converter = None, None
+        parts = []
+        for word in phrase.split():
+            placeholder = _PLACEHOLDER.fullmatch(word)
+            if placeholder is None:
+                parts.append(re.escape(word))
+                continue
+            key = placeholder.group(1)
+            if key in SLOTS:
+                if slot is not None or word != phrase.split()[-1]:
+                    raise ValueError(f"Slot {{{key}}} must be the last word of '{phrase}'")
+                pattern, converter = SLOTS[key]
+                slot = key
+                # Optional, so "save dictation" alone still matches
+                parts[-1] += r"(?:\s+" + pattern.format(group=f"{group}_arg") + ")?"
+            elif key in self.vocabulary:
+                parts.append(f"(?:{self.vocabulary[key]})")
+            else:
+                raise ValueError(f"Unknown placeholder {{{key}}} in '{phrase}'")
+        body = r"\s+".join(parts)
+        return rf"\b(?P<{group}>{body})\b", slot, converter
+
+    def compile(self) -> re.Pattern:
+        alternatives = []
+        self._groups = {}
+        for i, command in enumerate(self.commands):
+            for j, phrase in enumerate(command.phrases):
+                group = f"c{i}_{j}"
+                pattern, slot, converter = self._compile_phrase(phrase, group)
+                alternatives.append(pattern)
+                self._groups[group] = (command, slot, converter)
+        self._pattern = re.compile("|".join(alternatives) or r"(?!)")
+        return self._pattern
+
+    def match(self, text: str, mode: Optional[str] = None) -> Optional[CommandMatch]:
+        """First command in ``text`` allowed in ``mode``"""
+        found = self._find(text, mode)
+        return found[1] if found else None
+
+    def _find(self, text: str, mode: Optional[str]) -> Optional[Tuple[Command, CommandMatch]]:
+        if self._pattern is None:
+            self.compile()
+        normalized = normalize(text)
+        for found in self._pattern.finditer(normalized):
+            command, slot, converter = self._groups[found.lastgroup]
+            if not command.allowed(mode):
+                continue
+            args = {}
+            if slot:
+                value = found.group(f"{found.lastgroup}_arg")
+                value = converter(value) if value else ""
+                if value:
+                    args[slot] = value
+            return command, CommandMatch(command.name, normalized, args, found.span())
+        return None
+
+    async def dispatch(self, text: str, mode: Optional[str] = None) -> Tuple[Optional[CommandMatch], Optional[str]]:
+        """Run the handler of the matching command: (match, reply), or (None, None)"""
+        found = self._find(text, mode)
+        if found is None:
+            return None, None
+        command, match = found
+        logger.info(f"Command: {match.name} {match.args or ''}")
+        reply = command.handler(match)
+        if inspect.isawaitable(reply):
+            reply = await reply
+        return match, reply
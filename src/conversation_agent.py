@@ -1,33 +1,48 @@
 import os
 import logging
 import asyncio
-import numpy as np
-from pathlib import Path
-from livekit.plugins import openai
-from .local_whisper_stt import LocalWhisperSTT
-from .local_piper_tts import LocalPiperTTS
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from .dictation import create_dictation_engine_from_env
+from .generation_policy import DEADLINE, MAX_TOKENS, create_generation_policy_from_env
+from .session_memory import create_session_memory_from_env, format_recall
+from .command_router import CHAT, DICTATION, CommandRouter
 
 logger = logging.getLogger(__name__)
 
+# With DEBUG logging on, log one in this many streamed LLM chunks
+CHUNK_LOG_EVERY = 25
+
 
 class ConversationAgent:
-    def __init__(self, status, conversation_callback=None):
+    def __init__(self, status, conversation_callback=None, metrics=None):
         self.status = status
         self.conversation_callback = conversation_callback
+        self.metrics = metrics
         self.stt = None
         self.tts = None
         self.llm = None
-        self.audio_buffer = []
-        self.is_recording = False
-        self.silence_count = 0
-        self.speech_count = 0
-        self.pre_buffer = []
         self.is_agent_speaking = False  # Track when agent is speaking
         
-        # Dictation state
+        # Dictation state; the text itself lives in the dictation journal
         self.is_dictating = False
-        self.dictation_text = ""
-        self.dictation_filename = None
+        self.dictation = create_dictation_engine_from_env()
+        # Journal writes, fsyncs and saves run on this thread, in order, so
+        # slow disks never stall the event loop
+        self._dictation_io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dictation")
+        self.last_segments = []  # TranscriptSegments of the last transcription
+        self.last_result = None  # Its TranscriptionResult (timings, confidence)
+        # Conversation key for LLM backends that keep per-session state
+        self.session_id = uuid.uuid4().hex
+        # Token, sentence and time budgets for each reply
+        self.generation = create_generation_policy_from_env()
+        # Past exchanges per participant, recalled into the prompt (None unless MEMORY_DB is set)
+        self.memory = create_session_memory_from_env()
+        
+        # Spoken/typed commands, matched before text goes to the LLM
+        self.commands = CommandRouter()
+        self._register_commands()
         
         self.messages = [
             {
@@ -41,171 +56,136 @@ class ConversationAgent:
         ]
         
     async def initialize(self):
-        """Initialize all components"""
+        """Initialize all components.
+
+        The Whisper, TTS and (in-process) LLM models load in parallel in the executor, so the
+        event loop stays free (e.g. to connect to the room meanwhile).
+        """
         print("\n🔧 Initializing components...")
+        started = time.perf_counter()
         
-        # STT
         print("  • Loading Whisper STT...")
-        self.stt = LocalWhisperSTT(
+        print(f"  • Loading TTS ({os.getenv('TTS_BACKEND', 'piper')})...")
+        print(f"  • Loading LLM ({os.getenv('LLM_BACKEND', 'ollama')})...")
+        from .llm_backends import create_llm_backend_from_env
+        self.stt, self.tts, self.llm = await asyncio.gather(
+            self._run_in_executor(self._load_stt),
+            self._run_in_executor(self._load_tts),
+            self._run_in_executor(create_llm_backend_from_env),
+        )
+        logger.info(f"Components initialized in {time.perf_counter() - started:.2f}s")
+        
+        print("✅ All components initialized\n")
+        
+        # Pick up a dictation that was interrupted by a crash or restart
+        if await self._dictation_call(self.dictation.resume):
+            self.is_dictating = True
+            self.status.set_dictating(True)
+            print(f"📝 Resumed unfinished dictation ({self.dictation.segments} segments)")
+    
+    def _load_stt(self):
+        from .local_whisper_stt import LocalWhisperSTT
+        return LocalWhisperSTT(
             model_size=os.getenv("WHISPER_MODEL", "base"),
             device="auto",
             compute_type="int8",
             language="en",
         )
-        
-        # TTS
-        print("  • Loading Piper TTS...")
-        self.tts = LocalPiperTTS(
-            model_path=os.getenv("PIPER_MODEL_PATH"),
-            config_path=os.getenv("PIPER_CONFIG_PATH"),
-            sample_rate=48000,
-            num_channels=1,
-        )
-        
-        # LLM
-        print("  • Loading Ollama LLM...")
-        self.llm = openai.LLM(
-            model=os.getenv("OLLAMA_MODEL", "llama3.2:3b"),
-            base_url="http://localhost:11434/v1",
-            api_key="ollama",
-        )
-        
-        print("✅ All components initialized\n")
     
-    def detect_dictation_commands(self, text):
-        """Detect dictation commands in user text"""
-        text_lower = text.lower().strip()
-        
-        # Start dictation commands
-        start_phrases = [
-            "ada, start dictation",
-            "ada, take dictation",
-            "ada, begin dictation",
-            "start dictation",
-            "take dictation"
-        ]
-        
-        for phrase in start_phrases:
-            if phrase in text_lower:
-                return "start_dictation", None
-        
-        # Save dictation commands - extract filename
-        if "ada, save dictation" in text_lower or "save dictation" in text_lower:
-            # Try to extract filename
-            parts = text_lower.split("as ")
-            if len(parts) > 1:
-                filename = parts[-1].strip()
-                # Clean up filename
-                filename = filename.replace(".", "").replace(",", "")
-                if not filename.endswith(".txt"):
-                    filename += ".txt"
-                return "save_dictation", filename
-            else:
-                return "save_dictation", "dictation.txt"
-        
-        # Cancel dictation commands
-        cancel_phrases = [
-            "ada, cancel dictation",
-            "ada, stop dictation",
-            "cancel dictation",
-            "stop dictation"
-        ]
-        
-        for phrase in cancel_phrases:
-            if phrase in text_lower:
-                return "cancel_dictation", None
-                
-        return None, None
+    def _load_tts(self):
+        """TTS_BACKEND (plus TTS_FAST_BACKEND, if set) behind a router"""
+        from .tts_registry import create_tts_router_from_env
+        router = create_tts_router_from_env(sample_rate=48000)
+        router.load()
+        return router
+    
+    def _register_commands(self):
+        """Dictation commands, shared by the voice and text paths"""
+        commands = self.commands
+
+        @commands.command("start_dictation", "{start} {dictation}", modes=(CHAT,))
+        async def start(match):
+            await self.start_dictation()
+            return "Starting dictation. Please begin speaking. Say 'Ada, save dictation as filename' when finished."
+
+        @commands.command("save_dictation", "{save} {dictation} {filename}", modes=(DICTATION,))
+        async def save(match):
+            success, result = await self.save_dictation(match.args.get("filename", "dictation.txt"))
+            return f"Dictation saved to {result}" if success else f"Failed to save dictation: {result}"
+
+        @commands.command("cancel_dictation", "{cancel} {dictation}", modes=(DICTATION,))
+        async def cancel(match):
+            success, result = await self.cancel_dictation()
+            return result
+
+    @property
+    def mode(self):
+        """Command mode: dictation while dictating, chat otherwise"""
+        return DICTATION if self.is_dictating else CHAT
     
-    def start_dictation(self):
+    async def _dictation_call(self, func, *args):
+        """Run dictation file I/O on its own thread, after any still in progress"""
+        return await asyncio.get_running_loop().run_in_executor(self._dictation_io, func, *args)
+        
+    async def start_dictation(self):
         """Start dictation mode"""
+        await self._dictation_call(self.dictation.start)
         self.is_dictating = True
-        self.dictation_text = ""
         self.status.set_dictating(True)
         logger.info("Started dictation mode")
         
-    def add_to_dictation(self, text):
-        """Add text to current dictation"""
+    async def add_to_dictation(self, text, segments=None, utterance_start=None):
+        """Journal text (and Whisper segments with word timings) to the current dictation"""
         if self.is_dictating:
-            if self.dictation_text:
-                self.dictation_text += " " + text
-            else:
-                self.dictation_text = text
-            logger.info(f"Added to dictation: {text}")
+            await self._dictation_call(self.dictation.add, text, segments, utterance_start)
+            logger.debug(f"Added to dictation: {text}")
     
-    def save_dictation(self, filename="dictation.txt"):
+    async def save_dictation(self, filename="dictation.txt"):
         """Save dictation to file and end dictation mode"""
         if not self.is_dictating:
             return False, "Not in dictation mode"
-            
-        if not self.dictation_text.strip():
-            return False, "No dictation content to save"
         
         try:
-            # Create dictations directory if it doesn't exist
-            dictations_dir = Path("dictations")
-            dictations_dir.mkdir(exist_ok=True)
-            
-            # Save to file
-            file_path = dictations_dir / filename
-            with open(file_path, 'w') as f:
-                f.write(self.dictation_text.strip())
-            
-            # End dictation mode
-            self.is_dictating = False
-            self.status.set_dictating(False)
-            
-            logger.info(f"Saved dictation to {file_path}")
-            return True, str(file_path)
-            
-        except Exception as e:
+            file_path = await self._dictation_call(self.dictation.save, filename)
+        except ValueError as e:
+            return False, str(e)
+        except OSError as e:
             logger.error(f"Error saving dictation: {e}")
             return False, f"Error saving file: {e}"
+            
+        # End dictation mode
+        self.is_dictating = False
+        self.status.set_dictating(False)
+        
+        logger.info(f"Saved dictation to {file_path}")
+        return True, str(file_path)
     
-    def cancel_dictation(self):
+    async def cancel_dictation(self):
         """Cancel dictation mode without saving"""
         if not self.is_dictating:
             return False, "Not in dictation mode"
             
+        await self._dictation_call(self.dictation.cancel)
         self.is_dictating = False
-        self.dictation_text = ""
         self.status.set_dictating(False)
         logger.info("Cancelled dictation mode")
         return True, "Dictation cancelled"
         
-    def start_recording(self):
-        """Start recording audio"""
-        self.is_recording = True
-        self.audio_buffer = []
-        self.status.set_recording(True)
-        logger.info("Started recording")
-        
-    def stop_recording(self, sample_rate=16000):
-        """Stop recording and return audio"""
-        self.is_recording = False
-        self.status.set_recording(False)
+    async def transcribe(self, audio_data, sample_rate=48000, turn=None, on_interim=None):
+        """Transcribe audio using Whisper.
         
-        if self.audio_buffer:
-            # Combine all audio
-            audio = np.concatenate(self.audio_buffer)
-            duration = len(audio) / sample_rate
-            # Check audio statistics
-            max_val = np.max(np.abs(audio))
-            mean_val = np.mean(np.abs(audio))
-            logger.info(f"Stopped recording - {duration:.1f} seconds, {len(audio)} samples at {sample_rate}Hz, max: {max_val}, mean: {mean_val:.1f}")
-            return audio
-        return None
-        
-    def add_audio(self, audio_data):
-        """Add audio to buffer if recording"""
-        if self.is_recording:
-            self.audio_buffer.append(audio_data)
-            
-    async def transcribe(self, audio_data, sample_rate=48000):
-        """Transcribe audio using Whisper"""
+        ``on_interim`` is called from the executor thread with the text so
+        far as each segment is decoded.
+        """
         self.status.set_transcribing(True)
+        self.last_segments = []
+        self.last_result = None
+        if turn:
+            turn.mark("stt_start")
+            turn.set("utterance_seconds", len(audio_data) / sample_rate)
         
         try:
+            import numpy as np
             # Convert to float32 for Whisper
             audio_float = audio_data.astype(np.float32) / 32768.0
             
@@ -217,15 +197,18 @@ class ConversationAgent:
                 logger.info(f"Resampled audio from {sample_rate}Hz to 16000Hz for Whisper")
             
             # Use the Whisper model directly
-            loop = asyncio.get_event_loop()
-            segments, info = await loop.run_in_executor(
-                None,
-                self._transcribe_sync,
-                audio_float
-            )
+            result = await self._run_in_executor(
+                self._transcribe_sync, audio_float, on_interim, self.is_dictating)
+            self.last_result = result
+            self.last_segments = result.segments
+            if turn:
+                turn.mark("stt_end")
             
-            if segments:
-                text = " ".join(segment.text.strip() for segment in segments)
+            text = result.text
+            if text:
+                if turn:
+                    turn.set("stt_confidence", round(result.confidence, 3))
+                    turn.set("no_speech_prob", round(result.no_speech_prob, 3))
                 logger.info(f"User said: {text}")
                 if self.conversation_callback:
                     self.conversation_callback("user", text)
@@ -244,91 +227,93 @@ class ConversationAgent:
         finally:
             self.status.set_transcribing(False)
             
-    def _transcribe_sync(self, audio_data):
+    async def _run_in_executor(self, func, *args):
+        """Run blocking work in the default executor, timing the queue wait if metrics are on"""
+        if self.metrics:
+            return await self.metrics.run_in_executor(func, *args)
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, func, *args)
+            
+    def _transcribe_sync(self, audio_data, on_segment=None, word_timestamps=False):
         """Synchronous transcription for executor"""
-        segments, info = self.stt._model.transcribe(
+        return self.stt.transcribe_array(
             audio_data,
-            beam_size=5,
             language="en",
             vad_filter=False,  # Disable VAD to see raw transcription
+            word_timestamps=word_timestamps,  # Only needed for dictation exports
+            on_segment=on_segment,
         )
-        return list(segments), info
             
-    async def generate_response(self, user_text):
-        """Generate AI response"""
+    def _prompt(self, user_text, participant, turn=None):
+        """The conversation so far, plus what memory recalls for the new message"""
+        if not self.memory or not participant:
+            return self.messages
+        # This session's exchanges are already in the conversation
+        recall = self.memory.recall(participant, user_text, exclude_session=self.session_id)
+        if turn:
+            turn.set("memory_recall_ms", round(recall.elapsed_ms, 3))
+            turn.set("memory_hits", len(recall.exchanges))
+        if not recall.exchanges:
+            return self.messages
+        # Just before the new message, so the prompt prefix (and a backend's KV cache) is unchanged
+        note = {"role": "system", "content": format_recall(recall, os.getenv("AGENT_NAME", "Ada"))}
+        return self.messages[:-1] + [note] + self.messages[-1:]
+        
+    async def generate_response(self, user_text, turn=None, on_token=None, participant=None):
+        """Generate AI response, passing each new piece of text to ``on_token``.
+
+        With memory enabled, relevant earlier exchanges with ``participant``
+        are recalled into the prompt and this exchange is remembered.
+        """
         self.status.set_thinking(True)
+        chunk_count = 0
         
         try:
             self.messages.append({"role": "user", "content": user_text})
+            prompt = self._prompt(user_text, participant, turn)
+            logger.info("Sending %d messages to %s", len(prompt), self.llm.name)
             
-            # Import LLM types
-            from livekit.agents import llm as agent_llm
-            
-            # Create chat messages with list format (required by the API)
-            chat_messages = []
-            for msg in self.messages:
-                # Content must be a list of strings
-                chat_msg = agent_llm.ChatMessage(
-                    role=msg["role"],
-                    content=[msg["content"]]
-                )
-                chat_messages.append(chat_msg)
+            if turn:
+                turn.mark("llm_start")
+            # Checked once per reply; chunk logging is sampled and formatted lazily
+            log_chunks = logger.isEnabledFor(logging.DEBUG)
+            limiter = self.generation.start()
+            stream = self.llm.stream(prompt, session=self.session_id,
+                                     max_tokens=self.generation.max_tokens or None)
+            try:
+                async with asyncio.timeout_at(limiter.deadline_at):
+                    async for chunk in stream:
+                        chunk_count += 1
+                        if log_chunks and chunk_count % CHUNK_LOG_EVERY == 1:
+                            logger.debug("LLM chunk %d: %r", chunk_count, chunk.text)
+                        text = limiter.accept(chunk.text) if chunk.text else ""
+                        if text:
+                            if on_token:
+                                on_token(text)
+                            if turn:
+                                turn.mark("llm_first_token")
+                        if chunk.finish_reason == "length":
+                            limiter.truncate(MAX_TOKENS)
+                        if limiter.stop:
+                            break
+            except TimeoutError:
+                limiter.truncate(DEADLINE)
+            finally:
+                # Cancels generation when the reply was cut short
+                await stream.aclose()
+            response_text = limiter.text
+            stop = self.generation.record(limiter)
             
-            # Create chat context with messages - pass messages in constructor
-            chat_ctx = agent_llm.ChatContext(chat_messages)
-            
-            # Debug logging
-            logger.info(f"Chat context has {len(chat_ctx.items)} messages")
-            for i, msg in enumerate(chat_ctx.items):
-                if hasattr(msg, 'role') and hasattr(msg, 'content'):
-                    logger.info(f"Message {i}: role={msg.role}, content={msg.content}")
-            
-            # Get response from LLM
-            response_stream = self.llm.chat(chat_ctx=chat_ctx)
-            
-            response_text = ""
-            async for chunk in response_stream:
-                # Debug the chunk format
-                logger.debug(f"LLM chunk received: {type(chunk)} - {chunk}")
-                
-                # Handle LiveKit ChatChunk format with delta - this is what we're getting!
-                if hasattr(chunk, 'delta') and chunk.delta and hasattr(chunk.delta, 'content') and chunk.delta.content:
-                    content = chunk.delta.content
-                    logger.debug(f"Using chunk.delta.content: {content}")
-                    response_text += content
-                # Handle LiveKit ChatChunk format
-                elif hasattr(chunk, 'content') and chunk.content:
-                    logger.debug(f"Using chunk.content: {chunk.content}")
-                    response_text += chunk.content
-                # Handle OpenAI-style streaming format (used by Ollama)
-                elif hasattr(chunk, 'choices') and chunk.choices and len(chunk.choices) > 0:
-                    choice = chunk.choices[0]
-                    if hasattr(choice, 'delta') and choice.delta:
-                        if hasattr(choice.delta, 'content') and choice.delta.content:
-                            content = choice.delta.content
-                            logger.debug(f"Using choice.delta.content: {content}")
-                            if isinstance(content, str):
-                                response_text += content
-                            elif isinstance(content, list):
-                                for content_item in content:
-                                    if isinstance(content_item, str):
-                                        response_text += content_item
-                                    elif hasattr(content_item, 'text') and content_item.text:
-                                        response_text += content_item.text
-                # Handle direct text chunks
-                elif hasattr(chunk, 'text') and chunk.text:
-                    logger.debug(f"Using chunk.text: {chunk.text}")
-                    response_text += chunk.text
-                # Handle message format
-                elif hasattr(chunk, 'message') and chunk.message:
-                    if hasattr(chunk.message, 'content') and chunk.message.content:
-                        logger.debug(f"Using chunk.message.content: {chunk.message.content}")
-                        response_text += chunk.message.content
-                else:
-                    logger.debug(f"Unhandled chunk format: {dir(chunk)}")
+            if turn:
+                turn.mark("llm_first_token")
+                turn.mark("llm_last_token")
+                turn.set("llm_chunks", chunk_count)
+                turn.set("llm_stop", stop)
             
             if response_text:
                 self.messages.append({"role": "assistant", "content": response_text})
+                if self.memory and participant:
+                    self.memory.remember(participant, self.session_id, user_text, response_text)
                 logger.info(f"Agent responded: {response_text}")
                 if self.conversation_callback:
                     self.conversation_callback("agent", response_text)
@@ -343,3 +328,11 @@ class ConversationAgent:
             return "I'm sorry, I had trouble processing that."
         finally:
             self.status.set_thinking(False)
+            
+    async def aclose(self):
+        """Flush remembered exchanges and dictation writes, and release the LLM backend"""
+        await asyncio.get_running_loop().run_in_executor(None, self._dictation_io.shutdown)
+        if self.memory:
+            await self.memory.aclose()
+        if self.llm:
+            await self.llm.aclose()
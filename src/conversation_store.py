@@ -0,0 +1,119 @@
+"""Fixed-capacity conversation store with incremental reads"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ConversationRecord:
+    """One conversation message. ``created`` is a monotonic timestamp."""
+
+    __slots__ = ("seq", "role", "text", "created", "source")
+
+    def __init__(self, seq: int, role: str, text: str, created: float, source: Optional[str] = None):
+        self.seq = seq
+        self.role = role
+        self.text = text
+        self.created = created
+        self.source = source
+
+    def __repr__(self):
+        return f"ConversationRecord({self.seq}, {self.role!r}, {self.text!r})"
+
+
+class ConversationStore:
+    """Keeps the last ``capacity`` messages in a deque.
+
+    Every record gets an increasing ``seq``, so views keep a cursor and call
+    ``since(cursor)`` to get only the messages added after their last render.
+    Older messages fall off the front in O(1); if ``transcript_path`` is set
+    every message is also appended to a JSONL transcript so long sessions
+    keep their full history on disk.
+    """
+
+    def __init__(self, capacity: int = 100, transcript_path: Optional[str] = None):
+        self.capacity = capacity
+        self._records = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._seq = 0
+        # Anchor for turning monotonic timestamps into wall-clock times for display
+        self._wall_anchor = time.time() - time.monotonic()
+        self._transcript = None
+        if transcript_path:
+            path = Path(transcript_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._transcript = open(path, "a", buffering=1)
+
+    def append(self, role: str, text: str, source: Optional[str] = None) -> ConversationRecord:
+        """Add a message (thread-safe)"""
+        with self._lock:
+            self._seq += 1
+            record = ConversationRecord(self._seq, role, text, time.monotonic(), source)
+            self._records.append(record)
+            if self._transcript:
+                try:
+                    self._transcript.write(json.dumps({
+                        "seq": record.seq,
+                        "time": round(self.wall_time(record), 3),
+                        "role": role,
+                        "text": text,
+                        "source": source,
+                    }) + "\n")
+                except (OSError, ValueError) as e:
+                    logger.error(f"Failed to write transcript: {e}")
+        return record
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    def since(self, cursor: int) -> Tuple[List[ConversationRecord], int]:
+        """Messages with seq greater than ``cursor`` and the new cursor.
+        Messages that already fell out of the store are skipped."""
+        with self._lock:
+            new = []
+            for record in reversed(self._records):
+                if record.seq <= cursor:
+                    break
+                new.append(record)
+            new.reverse()
+            return new, self._seq
+
+    def recent(self, count: int) -> List[ConversationRecord]:
+        """The last ``count`` messages, oldest first"""
+        with self._lock:
+            records = list(islice(reversed(self._records), count))
+        records.reverse()
+        return records
+
+    def __len__(self):
+        return len(self._records)
+
+    def wall_time(self, record: ConversationRecord) -> float:
+        return self._wall_anchor + record.created
+
+    def clock(self, record: ConversationRecord) -> str:
+        """Display timestamp (HH:MM:SS), formatted on demand"""
+        return datetime.fromtimestamp(self.wall_time(record)).strftime("%H:%M:%S")
+
+    def close(self):
+        with self._lock:
+            if self._transcript:
+                self._transcript.close()
+                self._transcript = None
+
+
+def create_store_from_env(capacity: int = 100) -> ConversationStore:
+    """Conversation store with an optional transcript from CONVERSATION_LOG"""
+    transcript_path = os.getenv("CONVERSATION_LOG")
+    if transcript_path:
+        logger.info(f"Writing conversation transcript to {transcript_path}")
+    return ConversationStore(capacity, transcript_path)
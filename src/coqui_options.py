@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class CoquiOptions:
+    model_name: str = "tts_models/en/ljspeech/tacotron2-DDC"
+    speaker_wav: Optional[str] = None  # Reference voice for cloning models such as XTTS
+    language: str = "en"
+    device: str = "cpu"
+    output_sample_rate: Optional[int] = None  # None: the model's native rate, no resampling
+    stream_sentences: bool = True  # Synthesize (and emit) one sentence at a time
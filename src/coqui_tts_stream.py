@@ -0,0 +1,34 @@
+from typing import Optional
+from livekit.agents import tts
+from .local_coqui_tts import LocalCoquiTTS
+from .text_segmentation import SentenceBuffer
+
+
+class CoquiTTSStream(tts.SynthesizeStream):
+    """Stream adapter for Coqui TTS: text is synthesized a sentence at a time"""
+
+    def __init__(self, tts: LocalCoquiTTS, voice: Optional[str] = None):
+        super().__init__()
+        self._tts = tts
+        self._voice = voice
+        self._sentences = SentenceBuffer()
+
+    async def push_text(self, text: str) -> None:
+        """Add text; every sentence it completes is synthesized right away"""
+        for sentence in self._sentences.push(text):
+            await self._emit(sentence)
+
+    async def flush(self) -> None:
+        """Synthesize the trailing partial sentence"""
+        rest = self._sentences.flush()
+        if rest:
+            await self._emit(rest)
+
+    async def _emit(self, sentence: str) -> None:
+        async for result in self._tts.synthesize_stream(sentence):
+            self._event_ch.send_nowait(result)
+
+    async def aclose(self) -> None:
+        """Close the stream"""
+        await self.flush()
+        await super().aclose()
@@ -0,0 +1,149 @@
+"""Compact framed message protocol for the LiveKit data channel.
+
+Every frame is an 11-byte header followed by a UTF-8 payload:
+
+    magic(1) type(1) flags(1) msg_id(4) seq(2) length(2)
+
+``magic`` is 0xAD, which can never start valid UTF-8, so packets from older
+clients that send raw text are still recognised and treated as user text.
+``msg_id`` identifies a logical message (one user line, one agent reply) and
+``seq`` orders the chunks of a streamed message; the last chunk carries
+``FLAG_FINAL``. Several frames may be concatenated into one packet.
+"""
+import enum
+import itertools
+import logging
+import struct
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MAGIC = 0xAD
+TOPIC = "ada"
+HEADER = struct.Struct("!BBBIHH")
+MAX_PAYLOAD = 0xFFFF
+
+FLAG_FINAL = 0x01
+
+
+class MessageType(enum.IntEnum):
+    USER_TEXT = 1           # Typed chat from a user
+    TRANSCRIPT_INTERIM = 2  # Partial STT result for the current utterance
+    TRANSCRIPT_FINAL = 3    # Final STT result
+    AGENT_TOKEN = 4         # Streamed piece of an agent reply
+    AGENT_REPLY = 5         # Complete agent reply
+    ACK = 6                 # Receipt for a message, msg_id echoes the original
+    COMMAND = 7             # Control command (e.g. dictation)
+
+
+class ProtocolError(ValueError):
+    """Raised for malformed frames"""
+
+
+@dataclass
+class Message:
+    type: MessageType
+    text: str = ""
+    msg_id: int = 0
+    seq: int = 0
+    flags: int = FLAG_FINAL
+    legacy: bool = False
+
+    @property
+    def final(self) -> bool:
+        return bool(self.flags & FLAG_FINAL)
+
+
+def encode(message: Message) -> bytes:
+    payload = message.text.encode("utf-8")
+    if len(payload) > MAX_PAYLOAD:
+        raise ProtocolError(f"Payload too large: {len(payload)} bytes")
+    return HEADER.pack(MAGIC, message.type, message.flags, message.msg_id,
+                       message.seq & 0xFFFF, len(payload)) + payload
+
+
+def encode_batch(messages: Iterable[Message]) -> bytes:
+    """Several frames in one packet"""
+    return b"".join(encode(message) for message in messages)
+
+
+def decode(data: bytes) -> List[Message]:
+    """Decode a packet into its frames. Raw UTF-8 packets (no magic byte)
+    are returned as a single legacy USER_TEXT message."""
+    if not data:
+        return []
+    if data[0] != MAGIC:
+        return [Message(MessageType.USER_TEXT, bytes(data).decode("utf-8"), legacy=True)]
+
+    messages = []
+    view = memoryview(data)
+    offset = 0
+    while offset < len(view):
+        if len(view) - offset < HEADER.size:
+            raise ProtocolError("Truncated header")
+        magic, type_, flags, msg_id, seq, length = HEADER.unpack_from(view, offset)
+        if magic != MAGIC:
+            raise ProtocolError(f"Bad magic byte at offset {offset}")
+        offset += HEADER.size
+        if len(view) - offset < length:
+            raise ProtocolError("Truncated payload")
+        try:
+            message_type = MessageType(type_)
+        except ValueError:
+            logger.debug(f"Skipping unknown message type {type_}")
+            offset += length
+            continue
+        text = str(view[offset:offset + length], "utf-8")
+        offset += length
+        messages.append(Message(message_type, text, msg_id, seq, flags))
+    return messages
+
+
+class DataChannel:
+    """Sends protocol messages over a room's data channel.
+
+    Chat, transcripts and replies go out reliably by default; message ids
+    are allocated per sender.
+    """
+
+    def __init__(self, room, topic: str = TOPIC):
+        self.room = room
+        self.topic = topic
+        self._ids = itertools.count(1)
+        self.packets_sent = 0
+        self.bytes_sent = 0
+
+    def next_id(self) -> int:
+        return next(self._ids) & 0xFFFFFFFF
+
+    async def send(self, message_type: MessageType, text: str = "", *, msg_id: Optional[int] = None,
+                   seq: int = 0, final: bool = True, reliable: bool = True,
+                   destination_identities: Optional[List[str]] = None) -> Message:
+        message = Message(message_type, text, self.next_id() if msg_id is None else msg_id,
+                          seq, FLAG_FINAL if final else 0)
+        await self.send_batch([message], reliable=reliable,
+                              destination_identities=destination_identities)
+        return message
+
+    async def send_batch(self, messages: List[Message], *, reliable: bool = True,
+                         destination_identities: Optional[List[str]] = None):
+        payload = encode_batch(messages)
+        await self.room.local_participant.publish_data(
+            payload,
+            reliable=reliable,
+            destination_identities=destination_identities or [],
+            topic=self.topic,
+        )
+        self.packets_sent += 1
+        self.bytes_sent += len(payload)
+
+    async def ack(self, message: Message, identity: str):
+        """Acknowledge a received message to its sender"""
+        await self.send(MessageType.ACK, msg_id=message.msg_id, seq=message.seq,
+                        destination_identities=[identity])
+
+    def accepts(self, packet) -> bool:
+        """Whether a received DataPacket belongs to this protocol (or is legacy text)"""
+        topic = getattr(packet, "topic", "") or ""
+        return topic in ("", self.topic)
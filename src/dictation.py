@@ -0,0 +1,255 @@
+"""Dictation with a durable append-only journal and atomic saves"""
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_PREFIX = ".journal-"
+
+
+class DictationJournal:
+    """Append-only JSONL file with one line per dictated segment.
+
+    Every append is flushed to the OS straight away, so a crash of the
+    process loses nothing. ``fsync`` is batched: it runs after
+    ``fsync_every`` segments or ``fsync_interval`` seconds, whichever comes
+    first, bounding what a power loss can take.
+    """
+
+    def __init__(self, path: Path, fsync_every: int = 10, fsync_interval: float = 1.0):
+        self.path = Path(path)
+        self.fsync_every = max(1, fsync_every)
+        self.fsync_interval = fsync_interval
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def write(self, record: dict):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        if (self._unsynced >= self.fsync_every or
+                time.monotonic() - self._last_sync >= self.fsync_interval):
+            self.sync()
+
+    def sync(self):
+        if self._unsynced:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    @staticmethod
+    def read(path: Path) -> Iterator[dict]:
+        """Stream the records of a journal, skipping a torn final line"""
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping damaged journal line in {path}")
+
+
+class DictationEngine:
+    """Records dictation to a journal and turns it into files on save.
+
+    Every method does blocking file I/O (and fsync); call them from an
+    executor, one at a time.
+
+    Only counters are kept in memory; the text lives in the journal, so
+    memory does not grow with dictation length. An unfinished journal found
+    on startup can be resumed.
+    """
+
+    def __init__(self, directory: str = "dictations", fsync_every: int = 10, fsync_interval: float = 1.0):
+        self.directory = Path(directory)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.journal: Optional[DictationJournal] = None
+        self.started_at = 0.0  # monotonic
+        self.segments = 0
+        self.words = 0
+        self.has_word_timings = False
+
+    @property
+    def active(self) -> bool:
+        return self.journal is not None
+
+    def _open(self, path: Path):
+        self.journal = DictationJournal(path, self.fsync_every, self.fsync_interval)
+
+    def start(self):
+        """Begin a new dictation, discarding nothing already journaled"""
+        if self.active:
+            self.journal.close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{JOURNAL_PREFIX}{time.strftime('%Y%m%d_%H%M%S')}-{os.getpid()}.jsonl"
+        self._open(path)
+        self.started_at = time.monotonic()
+        self.segments = self.words = 0
+        self.has_word_timings = False
+        self.journal.write({"type": "start", "time": time.time()})
+        logger.info(f"Dictation journal: {path}")
+
+    def resume(self) -> bool:
+        """Reopen the newest unfinished journal, if any"""
+        journals = sorted(self.directory.glob(f"{JOURNAL_PREFIX}*.jsonl"),
+                          key=lambda p: p.stat().st_mtime) if self.directory.exists() else []
+        if not journals:
+            return False
+        path = journals[-1]
+        self.segments = self.words = 0
+        self.has_word_timings = False
+        last_offset = 0.0
+        for record in DictationJournal.read(path):
+            if record.get("type") != "segment":
+                continue
+            self.segments += 1
+            self.words += len(record["text"].split())
+            self.has_word_timings = self.has_word_timings or bool(record.get("words"))
+            last_offset = max(last_offset, record.get("end", record.get("offset", 0.0)))
+        self._truncate_torn_tail(path)
+        self._open(path)
+        # Continue the timeline after the last resumed segment
+        self.started_at = time.monotonic() - last_offset
+        logger.info(f"Resumed dictation {path} ({self.segments} segments)")
+        return True
+
+    @staticmethod
+    def _truncate_torn_tail(path: Path):
+        """Cut a partially written last line so new records start on a fresh line"""
+        with open(path, "rb+") as f:
+            end = f.seek(0, os.SEEK_END)
+            if not end:
+                return
+            f.seek(end - 1)
+            if f.read(1) == b"\n":
+                return
+            # Scan backwards in blocks for the last complete line
+            position = end
+            while position > 0:
+                start = max(0, position - 4096)
+                f.seek(start)
+                block = f.read(position - start)
+                newline = block.rfind(b"\n")
+                if newline != -1:
+                    f.truncate(start + newline + 1)
+                    return
+                position = start
+            f.truncate(0)
+
+    def add(self, text: str, segments: Optional[List] = None, utterance_start: Optional[float] = None):
+        """Journal one transcribed utterance.
+
+        ``segments`` are Whisper segments; if they carry word timings they
+        are stored relative to the dictation start, using the monotonic
+        ``utterance_start`` of the recording as the anchor.
+        """
+        if not self.active or not text.strip():
+            return
+        offset = (utterance_start if utterance_start is not None else time.monotonic()) - self.started_at
+        record = {"type": "segment", "seq": self.segments, "offset": round(offset, 3), "text": text.strip()}
+        words = []
+        for segment in segments or ():
+            for word in getattr(segment, "words", None) or ():
+                words.append([word.word.strip(), round(offset + word.start, 3),
+                              round(offset + word.end, 3), round(getattr(word, "probability", 1.0), 3)])
+        if words:
+            record["words"] = words
+            record["end"] = words[-1][2]
+            self.has_word_timings = True
+        self.journal.write(record)
+        self.segments += 1
+        self.words += len(record["text"].split())
+
+    def _segments(self) -> Iterator[dict]:
+        self.journal.sync()
+        for record in DictationJournal.read(self.journal.path):
+            if record.get("type") == "segment":
+                yield record
+
+    def _write_atomic(self, target: Path, write):
+        """Write via a temp file in the same directory, fsync and rename over target"""
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                write(f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, target)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def save(self, filename: str = "dictation.txt") -> Path:
+        """Stream the journal into ``filename`` atomically and end the dictation"""
+        if not self.active:
+            raise RuntimeError("Not in dictation mode")
+        if not self.segments:
+            raise ValueError("No dictation content to save")
+        target = self.directory / Path(filename).name
+
+        def write_text(f):
+            first = True
+            for record in self._segments():
+                if not first:
+                    f.write(" ")
+                f.write(record["text"])
+                first = False
+
+        self._write_atomic(target, write_text)
+        if self.has_word_timings:
+            self.export(target.with_suffix(".words.json"))
+        self._finish()
+        return target
+
+    def export(self, path: Path) -> Path:
+        """Write the segments with word timings as JSON, one segment at a time"""
+        path = Path(path)
+
+        def write_json(f):
+            f.write('{"segments": [')
+            for i, record in enumerate(self._segments()):
+                if i:
+                    f.write(",")
+                segment = {"text": record["text"], "start": record["offset"]}
+                if record.get("words"):
+                    segment["end"] = record["end"]
+                    segment["words"] = [
+                        {"word": w, "start": start, "end": end, "probability": p}
+                        for w, start, end, p in record["words"]
+                    ]
+                f.write("\n" + json.dumps(segment, ensure_ascii=False))
+            f.write("\n]}\n")
+
+        self._write_atomic(path, write_json)
+        return path
+
+    def cancel(self):
+        """End the dictation and delete its journal"""
+        if self.active:
+            self._finish()
+
+    def _finish(self):
+        path = self.journal.path
+        self.journal.close()
+        self.journal = None
+        path.unlink(missing_ok=True)
+
+
+def create_dictation_engine_from_env() -> DictationEngine:
+    """Dictation engine configured by DICTATION_DIR, DICTATION_FSYNC_EVERY and DICTATION_FSYNC_INTERVAL_S"""
+    return DictationEngine(
+        directory=os.getenv("DICTATION_DIR", "dictations"),
+        fsync_every=int(os.getenv("DICTATION_FSYNC_EVERY", "10")),
+        fsync_interval=float(os.getenv("DICTATION_FSYNC_INTERVAL_S", "1.0")),
+    )
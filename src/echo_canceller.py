@@ -0,0 +1,177 @@
+"""Reference-based acoustic echo cancellation for the agent's audio ingest"""
+import collections
+import logging
+import os
+import time
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class FarEndReference:
+    """Timeline of the audio the agent has published (the far-end signal).
+
+    ``push`` schedules published samples to play back-to-back from the
+    moment they were handed to the audio source; ``read`` returns what was
+    playing during a window of wall-clock time, resampled to the caller's
+    rate, with silence where nothing was scheduled.
+    """
+
+    def __init__(self, sample_rate: int = 48000, history_s: float = 2.0):
+        self.sample_rate = sample_rate
+        self.history_s = history_s
+        self._segments = collections.deque()  # (start time, int16 samples)
+        self._end = 0.0  # When the last scheduled sample finishes playing
+
+    def push(self, samples: np.ndarray, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        start = max(now, self._end)
+        self._segments.append((start, samples))
+        self._end = start + len(samples) / self.sample_rate
+
+    def clear(self, now: Optional[float] = None):
+        """Drop audio that has not played yet (playout was cut off)"""
+        now = time.monotonic() if now is None else now
+        while self._segments and self._segments[-1][0] >= now:
+            self._segments.pop()
+        if self._segments:
+            start, samples = self._segments[-1]
+            played = max(0, int((now - start) * self.sample_rate))
+            self._segments[-1] = (start, samples[:played])
+        self._end = min(self._end, now)
+
+    @property
+    def active(self) -> bool:
+        return bool(self._segments)
+
+    def read(self, count: int, sample_rate: int, end: float) -> np.ndarray:
+        """``count`` samples at ``sample_rate`` that played up to time ``end``"""
+        while self._segments and self._segments[0][0] + len(self._segments[0][1]) / self.sample_rate \
+                < end - self.history_s:
+            self._segments.popleft()
+        ref_count = int(round(count * self.sample_rate / sample_rate))
+        window_start = end - ref_count / self.sample_rate
+        out = np.zeros(ref_count, dtype=np.float32)
+        for start, samples in self._segments:
+            offset = int(round((start - window_start) * self.sample_rate))
+            if offset >= ref_count:
+                break
+            lo, hi = max(0, -offset), min(len(samples), ref_count - offset)
+            if lo < hi:
+                out[offset + lo:offset + hi] = samples[lo:hi]
+        if ref_count != count:
+            out = np.interp(np.linspace(0, ref_count - 1, count), np.arange(ref_count), out)
+        return out
+
+
+class EchoCanceller:
+    """Partitioned-block frequency-domain NLMS echo canceller.
+
+    The echo path is modelled by ``tail_ms`` of filter, split into
+    partitions of one block each (overlap-save, FFT size two blocks). Step
+    sizes are normalized per frequency bin by the smoothed far-end power.
+    Every block applies the gradient constraint to one partition in turn,
+    which keeps the filter causal at a fraction of the FFT cost.
+
+    A Geigel double-talk detector freezes adaptation while the near-end
+    talker is louder than ``geigel_threshold`` times the recent far-end
+    peak, so the user talking over the agent does not corrupt the filter;
+    ``double_talk`` tells callers a barge-in is likely.
+    """
+
+    def __init__(self, block: int, sample_rate: int, *, tail_ms: float = 300, mu: float = 0.5,
+                 geigel_threshold: float = 0.6, hangover_blocks: int = 10, smoothing: float = 0.9):
+        self.block = block
+        self.sample_rate = sample_rate
+        self.partitions = max(1, int(np.ceil(tail_ms / 1000 * sample_rate / block)))
+        self.mu = mu
+        self.geigel_threshold = geigel_threshold
+        self.hangover_blocks = hangover_blocks
+        self.smoothing = smoothing
+        bins = block + 1
+        self._weights = np.zeros((self.partitions, bins), dtype=np.complex64)
+        self._spectra = np.zeros((self.partitions, bins), dtype=np.complex64)  # Far-end history, ring
+        self._head = 0
+        self._power = np.zeros(bins, dtype=np.float32)
+        # Power of a far end at ~10 RMS: keeps steps sane when the reference is near silent
+        self._regularization = 2 * block * 100.0
+        self._last_far = np.zeros(block, dtype=np.float32)
+        self._far_peaks = collections.deque(maxlen=self.partitions)  # Per-block far-end peaks
+        self._constrain = 0
+        self._hangover = 0
+        self.double_talk = False
+        self.far_active = False  # Far-end audio within the filter tail, so echo is possible
+        self.blocks = 0
+
+    def process(self, near: np.ndarray, far: np.ndarray) -> np.ndarray:
+        """Cancel the echo of ``far`` (float, one block) from ``near`` (int16); returns int16"""
+        n = self.block
+        near_f = near.astype(np.float32)
+        far_f = np.asarray(far, dtype=np.float32)
+        self.blocks += 1
+
+        self._head = (self._head - 1) % self.partitions
+        spectrum = np.fft.rfft(np.concatenate((self._last_far, far_f)))
+        self._spectra[self._head] = spectrum
+        self._last_far = far_f
+        self._far_peaks.append(float(np.max(np.abs(far_f))) if len(far_f) else 0.0)
+        far_peak = max(self._far_peaks)
+        self.far_active = far_peak >= 1.0
+        if not self.far_active:
+            # Nothing playing: nothing to cancel, and nothing to learn from
+            self.double_talk = False
+            return near
+
+        # Ring order: partition k holds the far-end spectrum from k blocks ago
+        order = (self._head + np.arange(self.partitions)) % self.partitions
+        history = self._spectra[order]
+        echo = np.fft.irfft(np.einsum("pk,pk->k", history, self._weights), 2 * n)[n:]
+        error = near_f - echo
+
+        # Geigel: near-end peak well above the far-end peak means someone is talking
+        if np.max(np.abs(near_f)) > self.geigel_threshold * far_peak:
+            self._hangover = self.hangover_blocks
+        elif self._hangover:
+            self._hangover -= 1
+        self.double_talk = self._hangover > 0
+
+        if not self.double_talk:
+            # Normalize by the far-end power across the whole filter, so a loud
+            # onset after a pause cannot blow up the step for older partitions
+            power = np.sum(history.real ** 2 + history.imag ** 2, axis=0)
+            self._power = self.smoothing * self._power + (1 - self.smoothing) * power
+            error_spectrum = np.fft.rfft(np.concatenate((np.zeros(n, dtype=np.float32), error)))
+            step = self.mu / (np.maximum(self._power, power) + self._regularization)
+            self._weights += (step * error_spectrum) * np.conj(history)
+            # Gradient constraint on one partition per block (round robin)
+            k = self._constrain
+            impulse = np.fft.irfft(self._weights[k], 2 * n)
+            impulse[n:] = 0
+            self._weights[k] = np.fft.rfft(impulse)
+            self._constrain = (k + 1) % self.partitions
+
+        return np.clip(error, -32768, 32767).astype(np.int16)
+
+    @staticmethod
+    def erle_db(near: np.ndarray, output: np.ndarray) -> float:
+        """Echo return loss enhancement of ``output`` over ``near``, in dB"""
+        near_power = float(np.mean(near.astype(np.float64) ** 2)) + 1e-9
+        out_power = float(np.mean(output.astype(np.float64) ** 2)) + 1e-9
+        return 10 * np.log10(near_power / out_power)
+
+
+def aec_enabled() -> bool:
+    """Echo cancellation is opt-in with AEC_ENABLED=1"""
+    return os.getenv("AEC_ENABLED", "0").lower() in ("1", "true", "yes", "on")
+
+
+def create_echo_canceller_from_env(block: int, sample_rate: int) -> EchoCanceller:
+    """Canceller with AEC_TAIL_MS of echo path"""
+    return EchoCanceller(block, sample_rate, tail_ms=float(os.getenv("AEC_TAIL_MS", "300")))
+
+
+def reference_delay_from_env() -> float:
+    """Bulk delay between publishing audio and hearing its echo, AEC_DELAY_MS"""
+    return float(os.getenv("AEC_DELAY_MS", "100")) / 1000
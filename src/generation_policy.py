@@ -0,0 +1,112 @@
+"""Limits on how long an LLM reply may run before it is cut off"""
+import asyncio
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from .text_segmentation import SentenceBuffer
+
+logger = logging.getLogger(__name__)
+
+# Why a reply stopped; anything but COMPLETE means it was truncated
+COMPLETE = "complete"
+MAX_TOKENS = "max_tokens"
+MAX_SENTENCES = "max_sentences"
+DEADLINE = "deadline"
+
+
+class ReplyLimiter:
+    """Applies a GenerationPolicy to one streamed reply.
+
+    Feed each text delta to ``accept`` and stop streaming once ``stop`` is
+    set. The sentence limit ends the reply with the sentence that reached
+    it. When the token budget or the deadline cuts a reply, it falls back
+    to the complete sentences received so far (or the partial text, if no
+    sentence was completed).
+    """
+
+    def __init__(self, policy: "GenerationPolicy", deadline_at: Optional[float] = None):
+        self.policy = policy
+        self.deadline_at = deadline_at  # Event loop time, for asyncio.timeout_at
+        self.tokens = 0
+        self.sentences = 0
+        self.stop: Optional[str] = None
+        self._parts = []
+        self._length = 0
+        self._complete = 0  # Length of the text made of complete sentences
+        self._buffer = SentenceBuffer()
+
+    def accept(self, text: str) -> str:
+        """Add a streamed delta; returns the part of it that belongs in the reply"""
+        if self.stop:
+            return ""
+        self.tokens += 1
+        completed = self._buffer.push(text)
+        if completed:
+            self.sentences += len(completed)
+            self._complete = self._length + len(text) - len(self._buffer.pending)
+            if self.policy.max_sentences and self.sentences >= self.policy.max_sentences:
+                # The delta that completes a sentence carries the start of the next one
+                text = text[:self._complete - self._length]
+                self.stop = MAX_SENTENCES
+        self._parts.append(text)
+        self._length += len(text)
+        if not self.stop and self.policy.max_tokens and self.tokens >= self.policy.max_tokens:
+            self.stop = MAX_TOKENS
+        return text
+
+    def truncate(self, reason: str):
+        """Cut the reply short from outside (deadline, backend length limit)"""
+        self.stop = self.stop or reason
+
+    @property
+    def text(self) -> str:
+        """The reply to keep and speak"""
+        text = "".join(self._parts)
+        if self.stop in (MAX_TOKENS, DEADLINE) and self._complete:
+            text = text[:self._complete]
+        return text.strip()
+
+
+@dataclass
+class GenerationPolicy:
+    """Per-turn budgets for LLM replies, and counts of how replies ended.
+
+    A value of 0 disables that limit.
+    """
+    max_tokens: int = 150      # Streamed chunks per reply (also passed to backends that take it)
+    max_sentences: int = 3     # Complete sentences before the stream is cancelled
+    deadline: float = 8.0      # Seconds from the request until the reply is cut
+    replies: Dict[str, int] = field(default_factory=dict)  # stop reason -> count
+
+    def start(self) -> ReplyLimiter:
+        """Limits for a reply requested now (call from the event loop)"""
+        deadline_at = asyncio.get_running_loop().time() + self.deadline if self.deadline else None
+        return ReplyLimiter(self, deadline_at)
+
+    def record(self, limiter: ReplyLimiter) -> str:
+        """Count a finished reply; returns why it stopped"""
+        stop = limiter.stop or COMPLETE
+        self.replies[stop] = self.replies.get(stop, 0) + 1
+        if stop != COMPLETE:
+            logger.info(f"Reply cut at {stop} after {limiter.tokens} chunks, {limiter.sentences} sentences")
+        return stop
+
+    @property
+    def truncation_rate(self) -> float:
+        total = sum(self.replies.values())
+        return (total - self.replies.get(COMPLETE, 0)) / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {"replies": sum(self.replies.values()), "truncation_rate": round(self.truncation_rate, 3),
+                "by_stop": dict(self.replies)}
+
+
+def create_generation_policy_from_env() -> GenerationPolicy:
+    """Policy from LLM_MAX_TOKENS, LLM_MAX_SENTENCES and LLM_DEADLINE_S"""
+    return GenerationPolicy(
+        max_tokens=int(os.getenv("LLM_MAX_TOKENS", "150")),
+        max_sentences=int(os.getenv("LLM_MAX_SENTENCES", "3")),
+        deadline=float(os.getenv("LLM_DEADLINE_S", "8.0")),
+    )
@@ -4,11 +4,11 @@ from .status_display import StatusDisplay
 
 class GUIStatusDisplay(StatusDisplay):
     """Enhanced status display for GUI"""
-    def __init__(self, update_callback: Optional[Callable] = None):
-        super().__init__()
+    def __init__(self, update_callback: Optional[Callable] = None, rate_hz: float = 10.0):
         self.update_callback = update_callback
-        
-    def _print_status(self):
+        super().__init__(rate_hz)
+
+    def _print_status(self, values):
         """Override to use callback instead of direct printing"""
         if self.update_callback:
-            self.update_callback()
\ No newline at end of file
+            self.update_callback()
@@ -0,0 +1,155 @@
+"""Bounded playback jitter buffer with clock drift control"""
+import logging
+import math
+
+import numpy as np
+
+from .audio_ring_buffer import Int16RingBuffer
+
+logger = logging.getLogger(__name__)
+
+
+class JitterBuffer:
+    """Playback buffer between network frames and the speaker callback.
+
+    Frames are pushed from the event loop and pulled from the PortAudio
+    callback thread through a preallocated int16 ring, so neither side
+    locks. Plain reads and writes do not allocate; time-stretched callbacks
+    do (``np.interp`` returns a new array). The buffer aims for
+    ``target_ms`` of audio:
+
+    * above ``max_ms`` (overrun) the oldest audio is dropped back to target.
+      The writer only records the stream position to skip to; the callback
+      does the skipping, so the read position has a single writer
+    * on underrun the gap is filled with silence and playback re-primes to
+      target before resuming
+    * when the smoothed depth drifts more than ``drift_tolerance_ms`` away
+      from target, each callback reads slightly more or fewer samples and
+      time-stretches them (by ``stretch``) to pull the depth back, which
+      absorbs sender/speaker clock drift without audible drops
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        channels: int = 1,
+        *,
+        target_ms: int = 60,
+        max_ms: int = 200,
+        capacity_ms: int = 1000,
+        drift_tolerance_ms: int = 20,
+        stretch: float = 0.02,
+        registry=None,
+    ):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        samples_per_ms = sample_rate * channels / 1000
+        self.target = int(target_ms * samples_per_ms)
+        self.max_depth = int(max_ms * samples_per_ms)
+        self.tolerance = int(drift_tolerance_ms * samples_per_ms)
+        self.stretch = stretch
+        self._ring = Int16RingBuffer(max(int(capacity_ms * samples_per_ms), self.max_depth * 2))
+        self._priming = True
+        self._skip_to = 0  # Ring read position the reader skips to (set by the writer)
+        self._smoothed_depth = 0.0
+        self._scratch = np.zeros(0, dtype=np.int16)
+        self._grids = {}
+
+        self.underruns = 0
+        self.overruns = 0
+        self.dropped_samples = 0   # Writer side: samples that did not fit in the ring
+        self.skipped_samples = 0   # Reader side: samples skipped to resolve overruns
+        self.stretched_callbacks = 0
+
+        self._metrics = None
+        if registry is not None:
+            self._metrics = (
+                registry.counter("ada_client_playback_underruns_total", "Speaker callbacks that ran out of audio"),
+                registry.counter("ada_client_playback_overruns_total", "Times the playback buffer exceeded its maximum"),
+                registry.gauge("ada_client_playback_buffer_ms", "Audio waiting in the playback buffer"),
+            )
+
+    def _depth(self) -> int:
+        """Samples waiting, not counting those the reader is due to skip"""
+        return self._ring.write_pos - max(self._ring.read_pos, self._skip_to)
+
+    def depth_ms(self) -> float:
+        return self._depth() * 1000 / (self.sample_rate * self.channels)
+
+    def push(self, samples: np.ndarray):
+        """Add received samples (event loop side)"""
+        self.dropped_samples += self._ring.write(samples)
+        start = max(self._ring.read_pos, self._skip_to)
+        depth = self._ring.write_pos - start
+        if depth > self.max_depth:
+            # Reader has fallen behind: have it skip the oldest audio back to target
+            excess = depth - self.target
+            excess -= excess % self.channels
+            self._skip_to = start + excess
+            self.overruns += 1
+            if self._metrics:
+                self._metrics[1].inc()
+        if self._metrics:
+            self._metrics[2].set(round(self.depth_ms(), 1))
+
+    def _grid(self, source_len: int, dest_len: int):
+        """Cached (output positions, source positions) for np.interp"""
+        key = (source_len, dest_len)
+        grid = self._grids.get(key)
+        if grid is None:
+            grid = self._grids[key] = (
+                np.linspace(0, source_len - 1, dest_len),
+                np.arange(source_len, dtype=np.float64),
+            )
+        return grid
+
+    def pull(self, out: np.ndarray) -> int:
+        """Fill ``out`` for the speaker (callback side). Returns samples of real audio."""
+        needed = len(out)
+        skip = self._skip_to - self._ring.read_pos
+        if skip > 0:
+            self.skipped_samples += self._ring.discard(skip)
+        depth = self._ring.available()
+
+        if self._priming:
+            if depth < self.target:
+                out[:] = 0
+                return 0
+            self._priming = False
+            self._smoothed_depth = depth
+
+        self._smoothed_depth += 0.05 * (depth - self._smoothed_depth)
+        drift = self._smoothed_depth - self.target
+
+        read_len = needed
+        if self.channels == 1 and abs(drift) > self.tolerance:
+            factor = 1 + self.stretch if drift > 0 else 1 - self.stretch
+            read_len = min(max(1, int(math.ceil(needed * factor))), depth)
+
+        if read_len != needed and read_len >= needed // 2:
+            if len(self._scratch) < read_len:
+                self._scratch = np.zeros(read_len * 2, dtype=np.int16)
+            got = self._ring.read(self._scratch[:read_len])
+            positions, source_positions = self._grid(got, needed)
+            out[:] = np.interp(positions, source_positions, self._scratch[:got])
+            self.stretched_callbacks += 1
+            return needed
+
+        got = self._ring.read(out)
+        if got < needed:
+            out[got:] = 0
+            self.underruns += 1
+            self._priming = True
+            if self._metrics:
+                self._metrics[0].inc()
+        return got
+
+    def stats(self) -> dict:
+        return {
+            "depth_ms": round(self.depth_ms(), 1),
+            "target_ms": self.target * 1000 / (self.sample_rate * self.channels),
+            "underruns": self.underruns,
+            "overruns": self.overruns,
+            "dropped_samples": self.dropped_samples + self.skipped_samples,
+            "stretched_callbacks": self.stretched_callbacks,
+        }
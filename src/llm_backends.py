@@ -0,0 +1,214 @@
+"""LLM backends by name, all streaming the same chunk type"""
+import asyncio
+import collections
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from .chunk_adapters import ChunkAdapter, openai_dict, select_adapter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LLMChunk:
+    text: str                            # Text delta; may be empty (e.g. role-only chunks)
+    finish_reason: Optional[str] = None  # Set on the last chunk when the backend reports one
+
+
+class LLMBackend:
+    """Streams a reply to a chat history as LLMChunks.
+
+    ``session`` identifies the conversation; backends that keep state
+    between requests (such as a KV cache) key it on the session.
+    ``max_tokens`` caps the reply where the backend can enforce it, and such
+    backends set ``finish_reason`` ("length" when the cap was hit). Not all
+    can: callers count tokens and cut the stream themselves as well (see
+    generation_policy).
+    """
+    name = "llm"
+
+    def stream(self, messages: List[dict], *, session: str = "default",
+               max_tokens: Optional[int] = None) -> AsyncIterator[LLMChunk]:
+        raise NotImplementedError
+
+    async def aclose(self):
+        pass
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    """Any OpenAI-compatible chat endpoint (Ollama, Cerebras) through LiveKit's OpenAI plugin.
+
+    ``max_tokens`` is not passed to the server, and the plugin's chunks carry
+    no finish reason, so replies are only capped by the caller closing the
+    stream (which cancels the request) and ``finish_reason`` is always None.
+    """
+
+    def __init__(self, llm, name: str):
+        self.llm = llm
+        self.name = name
+        self.adapter: Optional[ChunkAdapter] = None  # Picked from the first chunk ever streamed
+
+    def _chat(self, messages: List[dict]):
+        """The plugin's native chunk stream for ``messages``"""
+        from livekit.agents import llm as agent_llm
+        # Content must be a list of strings
+        chat_ctx = agent_llm.ChatContext([
+            agent_llm.ChatMessage(role=m["role"], content=[m["content"]]) for m in messages
+        ])
+        return self.llm.chat(chat_ctx=chat_ctx)
+
+    async def stream(self, messages: List[dict], *, session: str = "default",
+                     max_tokens: Optional[int] = None) -> AsyncIterator[LLMChunk]:
+        adapter = self.adapter
+        chat_stream = self._chat(messages)
+        try:
+            async for chunk in chat_stream:
+                if adapter is None:
+                    adapter = self.adapter = select_adapter(chunk)
+                    logger.debug("%s stream chunks are %s, using %s",
+                                 self.name, type(chunk).__name__, adapter.__name__)
+                yield LLMChunk(adapter(chunk))
+        finally:
+            # Closing the plugin's stream cancels the HTTP request, so a reply
+            # cut short stops generating on the server
+            await chat_stream.aclose()
+
+
+class LlamaCppBackend(LLMBackend):
+    """In-process llama.cpp (llama-cpp-python), with a KV cache kept per session.
+
+    No HTTP or JSON between the agent and the model. llama.cpp reuses the
+    evaluated KV cache for the longest common token prefix of consecutive
+    requests, so a session's next turn only evaluates the new messages.
+    With several sessions sharing the model, each one's KV state is saved
+    when another session takes over and restored when it comes back, for up
+    to ``max_sessions`` sessions (least recently used are dropped).
+    """
+    name = "llamacpp"
+
+    def __init__(self, model, *, max_sessions: int = 4, **generation):
+        self.model = model  # llama_cpp.Llama
+        self.generation = generation
+        self.max_sessions = max_sessions
+        self._states = collections.OrderedDict()  # session -> saved LlamaState
+        self._active_session: Optional[str] = None
+        self._lock = asyncio.Lock()  # One generation at a time on the shared context
+
+    @classmethod
+    def load(cls, model_path: str, *, n_ctx: int = 4096, n_gpu_layers: int = 0, **options) -> "LlamaCppBackend":
+        """Load a GGUF model (blocking)"""
+        try:
+            from llama_cpp import Llama
+        except ImportError:
+            raise RuntimeError("llama-cpp-python not installed. Run: pip install llama-cpp-python")
+        if not model_path or not os.path.exists(model_path):
+            raise RuntimeError(f"llama.cpp model not found: {model_path} (set LLAMACPP_MODEL_PATH)")
+        logger.info(f"Loading llama.cpp model: {model_path}")
+        return cls(Llama(model_path=model_path, n_ctx=n_ctx, n_gpu_layers=n_gpu_layers, verbose=False), **options)
+
+    def _switch_session(self, session: str):
+        """Make ``session``'s KV state current (runs on the generation thread)"""
+        if session == self._active_session:
+            return
+        if self._active_session is not None:
+            self._states[self._active_session] = self.model.save_state()
+            self._states.move_to_end(self._active_session)
+            while len(self._states) > self.max_sessions:
+                dropped, _ = self._states.popitem(last=False)
+                logger.debug(f"Dropped llama.cpp KV state of session {dropped}")
+        state = self._states.pop(session, None)
+        if state is not None:
+            self.model.load_state(state)
+        else:
+            self.model.reset()
+        self._active_session = session
+
+    async def stream(self, messages: List[dict], *, session: str = "default",
+                     max_tokens: Optional[int] = None) -> AsyncIterator[LLMChunk]:
+        loop = asyncio.get_running_loop()
+        generation = dict(self.generation, max_tokens=max_tokens) if max_tokens else self.generation
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
+
+        def produce():
+            try:
+                self._switch_session(session)
+                for part in self.model.create_chat_completion(messages=messages, stream=True, **generation):
+                    if stop.is_set():
+                        break
+                    chunk = LLMChunk(openai_dict(part), part["choices"][0].get("finish_reason"))
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+
+        async with self._lock:
+            producer = loop.run_in_executor(None, produce)
+            try:
+                while True:
+                    item = await queue.get()
+                    if item is done:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+                    yield item
+            finally:
+                # Cancelled or abandoned mid-reply: stop generating, and keep the
+                # lock until the thread is off the model
+                stop.set()
+                await asyncio.shield(producer)
+
+
+_BACKENDS: Dict[str, Callable[[], LLMBackend]] = {}
+
+
+def register_backend(name: str, factory: Callable[[], LLMBackend]):
+    """Make a backend available to LLM_BACKEND under ``name``"""
+    _BACKENDS[name] = factory
+
+
+def available_backends() -> List[str]:
+    return sorted(_BACKENDS)
+
+
+def _ollama() -> LLMBackend:
+    from livekit.plugins import openai
+    return OpenAICompatibleBackend(openai.LLM(
+        model=os.getenv("OLLAMA_MODEL", "llama3.2:3b"),
+        base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434/v1"),
+        api_key="ollama",
+    ), "ollama")
+
+
+def _cerebras() -> LLMBackend:
+    from livekit.plugins import openai
+    return OpenAICompatibleBackend(openai.LLM.with_cerebras(
+        model=os.getenv("CEREBRAS_MODEL", "llama3.1-8b"),
+    ), "cerebras")
+
+
+def _llamacpp() -> LLMBackend:
+    return LlamaCppBackend.load(
+        os.getenv("LLAMACPP_MODEL_PATH"),
+        n_ctx=int(os.getenv("LLAMACPP_N_CTX", "4096")),
+        n_gpu_layers=int(os.getenv("LLAMACPP_GPU_LAYERS", "0")),
+        max_sessions=int(os.getenv("LLAMACPP_SESSIONS", "4")),
+    )
+
+
+register_backend("ollama", _ollama)
+register_backend("cerebras", _cerebras)
+register_backend("llamacpp", _llamacpp)
+
+
+def create_llm_backend_from_env() -> LLMBackend:
+    """Backend named by LLM_BACKEND (default: ollama); blocking for in-process models"""
+    name = os.getenv("LLM_BACKEND", "ollama").strip().lower()
+    if name not in _BACKENDS:
+        raise ValueError(f"Unknown LLM backend '{name}' (available: {', '.join(available_backends())})")
+    return _BACKENDS[name]()
@@ -1,38 +1,85 @@
-# Alternative Coqui TTS implementation
+"""Local TTS implementation using Coqui TTS"""
+import asyncio
+import logging
+from typing import AsyncIterator, Optional
+
+import numpy as np
+from livekit import rtc
+from livekit.agents import tts
+
+from .coqui_options import CoquiOptions
+from .text_segmentation import split_sentences
+from .wav_utils import float_to_int16, resample
+
+logger = logging.getLogger(__name__)
+
+
 class LocalCoquiTTS(tts.TTS):
-    """Local TTS using Coqui TTS (XTTS v2)"""
-    
+    """Local TTS using Coqui TTS (Tacotron, VITS, XTTS v2, ...).
+
+    Audio comes straight from the in-memory ``tts()`` waveform API, is
+    converted to int16 in one vectorized step and is only resampled when
+    ``sample_rate`` differs from the model's native output rate (the
+    default, ``None``, uses the native rate).
+
+    ``synthesize_stream`` yields one chunk per sentence, so playback of a
+    long answer starts after the first sentence; this matters most for
+    XTTS, which is slow per call and degrades on long inputs.
+    """
+
     def __init__(
         self,
         *,
         model_name: str = "tts_models/en/ljspeech/tacotron2-DDC",
         speaker_wav: Optional[str] = None,
         language: str = "en",
-        sample_rate: int = 22050,
+        device: str = "cpu",
+        sample_rate: Optional[int] = None,
         num_channels: int = 1,
+        stream_sentences: bool = True,
     ):
+        if num_channels != 1:
+            raise ValueError("Coqui TTS produces mono audio")
+        self._options = CoquiOptions(
+            model_name=model_name,
+            speaker_wav=speaker_wav,
+            language=language,
+            device=device,
+            output_sample_rate=sample_rate,
+            stream_sentences=stream_sentences,
+        )
+        self._tts = None
+        self._initialize_model()
+        self.native_sample_rate = self._model_sample_rate()
         super().__init__(
             capabilities=tts.TTSCapabilities(
-                streaming=False,
+                streaming=stream_sentences,
             ),
-            sample_rate=sample_rate,
+            sample_rate=sample_rate or self.native_sample_rate,
             num_channels=num_channels,
         )
-        self._model_name = model_name
-        self._speaker_wav = speaker_wav
-        self._language = language
-        self._tts = None
-        self._initialize_model()
+        if self._sample_rate != self.native_sample_rate:
+            logger.info(f"Coqui output will be resampled from {self.native_sample_rate}Hz "
+                        f"to {self._sample_rate}Hz")
 
     def _initialize_model(self):
         """Initialize Coqui TTS model"""
         try:
             from TTS.api import TTS
-            logger.info(f"Loading Coqui TTS model: {self._model_name}")
-            self._tts = TTS(self._model_name)
-            logger.info("Coqui TTS model loaded successfully")
         except ImportError:
             raise RuntimeError("Coqui TTS not installed. Run: pip install TTS")
+        logger.info(f"Loading Coqui TTS model: {self._options.model_name}")
+        self._tts = TTS(self._options.model_name).to(self._options.device)
+        logger.info("Coqui TTS model loaded successfully")
+
+    def _model_sample_rate(self) -> int:
+        """The rate the model actually produces (24 kHz for XTTS, 22.05 kHz for most others)"""
+        synthesizer = getattr(self._tts, "synthesizer", None)
+        rate = getattr(synthesizer, "output_sample_rate", None)
+        if not rate:
+            logger.warning("Could not read the Coqui model's output rate, assuming 22050Hz")
+            return 22050
+        return int(rate)
 
     async def synthesize(
         self,
@@ -40,69 +87,50 @@ class LocalCoquiTTS(tts.TTS):
         *,
         voice: Optional[str] = None,
     ) -> tts.SynthesizedAudio:
-        """Synthesize speech from text"""
-        logger.info(f"Synthesizing text with Coqui: '{text}'")
-        
-        # Run synthesis in thread pool
+        """Synthesize speech from text as a single frame"""
+        logger.info(f"[Coqui] Synthesizing text: '{text}'")
         loop = asyncio.get_event_loop()
-        audio_data = await loop.run_in_executor(None, self._synthesize_sync, text)
-
-        # Create an AudioFrame from the raw audio data
-        samples_per_channel = len(audio_data) // (2 * self._num_channels)  # 16-bit = 2 bytes per sample
-        frame = rtc.AudioFrame.create(
-            sample_rate=self._sample_rate,
-            num_channels=self._num_channels,
-            samples_per_channel=samples_per_channel,
-        )
-        
-        # Copy audio data to frame using numpy to handle the memoryview properly
-        import numpy as np
-        frame_array = np.frombuffer(frame.data, dtype=np.int16)
-        audio_array = np.frombuffer(audio_data, dtype=np.int16)
-        frame_array[:] = audio_array
-        
+        audio = await loop.run_in_executor(None, self._synthesize_sync, text, True)
         return tts.SynthesizedAudio(
-            frame=frame,
+            frame=self._to_frame(audio),
             request_id="",  # Required but not used for non-streaming
             is_final=True,
         )
 
-    def _synthesize_sync(self, text: str) -> bytes:
-        """Run Coqui synthesis synchronously"""
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
-            tmp_path = tmp_file.name
-
-        try:
-            # Synthesize to file
-            if self._speaker_wav:
-                self._tts.tts_to_file(
-                    text=text,
-                    speaker_wav=self._speaker_wav,
-                    language=self._language,
-                    file_path=tmp_path,
-                )
-            else:
-                self._tts.tts_to_file(
-                    text=text,
-                    file_path=tmp_path,
-                )
+    async def synthesize_stream(self, text: str) -> AsyncIterator[tts.SynthesizedAudio]:
+        """Synthesize ``text`` one sentence at a time, yielding each as it is ready"""
+        sentences = split_sentences(text) if self._options.stream_sentences else [text]
+        loop = asyncio.get_event_loop()
+        for i, sentence in enumerate(sentences):
+            audio = await loop.run_in_executor(None, self._synthesize_sync, sentence, False)
+            yield tts.SynthesizedAudio(
+                frame=self._to_frame(audio),
+                request_id="",
+                is_final=i == len(sentences) - 1,
+            )
 
-            # Read the generated audio
-            with wave.open(tmp_path, "rb") as wav_file:
-                # Get just the PCM data without WAV headers
-                frames = wav_file.readframes(wav_file.getnframes())
-                
-                # Log for debugging
-                logger.debug(f"Generated audio: {wav_file.getnframes()} frames, {len(frames)} bytes")
-                
-            return frames
+    def _synthesize_sync(self, text: str, split_sentences: bool = True) -> np.ndarray:
+        """Run Coqui synthesis synchronously; returns int16 samples at the output rate"""
+        kwargs = {}
+        if getattr(self._tts, "is_multi_lingual", False):
+            kwargs["language"] = self._options.language
+        if self._options.speaker_wav:
+            kwargs["speaker_wav"] = self._options.speaker_wav
+        waveform = self._tts.tts(text=text, split_sentences=split_sentences, **kwargs)
+        audio = float_to_int16(waveform)
+        logger.debug(f"Coqui output: {len(audio)} samples at {self.native_sample_rate}Hz")
+        return resample(audio, self.native_sample_rate, self._sample_rate)
 
-        finally:
-            # Clean up temp file
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+    def _to_frame(self, audio: np.ndarray) -> rtc.AudioFrame:
+        frame = rtc.AudioFrame.create(
+            sample_rate=self._sample_rate,
+            num_channels=1,
+            samples_per_channel=len(audio),
+        )
+        np.frombuffer(frame.data, dtype=np.int16)[:] = audio
+        return frame
 
-    def stream(self, *, voice: Optional[str] = None) -> tts.SynthesizeStream:
-        """Create a streaming interface"""
-        # Similar implementation to PiperTTSStream
-        raise NotImplementedError("Streaming not implemented for Coqui TTS")
\ No newline at end of file
+    def stream(self, *, voice: Optional[str] = None) -> "CoquiTTSStream":
+        """Create a streaming interface that synthesizes each completed sentence"""
+        from .coqui_tts_stream import CoquiTTSStream
+        return CoquiTTSStream(tts=self, voice=voice)
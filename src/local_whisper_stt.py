@@ -1,14 +1,14 @@
 """Local STT implementation using faster-whisper"""
 import asyncio
 import numpy as np
-from typing import Optional
-from faster_whisper import WhisperModel
+from typing import Callable, Optional
 from livekit import agents
 from livekit.agents import stt, APIConnectOptions
 from livekit.agents.utils import AudioBuffer
 import logging
 
 from .whisper_options import WhisperOptions
+from .transcription import TranscriptionResult
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +28,11 @@ class LocalWhisperSTT(stt.STT):
         language: Target language for transcription (default: "en")
         initial_prompt: Optional prompt to guide transcription
         vad_filter: Whether to apply voice activity detection filtering
+        word_timestamps: Align each word to the audio (costs an extra pass per segment)
+
+    ``transcribe_array`` returns a ``TranscriptionResult`` with segment
+    timings, ``avg_logprob``/``no_speech_prob`` and, when word timestamps
+    are on, per-word timings; ``recognize`` reports its confidence.
     """
     
     def __init__(
@@ -39,6 +44,7 @@ class LocalWhisperSTT(stt.STT):
         language: str = "en",
         initial_prompt: Optional[str] = None,
         vad_filter: bool = True,
+        word_timestamps: bool = False,
     ):
         super().__init__(
             capabilities=stt.STTCapabilities(
@@ -53,12 +59,15 @@ class LocalWhisperSTT(stt.STT):
             language=language,
             initial_prompt=initial_prompt,
             vad_filter=vad_filter,
+            word_timestamps=word_timestamps,
         )
         self._model = None
         self._initialize_model()
 
     def _initialize_model(self):
         """Initialize the Whisper model"""
+        # Imported here: faster-whisper pulls in ctranslate2 and takes a while
+        from faster_whisper import WhisperModel
         logger.info(f"Loading Whisper model: {self._options.model_size}")
         self._model = WhisperModel(
             self._options.model_size,
@@ -88,16 +97,12 @@ class LocalWhisperSTT(stt.STT):
 
         # Run inference in thread pool
         loop = asyncio.get_event_loop()
-        segments, info = await loop.run_in_executor(
+        result = await loop.run_in_executor(
             None,
-            self._transcribe,
-            audio_data,
-            language or self._options.language,
+            lambda: self.transcribe_array(audio_data, language=language or self._options.language),
         )
 
-        # Combine all segments
-        text = " ".join([segment.text.strip() for segment in segments])
-        
+        text = result.text
         if not text:
             return stt.SpeechEvent(
                 type=stt.SpeechEventType.END_OF_SPEECH,
@@ -109,24 +114,48 @@ class LocalWhisperSTT(stt.STT):
             alternatives=[
                 stt.SpeechData(
                     text=text,
-                    language=info.language,
-                    confidence=1.0,
+                    language=result.language,
+                    confidence=result.confidence,
+                    start_time=result.segments[0].start,
+                    end_time=result.speech_end,
                 )
             ],
         )
 
-    def _transcribe(self, audio_data: np.ndarray, language: str):
-        """Run Whisper transcription"""
+    def transcribe_array(
+        self,
+        audio_data: np.ndarray,
+        *,
+        language: Optional[str] = None,
+        word_timestamps: Optional[bool] = None,
+        vad_filter: Optional[bool] = None,
+        on_segment: Optional[Callable[[str], None]] = None,
+    ) -> TranscriptionResult:
+        """Transcribe 16 kHz float32 audio (blocking; run it in an executor).
+
+        ``word_timestamps`` and ``vad_filter`` override the options for this
+        call. Segments are decoded lazily; ``on_segment`` gets the text so
+        far as each one is produced.
+        """
         if self._model is None:
             raise RuntimeError("Whisper model not initialized")
+        if word_timestamps is None:
+            word_timestamps = self._options.word_timestamps
         segments, info = self._model.transcribe(
             audio_data,
             beam_size=5,
-            language=language,
+            language=language or self._options.language,
             initial_prompt=self._options.initial_prompt,
-            vad_filter=self._options.vad_filter,
+            vad_filter=self._options.vad_filter if vad_filter is None else vad_filter,
+            vad_parameters=self._options.vad_parameters,
+            word_timestamps=word_timestamps,
         )
-        return list(segments), info
+        decoded = []
+        for segment in segments:
+            decoded.append(segment)
+            if on_segment:
+                on_segment(" ".join(s.text.strip() for s in decoded))
+        return TranscriptionResult.from_whisper(decoded, info)
 
     def stream(
         self,
@@ -0,0 +1,332 @@
+"""Prometheus-style metrics for the agent process"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+RATE_BUCKETS = (1, 2, 5, 10, 20, 30, 50, 75, 100, 200)
+RATIO_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 5.0)
+
+
+def _label_key(labelnames: Tuple[str, ...], labels: dict) -> Tuple[str, ...]:
+    if set(labels) != set(labelnames):
+        raise ValueError(f"Expected labels {labelnames}, got {tuple(labels)}")
+    return tuple(str(labels[name]) for name in labelnames)
+
+
+def _format_labels(labelnames: Tuple[str, ...], key: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{value}"' for name, value in zip(labelnames, key)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing value"""
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(self.labelnames, labels), 0)
+
+    def render(self):
+        lines = self._header()
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+    kind = "gauge"
+
+    def __init__(self, name, help_text, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(self.labelnames, labels), 0)
+
+    def render(self):
+        lines = self._header()
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Cumulative bucketed observations with sum and count"""
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets=LATENCY_BUCKETS, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # label key -> [bucket counts..., sum, count]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def count(self, **labels) -> int:
+        state = self._values.get(_label_key(self.labelnames, labels))
+        return state[-1] if state else 0
+
+    def render(self):
+        lines = self._header()
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+        for key, state in items:
+            for bound, bucket_count in zip(self.buckets, state):
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {bucket_count}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{labels} {state[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds metrics and renders them in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help_text, labelnames=()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, buckets=LATENCY_BUCKETS, labelnames=()) -> Histogram:
+        return self._register(Histogram(name, help_text, buckets, labelnames))
+
+    def get(self, name) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class AgentMetrics:
+    """The agent's standard metric set.
+
+    Also acts as a turn-trace exporter so per-turn latencies recorded by the
+    TurnTracer are turned into histograms without timing anything twice.
+    """
+
+    PIPELINE_STATES = ("recording", "transcribing", "thinking", "speaking", "dictating")
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        self.registry = registry or MetricsRegistry()
+        r = self.registry
+        self.utterances = r.counter(
+            "ada_utterances_total", "Finished turns by outcome", ["source", "outcome"])
+        self.stt_latency = r.histogram(
+            "ada_stt_latency_seconds", "Whisper transcription latency")
+        self.stage_latency = r.histogram(
+            "ada_turn_stage_seconds", "Per-stage turn latency", labelnames=["stage"])
+        self.llm_tokens_per_second = r.histogram(
+            "ada_llm_tokens_per_second", "LLM streaming throughput", RATE_BUCKETS)
+        self.llm_replies = r.counter(
+            "ada_llm_replies_total", "LLM replies by what ended them (complete or a generation limit)", ["stop"])
+        self.tts_rtf = r.histogram(
+            "ada_tts_real_time_factor", "TTS synthesis time divided by audio duration", RATIO_BUCKETS)
+        self.queue_depth = r.gauge(
+            "ada_queue_depth", "Items waiting in internal queues", ["queue"])
+        self.dropped_frames = r.counter(
+            "ada_dropped_frames_total", "Audio frames dropped or discarded", ["path"])
+        self.executor_wait = r.histogram(
+            "ada_executor_wait_seconds", "Time blocking work waited for an executor thread")
+        self.active_sessions = r.gauge(
+            "ada_active_sessions", "Participants whose audio is being processed")
+        self.pipeline_state = r.gauge(
+            "ada_pipeline_state", "1 while the pipeline is in the given state", ["state"])
+        self.audio_level = r.gauge(
+            "ada_audio_level_rms", "Most recent input audio RMS level")
+        self.noise_floor = r.gauge(
+            "ada_noise_floor_rms", "Estimated input noise floor RMS level")
+        self.false_triggers = r.counter(
+            "ada_false_triggers_total", "Detected utterances that produced no usable transcript", ["reason"])
+        self.barge_ins = r.counter(
+            "ada_barge_ins_total", "Replies cut off because the user talked over the agent")
+        self.gate_rejections = r.counter(
+            "ada_gate_rejections_total", "Utterances rejected before STT", ["reason"])
+        self.wasted_stt_seconds = r.counter(
+            "ada_wasted_stt_seconds_total", "Transcription time spent on utterances with empty transcripts")
+        self.wasted_audio_seconds = r.counter(
+            "ada_wasted_audio_seconds_total", "Audio sent to STT that produced empty transcripts")
+        for state in self.PIPELINE_STATES:
+            self.pipeline_state.set(0, state=state)
+
+    def set_state(self, state: str, active: bool):
+        self.pipeline_state.set(1 if active else 0, state=state)
+
+    def export(self, trace):
+        """TurnTracer exporter hook"""
+        self.utterances.inc(source=trace.source, outcome=trace.outcome)
+        stages = trace.stages()
+        for stage, duration in stages.items():
+            self.stage_latency.observe(duration, stage=stage)
+        if "stt" in stages:
+            self.stt_latency.observe(stages["stt"])
+        if trace.outcome in ("too_short", "gated", "empty_transcript"):
+            self.false_triggers.inc(reason=trace.outcome)
+            if trace.outcome == "empty_transcript" and "stt" in stages:
+                self.wasted_stt_seconds.inc(stages["stt"])
+                self.wasted_audio_seconds.inc(trace.attributes.get("utterance_seconds", 0.0))
+        chunks = trace.attributes.get("llm_chunks")
+        if chunks and stages.get("llm"):
+            self.llm_tokens_per_second.observe(chunks / stages["llm"])
+        stop = trace.attributes.get("llm_stop")
+        if stop:
+            self.llm_replies.inc(stop=stop)
+        audio_seconds = trace.attributes.get("tts_audio_seconds")
+        if audio_seconds and "tts" in stages:
+            self.tts_rtf.observe(stages["tts"] / audio_seconds)
+
+    def close(self):
+        pass
+
+    async def run_in_executor(self, func, *args):
+        """run_in_executor that records how long the job queued for a thread"""
+        submitted = time.monotonic()
+
+        def timed():
+            self.executor_wait.observe(time.monotonic() - submitted)
+            return func(*args)
+
+        return await asyncio.get_running_loop().run_in_executor(None, timed)
+
+
+class MetricsServer:
+    """Minimal HTTP server exposing /metrics on the running event loop"""
+
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9108):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        sockets = self._server.sockets or []
+        if sockets:
+            self.port = sockets[0].getsockname()[1]
+        logger.info(f"Metrics available at http://{self.host}:{self.port}/metrics")
+
+    async def _handle(self, reader, writer):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+            # Drain headers
+            while True:
+                line = await asyncio.wait_for(reader.readline(), timeout=5)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+            parts = request_line.decode("latin-1").split()
+            path = parts[1].split("?")[0] if len(parts) > 1 else ""
+            if len(parts) > 1 and parts[0] == "GET" and path == "/metrics":
+                body = self.registry.render().encode()
+                status = "200 OK"
+                content_type = "text/plain; version=0.0.4; charset=utf-8"
+            else:
+                body = b"Not Found\n"
+                status = "404 Not Found"
+                content_type = "text/plain"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except Exception as e:
+            logger.debug(f"Metrics request failed: {e}")
+        finally:
+            writer.close()
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+async def start_metrics_server_from_env(registry: MetricsRegistry) -> Optional[MetricsServer]:
+    """Start the /metrics endpoint if METRICS_PORT is set"""
+    port = os.getenv("METRICS_PORT")
+    if not port:
+        return None
+    server = MetricsServer(registry, os.getenv("METRICS_HOST", "127.0.0.1"), int(port))
+    try:
+        await server.start()
+    except OSError as e:
+        logger.error(f"Could not start metrics server on port {port}: {e}")
+        return None
+    print(f"📈 Metrics endpoint: http://{server.host}:{server.port}/metrics")
+    return server
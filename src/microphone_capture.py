@@ -0,0 +1,133 @@
+"""Callback-mode microphone capture feeding an asyncio reader"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+from .audio_ring_buffer import Int16RingBuffer
+from .turn_tracer import percentile
+
+logger = logging.getLogger(__name__)
+
+
+class FrameJitterStats:
+    """Tracks how far frame arrival intervals deviate from the nominal period"""
+
+    def __init__(self, period: float, history: int = 500):
+        self.period = period
+        self.frames = 0
+        self.late_frames = 0
+        self.max_jitter = 0.0
+        self._deviations = deque(maxlen=history)
+        self._last: Optional[float] = None
+
+    def record(self, timestamp: Optional[float] = None):
+        now = time.monotonic() if timestamp is None else timestamp
+        if self._last is not None:
+            deviation = abs((now - self._last) - self.period)
+            self._deviations.append(deviation)
+            if deviation > self.max_jitter:
+                self.max_jitter = deviation
+            if deviation > self.period:
+                self.late_frames += 1
+        self._last = now
+        self.frames += 1
+
+    def summary(self) -> dict:
+        deviations = list(self._deviations)
+        return {
+            "frames": self.frames,
+            "mean_jitter_ms": (sum(deviations) / len(deviations) * 1000) if deviations else 0.0,
+            "p95_jitter_ms": (percentile(deviations, 95) or 0.0) * 1000,
+            "max_jitter_ms": self.max_jitter * 1000,
+            "late_frames": self.late_frames,
+        }
+
+
+class MicrophoneCapture:
+    """Captures the microphone with a PyAudio callback into a ring buffer.
+
+    PortAudio's callback thread only copies samples into the ring buffer and
+    wakes the event loop; ``read_frame`` then hands out fixed-size frames
+    without ever blocking the loop.
+    """
+
+    def __init__(self, audio, sample_rate: int = 16000, samples_per_frame: int = 320,
+                 buffer_ms: int = 500):
+        self.audio = audio
+        self.sample_rate = sample_rate
+        self.samples_per_frame = samples_per_frame
+        self.stream = None
+        self.overflows = 0
+        self.dropped_samples = 0
+        self._ring = Int16RingBuffer(sample_rate * buffer_ms // 1000)
+        self._frame = np.zeros(samples_per_frame, dtype=np.int16)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._data_ready = asyncio.Event()
+        period = samples_per_frame / sample_rate
+        self.callback_jitter = FrameJitterStats(period)
+        self.frame_jitter = FrameJitterStats(period)
+
+    def start(self):
+        """Open the input stream in callback mode"""
+        import pyaudio
+
+        self._loop = asyncio.get_running_loop()
+        self._paContinue = pyaudio.paContinue
+        self._paInputOverflow = pyaudio.paInputOverflow
+        self.stream = self.audio.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=self.sample_rate,
+            input=True,
+            frames_per_buffer=self.samples_per_frame,
+            stream_callback=self._callback,
+        )
+        self.stream.start_stream()
+
+    def _callback(self, in_data, frame_count, time_info, status_flags):
+        """PortAudio thread: copy samples and wake the reader, nothing else"""
+        self.callback_jitter.record()
+        if status_flags & self._paInputOverflow:
+            self.overflows += 1
+        self.dropped_samples += self._ring.write(np.frombuffer(in_data, dtype=np.int16))
+        if self._ring.available() >= self.samples_per_frame:
+            self._loop.call_soon_threadsafe(self._data_ready.set)
+        return (None, self._paContinue)
+
+    async def read_frame(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """Wait for the next frame. The returned array is reused on the next call.
+        Returns None if no frame arrives within ``timeout`` seconds."""
+        while self._ring.available() < self.samples_per_frame:
+            self._data_ready.clear()
+            # Re-check after clearing so a wake-up between the two is not lost
+            if self._ring.available() >= self.samples_per_frame:
+                break
+            try:
+                await asyncio.wait_for(self._data_ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        self._ring.read(self._frame)
+        self.frame_jitter.record()
+        return self._frame
+
+    def stats(self) -> dict:
+        return {
+            "callback": self.callback_jitter.summary(),
+            "frames": self.frame_jitter.summary(),
+            "input_overflows": self.overflows,
+            "dropped_samples": self.dropped_samples,
+            "buffered_samples": self._ring.available(),
+        }
+
+    def stop(self):
+        if self.stream:
+            try:
+                self.stream.stop_stream()
+                self.stream.close()
+            except Exception as e:
+                logger.debug(f"Error closing microphone stream: {e}")
+            self.stream = None
@@ -0,0 +1,127 @@
+"""Event-driven, coalesced rendering for the Rich TUI clients"""
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+from rich.text import Text
+
+logger = logging.getLogger(__name__)
+
+
+class RenderScheduler:
+    """Redraws only the layout panels that changed, at most ``max_fps`` times a second.
+
+    State changes call ``mark_dirty(panel)`` from any thread. The scheduler
+    task sleeps until something is dirty, waits out the rest of the frame
+    budget so bursts coalesce into one redraw, rebuilds just the dirty panels
+    and refreshes the ``Live`` display once. Nothing runs while idle, so the
+    ``Live`` should be created with ``auto_refresh=False``.
+    """
+
+    def __init__(self, layout, max_fps: float = 10.0):
+        self.layout = layout
+        self.frame_interval = 1.0 / max_fps
+        self.live = None
+        self.frames = 0
+        self.panel_updates = 0
+        self._renderers: Dict[str, Callable] = {}
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._wake_pending = False
+        self._wake = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._last_frame = 0.0
+
+    def add_panel(self, name: str, renderer: Callable):
+        """Register the function that builds the renderable for layout[name]"""
+        self._renderers[name] = renderer
+        self.mark_dirty(name)
+
+    def mark_dirty(self, *names: str):
+        """Request a redraw of the named panels (thread-safe, cheap)"""
+        with self._lock:
+            self._dirty.update(names or self._renderers)
+            if self._wake_pending or self._loop is None:
+                return
+            self._wake_pending = True
+        try:
+            self._loop.call_soon_threadsafe(self._wake.set)
+        except RuntimeError:  # Loop already closed during shutdown
+            pass
+
+    def render_now(self):
+        """Rebuild the dirty panels and refresh immediately"""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            self._wake_pending = False
+        for name in dirty:
+            renderer = self._renderers.get(name)
+            if renderer is None:
+                continue
+            try:
+                self.layout[name].update(renderer())
+            except Exception as e:
+                logger.error(f"Error rendering {name} panel: {e}")
+        self.panel_updates += len(dirty)
+        if self.live is not None:
+            self.live.refresh()
+        self.frames += 1
+        self._last_frame = time.monotonic()
+
+    async def run(self, live):
+        """Render until cancelled"""
+        self.live = live
+        self._loop = asyncio.get_running_loop()
+        self.render_now()
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            delay = self._last_frame + self.frame_interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.render_now()
+
+    def stats(self) -> dict:
+        return {"frames": self.frames, "panel_updates": self.panel_updates}
+
+
+class IncrementalText:
+    """Rich ``Text`` of the most recent items, built from cached fragments.
+
+    Each item is formatted once by ``formatter`` when appended. Appends
+    extend the existing ``Text``; only when old items fall off the end is it
+    re-joined from the cached fragments.
+    """
+
+    def __init__(self, formatter: Callable[..., Text], max_items: int,
+                 separator: str = "\n", placeholder: Optional[Text] = None):
+        self.formatter = formatter
+        self.separator = separator
+        self.placeholder = placeholder if placeholder is not None else Text()
+        self._fragments = deque(maxlen=max_items)
+        self._text = Text()
+        self._stale = False
+
+    def append(self, item):
+        fragment = self.formatter(item)
+        if len(self._fragments) == self._fragments.maxlen:
+            self._stale = True
+        elif self._fragments:
+            self._text.append(self.separator)
+        self._fragments.append(fragment)
+        if not self._stale:
+            self._text.append_text(fragment)
+
+    def __len__(self):
+        return len(self._fragments)
+
+    def render(self) -> Text:
+        if not self._fragments:
+            return self.placeholder
+        if self._stale:
+            self._text = Text(self.separator).join(self._fragments)
+            self._stale = False
+        return self._text
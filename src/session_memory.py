@@ -0,0 +1,259 @@
+"""Persistent conversation memory per participant, with BM25 recall under a time budget"""
+import asyncio
+import heapq
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+")
+# Too common to say anything about relevance
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "can", "do", "for", "from", "have", "he",
+    "her", "his", "how", "i", "if", "in", "is", "it", "its", "me", "my", "of", "on", "or", "our",
+    "she", "so", "that", "the", "their", "them", "there", "they", "this", "to", "was", "we", "what",
+    "when", "where", "which", "who", "will", "with", "would", "you", "your",
+}
+# Postings scored between budget checks
+_CHECK_EVERY = 256
+# Share of the recall budget kept for ranking the scored exchanges
+_RANKING_SHARE = 0.2
+
+
+def tokenize(text: str) -> List[str]:
+    return [word for word in _WORD.findall(text.lower()) if word not in STOPWORDS]
+
+
+@dataclass
+class Exchange:
+    """One user message and the agent's reply to it"""
+    id: int
+    identity: str
+    session: str
+    created: float  # Wall-clock time
+    user_text: str
+    agent_text: str
+
+
+@dataclass
+class Recall:
+    exchanges: List[Exchange] = field(default_factory=list)  # Best match first
+    elapsed_ms: float = 0.0
+    truncated: bool = False  # Budget ran out before every query term was scored
+
+
+class MemoryStore:
+    """Append-only SQLite (WAL) log of exchanges. Blocking; call it from an executor."""
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # WAL makes NORMAL safe against corruption; only the last commits can be lost on power failure
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS exchanges ("
+                "id INTEGER PRIMARY KEY, identity TEXT NOT NULL, session TEXT NOT NULL, "
+                "created REAL NOT NULL, user_text TEXT NOT NULL, agent_text TEXT NOT NULL)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS exchanges_identity ON exchanges (identity, id)")
+            self._conn.commit()
+
+    def append(self, identity: str, session: str, user_text: str, agent_text: str) -> Exchange:
+        created = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO exchanges (identity, session, created, user_text, agent_text) VALUES (?, ?, ?, ?, ?)",
+                (identity, session, created, user_text, agent_text))
+            self._conn.commit()
+        return Exchange(cursor.lastrowid, identity, session, created, user_text, agent_text)
+
+    def load(self, identity: str) -> List[Exchange]:
+        """Every exchange with ``identity``, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, identity, session, created, user_text, agent_text FROM exchanges "
+                "WHERE identity = ? ORDER BY id", (identity,)).fetchall()
+        return [Exchange(*row) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class BM25Index:
+    """In-memory inverted index over one participant's exchanges"""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.exchanges: List[Exchange] = []
+        self._postings: Dict[str, Dict[int, int]] = {}  # term -> {document: term frequency}
+        self._lengths: List[int] = []
+        self._total_length = 0
+        self._ids = set()
+        self._sessions: Dict[str, set] = {}  # session -> its documents
+
+    def __len__(self):
+        return len(self.exchanges)
+
+    def add(self, exchange: Exchange):
+        if exchange.id in self._ids:
+            return
+        self._ids.add(exchange.id)
+        doc = len(self.exchanges)
+        terms = tokenize(f"{exchange.user_text} {exchange.agent_text}")
+        self.exchanges.append(exchange)
+        self._sessions.setdefault(exchange.session, set()).add(doc)
+        self._lengths.append(len(terms))
+        self._total_length += len(terms)
+        for term in terms:
+            postings = self._postings.setdefault(term, {})
+            postings[doc] = postings.get(doc, 0) + 1
+
+    def search(self, query: str, k: int, deadline: float, exclude_session: Optional[str] = None):
+        """Top ``k`` exchanges for ``query``; scoring stops at ``deadline`` (perf_counter time).
+
+        Terms are scored rarest first, so when the budget runs out the most
+        informative ones have been counted. Returns (exchanges, truncated).
+        """
+        count = len(self.exchanges)
+        if not count:
+            return [], False
+        average = self._total_length / count
+        terms = sorted({t for t in tokenize(query) if t in self._postings}, key=lambda t: len(self._postings[t]))
+        scores: Dict[int, float] = {}
+        truncated = False
+        for term in terms:
+            if time.perf_counter() > deadline:
+                truncated = True
+                break
+            postings = self._postings[term]
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for scored, (doc, tf) in enumerate(postings.items(), 1):
+                if scored % _CHECK_EVERY == 0 and time.perf_counter() > deadline:
+                    truncated = True
+                    break
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc] / average)
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+            if truncated:
+                break
+        excluded = self._sessions.get(exclude_session, ()) if exclude_session is not None else ()
+        best = heapq.nlargest(k + len(excluded), scores, key=scores.get)
+        return [self.exchanges[doc] for doc in best if doc not in excluded][:k], truncated
+
+
+class SessionMemory:
+    """Remembers exchanges per participant identity and recalls relevant past ones.
+
+    Every exchange is appended to the SQLite store in the background. Each
+    participant's history is indexed in memory the first time they speak (or
+    on ``preload``, when they join); until their index is ready, recall
+    returns nothing rather than delaying the turn. Recall stops scoring
+    after ``budget_ms`` so its cost stays bounded as memory grows.
+    """
+
+    def __init__(self, store: MemoryStore, *, top_k: int = 3, budget_ms: float = 5.0):
+        self.store = store
+        self.top_k = top_k
+        self.budget_ms = budget_ms
+        self._indexes: Dict[str, BM25Index] = {}
+        self._loading: Dict[str, asyncio.Task] = {}
+        self._writes = set()
+
+    def preload(self, identity: str) -> asyncio.Task:
+        """Start indexing ``identity``'s history in the executor"""
+        task = self._loading.get(identity)
+        if task is None:
+            task = self._loading[identity] = asyncio.create_task(self._load(identity))
+        return task
+
+    async def _load(self, identity: str):
+        started = time.perf_counter()
+        try:
+            index = await asyncio.get_running_loop().run_in_executor(None, self._build_index, identity)
+        except Exception as e:
+            logger.error(f"Failed to load memory of {identity}: {e}")
+            # Forget the attempt so a later turn retries
+            self._loading.pop(identity, None)
+            return
+        self._indexes[identity] = index
+        logger.info(f"Indexed {len(index)} past exchanges with {identity} in "
+                    f"{(time.perf_counter() - started) * 1000:.0f}ms")
+
+    def _build_index(self, identity: str) -> BM25Index:
+        index = BM25Index()
+        for exchange in self.store.load(identity):
+            index.add(exchange)
+        return index
+
+    def recall(self, identity: str, query: str, *, exclude_session: Optional[str] = None) -> Recall:
+        """Past exchanges relevant to ``query``, found within the time budget.
+
+        ``exclude_session`` leaves out exchanges already in the prompt.
+        """
+        started = time.perf_counter()
+        index = self._indexes.get(identity)
+        if index is None:
+            self.preload(identity)
+            return Recall()
+        deadline = started + self.budget_ms * (1 - _RANKING_SHARE) / 1000
+        exchanges, truncated = index.search(query, self.top_k, deadline, exclude_session)
+        elapsed = (time.perf_counter() - started) * 1000
+        if truncated:
+            logger.debug(f"Memory recall for {identity} hit its {self.budget_ms}ms budget")
+        return Recall(exchanges, elapsed, truncated)
+
+    def remember(self, identity: str, session: str, user_text: str, agent_text: str):
+        """Store an exchange in the background"""
+        task = asyncio.create_task(self._remember(identity, session, user_text, agent_text))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def _remember(self, identity, session, user_text, agent_text):
+        try:
+            # Index after loading, or the load could miss or repeat this exchange
+            await self.preload(identity)
+            exchange = await asyncio.get_running_loop().run_in_executor(
+                None, self.store.append, identity, session, user_text, agent_text)
+            index = self._indexes.get(identity)
+            if index is not None:  # None if the history failed to load
+                index.add(exchange)
+        except Exception as e:
+            logger.error(f"Failed to store exchange with {identity}: {e}")
+
+    async def aclose(self):
+        """Finish pending writes and close the store"""
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+        self.store.close()
+
+
+def format_recall(recall: Recall, agent_name: str = "Ada") -> str:
+    """Recalled exchanges as a note for the prompt, oldest first"""
+    lines = ["Relevant parts of earlier conversations with this user:"]
+    for exchange in sorted(recall.exchanges, key=lambda e: e.id):
+        lines.append(f"User: {exchange.user_text}\n{agent_name}: {exchange.agent_text}")
+    return "\n".join(lines)
+
+
+def create_session_memory_from_env() -> Optional[SessionMemory]:
+    """Memory stored in MEMORY_DB (disabled if unset), with MEMORY_TOP_K and MEMORY_RECALL_BUDGET_MS"""
+    path = os.getenv("MEMORY_DB")
+    if not path:
+        return None
+    logger.info(f"Conversation memory: {path}")
+    return SessionMemory(
+        MemoryStore(path),
+        top_k=int(os.getenv("MEMORY_TOP_K", "3")),
+        budget_ms=float(os.getenv("MEMORY_RECALL_BUDGET_MS", "5")),
+    )
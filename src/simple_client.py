@@ -0,0 +1,213 @@
+"""Plain terminal voice and text client, ada-gui.py's fallback without Rich"""
+import asyncio
+import logging
+import queue
+import threading
+import time
+from typing import Optional
+
+from . import startup_profiler
+from .client import VoiceClient, StatusDisplay
+from .conversation_store import create_store_from_env
+
+logger = logging.getLogger(__name__)
+
+
+class EnhancedConversationManager:
+    """Enhanced conversation manager with text input integration"""
+    ICONS = {"agent": "🤖", "system": "ℹ️"}
+    
+    def __init__(self, max_messages: int = 100):
+        self.store = create_store_from_env(max_messages)
+        self.max_messages = max_messages
+        self.update_callback = None
+        self.text_to_voice_callback = None
+        
+    def set_callbacks(self, update_callback, text_to_voice_callback=None):
+        """Set UI update and text-to-voice callbacks"""
+        self.update_callback = update_callback
+        self.text_to_voice_callback = text_to_voice_callback
+        
+    def _add(self, role: str, text: str, source: Optional[str] = None):
+        self.store.append(role, text, source)
+        if self.update_callback:
+            self.update_callback()
+        
+    def add_user_message(self, text: str, source: str = "text"):
+        """Add user message with source tracking"""
+        self._add("user", text, source)
+        
+        # If text input, send to agent via data channel
+        if source == "text" and self.text_to_voice_callback:
+            self.text_to_voice_callback(text)
+            
+    def add_agent_message(self, text: str):
+        """Add agent message"""
+        self._add("agent", text)
+            
+    def add_system_message(self, text: str):
+        """Add system message"""
+        self._add("system", text)
+        
+    def icon(self, record) -> str:
+        if record.role == "user":
+            return "⌨️" if record.source == "text" else "🎤"
+        return self.ICONS.get(record.role, "")
+            
+    def get_recent_messages(self, count: int = 20) -> list:
+        """Get recent messages for display"""
+        return self.store.recent(count)
+        
+    def messages_since(self, cursor: int):
+        """Messages added after ``cursor`` and the cursor to pass next time"""
+        return self.store.since(cursor)
+
+
+class TextInputManager:
+    """Manages text input in a separate thread"""
+    def __init__(self, conversation_manager: EnhancedConversationManager):
+        self.conversation = conversation_manager
+        self.input_queue = queue.Queue()
+        self.running = True
+        self.input_thread = None
+        
+    def start(self):
+        """Start the input thread"""
+        self.input_thread = threading.Thread(
+            target=self._input_loop, 
+            daemon=True
+        )
+        self.input_thread.start()
+        
+    def stop(self):
+        """Stop the input thread"""
+        self.running = False
+        
+    def _input_loop(self):
+        """Main input handling loop"""
+        print("\n💬 Text input ready! Type your messages and press Enter.")
+        print("   Voice input also active via microphone.")
+        print("   Press Ctrl+C to exit.\n")
+        
+        while self.running:
+            try:
+                # Get user input
+                user_input = input("💬 You: ").strip()
+                
+                if user_input:
+                    # Add to conversation with text source
+                    self.conversation.add_user_message(user_input, "text")
+                    
+            except (EOFError, KeyboardInterrupt):
+                break
+            except Exception as e:
+                logger.error(f"Input error: {e}")
+                time.sleep(0.1)
+
+
+class EnhancedStatusDisplay(StatusDisplay):
+    """Enhanced status display with conversation integration"""
+    def __init__(self, conversation_manager: EnhancedConversationManager):
+        self.conversation = conversation_manager
+        self.last_status_line = ""
+        super().__init__(rate_hz=5)
+        
+    def _print_status(self, values):
+        """Enhanced status display with better formatting"""
+        mic_level = values["mic_level"]
+        
+        # Build status components
+        meter_level = min(15, int(mic_level / 600))
+        meter = "█" * meter_level + "░" * (15 - meter_level)
+        
+        # Mic status with color coding
+        if mic_level < 200:
+            mic_status = "🔇 Silent"
+        elif mic_level < 800:
+            mic_status = "🔉 Noise"
+        else:
+            mic_status = "🔊 SPEAKING"
+        
+        # Agent status
+        if values["agent_speaking"]:
+            agent_status = "🤖 Ada SPEAKING"
+        else:
+            agent_status = "👂 Ada Listening"
+        
+        # Connection status
+        conn_display = values["connection_status"]
+        
+        # Build status line
+        status_line = (
+            f"\r📊 {mic_status} [{meter}] {mic_level:4d} | "
+            f"{agent_status} | {conn_display}"
+        )
+        
+        # Only update if changed to reduce flicker
+        if status_line != self.last_status_line:
+            print(f"{status_line:<80}", end="", flush=True)
+            self.last_status_line = status_line
+
+
+class SimpleAdaClient:
+    """Simple Ada client without Rich dependencies"""
+    def __init__(self):
+        self.conversation = EnhancedConversationManager()
+        self.status_display = EnhancedStatusDisplay(self.conversation)
+        self.voice_client = None
+        self.input_manager = None
+        
+    def setup_callbacks(self):
+        """Setup conversation callbacks"""
+        def on_voice_message(sender, message):
+            if sender == "user":
+                self.conversation.add_user_message(message, "voice")
+            elif sender == "agent":
+                self.conversation.add_agent_message(message)
+                
+        self.conversation.set_callbacks(
+            update_callback=lambda: None,  # No GUI updates needed
+        )
+        
+        # Setup voice client with conversation callback
+        self.voice_client = VoiceClient(
+            self.status_display, 
+            on_voice_message
+        )
+        
+    async def run(self, room_name: str = "ada-room"):
+        """Run the simple client"""
+        print("\n🎯 Ada Voice & Text Client")
+        print("=" * 60)
+        print(f"Room: {room_name}")
+        print("=" * 60)
+        
+        # Setup callbacks
+        self.setup_callbacks()
+        
+        # Start text input manager
+        self.input_manager = TextInputManager(self.conversation)
+        self.input_manager.start()
+        
+        # Add welcome message
+        self.conversation.add_system_message(f"Connecting to room: {room_name}")
+        
+        try:
+            # Connect voice client
+            await self.voice_client.connect(room_name)
+            startup_profiler.mark("room connected")
+            self.conversation.add_system_message("✅ Voice connection established")
+            self.conversation.add_system_message("💬 Text input ready - type and press Enter")
+            
+            # Main loop
+            while True:
+                await asyncio.sleep(0.1)
+                
+        except KeyboardInterrupt:
+            print("\n\n👋 Shutting down...")
+        finally:
+            if self.input_manager:
+                self.input_manager.stop()
+            if self.voice_client:
+                await self.voice_client.disconnect()
+            self.status_display.close()
@@ -0,0 +1,74 @@
+"""Callback-mode speaker output fed from a jitter buffer"""
+import logging
+
+import numpy as np
+
+from .jitter_buffer import JitterBuffer
+
+logger = logging.getLogger(__name__)
+
+
+class SpeakerPlayback:
+    """Plays received audio through a PyAudio callback stream.
+
+    Network frames are pushed into a ``JitterBuffer`` from the event loop and
+    PortAudio pulls fixed 10ms blocks from it on its own thread, so playback
+    never blocks the loop and a late frame costs silence rather than a
+    growing delay.
+    """
+
+    def __init__(self, audio, sample_rate: int, channels: int = 1, registry=None, **buffer_options):
+        self.audio = audio
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.samples_per_block = sample_rate // 100
+        self.buffer = JitterBuffer(sample_rate, channels, registry=registry, **buffer_options)
+        self.stream = None
+        self.output_underflows = 0
+        self._block = np.zeros(self.samples_per_block * channels, dtype=np.int16)
+
+    def start(self):
+        """Open the output stream in callback mode"""
+        import pyaudio
+
+        self._paContinue = pyaudio.paContinue
+        self._paOutputUnderflow = pyaudio.paOutputUnderflow
+        self.stream = self.audio.open(
+            format=pyaudio.paInt16,
+            channels=self.channels,
+            rate=self.sample_rate,
+            output=True,
+            frames_per_buffer=self.samples_per_block,
+            stream_callback=self._callback,
+        )
+        self.stream.start_stream()
+
+    def _callback(self, in_data, frame_count, time_info, status_flags):
+        """PortAudio thread: pull one block from the jitter buffer"""
+        if status_flags & self._paOutputUnderflow:
+            self.output_underflows += 1
+        needed = frame_count * self.channels
+        if needed != len(self._block):
+            self._block = np.zeros(needed, dtype=np.int16)
+        self.buffer.pull(self._block)
+        return (self._block.tobytes(), self._paContinue)
+
+    def matches(self, sample_rate: int, channels: int) -> bool:
+        return self.sample_rate == sample_rate and self.channels == channels
+
+    def push(self, samples: np.ndarray):
+        self.buffer.push(samples)
+
+    def stats(self) -> dict:
+        stats = self.buffer.stats()
+        stats["output_underflows"] = self.output_underflows
+        return stats
+
+    def stop(self):
+        if self.stream:
+            try:
+                self.stream.stop_stream()
+                self.stream.close()
+            except Exception as e:
+                logger.debug(f"Error closing speaker stream: {e}")
+            self.stream = None
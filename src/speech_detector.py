@@ -0,0 +1,149 @@
+"""Energy speech detector with an adaptive noise floor"""
+import collections
+import logging
+import os
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+START = "start"
+END = "end"
+
+
+class NoiseFloor:
+    """Minimum-statistics noise floor estimate.
+
+    Frame RMS is smoothed exponentially and its minimum is tracked over
+    ``window_s``, kept as the minima of a few sub-windows so old minima age
+    out. Speech has pauses and dips, so the minimum follows the background
+    noise rather than the talker; a louder room raises the floor within one
+    window, a quieter one lowers it immediately.
+    """
+
+    def __init__(self, frame_s: float, window_s: float = 3.0, subwindows: int = 6,
+                 smoothing: float = 0.9, initial: float = 100.0):
+        self.smoothing = smoothing
+        self.subwindow_frames = max(1, round(window_s / subwindows / frame_s))
+        self._minima = collections.deque(maxlen=subwindows)
+        self._current_min = float("inf")
+        self._frames = 0
+        self._smoothed: Optional[float] = None
+        self.value = initial
+
+    def update(self, rms: float) -> float:
+        if self._smoothed is None:
+            self._smoothed = rms
+        else:
+            self._smoothed = self.smoothing * self._smoothed + (1 - self.smoothing) * rms
+        self._current_min = min(self._current_min, self._smoothed)
+        self._frames += 1
+        if self._frames >= self.subwindow_frames:
+            self._minima.append(self._current_min)
+            self._current_min = float("inf")
+            self._frames = 0
+        self.value = min(min(self._minima, default=self._current_min), self._current_min)
+        return self.value
+
+
+class AdaptiveSpeechDetector:
+    """Decides where utterances start and end in a stream of frame levels.
+
+    Speech starts once frames exceed ``start_ratio`` times the noise floor
+    for ``min_speech_ms``, and continues while they exceed the lower
+    ``stop_ratio`` threshold (hysteresis), so a talker trailing off does not
+    chop the utterance. The hangover, the silence that ends an utterance,
+    adapts to the pauses seen inside the current speaker's utterances,
+    between ``min_hangover_ms`` and ``max_hangover_ms``. ``min_rms`` keeps
+    near-digital silence from triggering on tiny level changes.
+
+    One detector per participant: ``feed`` the RMS of every frame and act on
+    the returned ``START``/``END`` events.
+    """
+
+    def __init__(self, frame_ms: float = 20, *, start_ratio: float = 3.0, stop_ratio: float = 2.0,
+                 min_rms: float = 300, min_speech_ms: float = 200, min_hangover_ms: float = 400,
+                 max_hangover_ms: float = 1200, max_utterance_s: float = 30.0):
+        self.frame_s = frame_ms / 1000
+        self.start_ratio = start_ratio
+        self.stop_ratio = stop_ratio
+        self.min_rms = min_rms
+        self.min_speech_frames = max(1, round(min_speech_ms / frame_ms))
+        self.min_hangover_frames = max(1, round(min_hangover_ms / frame_ms))
+        self.max_hangover_frames = max(self.min_hangover_frames, round(max_hangover_ms / frame_ms))
+        self.max_utterance_frames = round(max_utterance_s * 1000 / frame_ms)
+        self.floor = NoiseFloor(self.frame_s)
+        self.in_speech = False
+        self.speech_frames = 0    # Evidence for a start; leaks away in silence
+        self.silence_frames = 0   # Consecutive quiet frames inside an utterance
+        self.utterance_frames = 0
+        self._pause_avg = 0.0     # Average pause inside utterances, in frames
+        self.utterances = 0
+
+    @property
+    def start_threshold(self) -> float:
+        return max(self.min_rms, self.floor.value * self.start_ratio)
+
+    @property
+    def stop_threshold(self) -> float:
+        return max(self.min_rms * self.stop_ratio / self.start_ratio, self.floor.value * self.stop_ratio)
+
+    @property
+    def hangover_frames(self) -> int:
+        frames = self.min_hangover_frames + 1.5 * self._pause_avg
+        return int(min(self.max_hangover_frames, max(self.min_hangover_frames, frames)))
+
+    def feed(self, rms: float) -> Optional[str]:
+        """Process one frame level; returns START, END or None"""
+        # Minimum statistics run on every frame: pauses between words keep the
+        # floor down during speech, while a room that gets louder raises it
+        # within one window even if that noise triggered an utterance
+        self.floor.update(rms)
+        if not self.in_speech:
+            if rms > self.start_threshold:
+                self.speech_frames += 1
+                if self.speech_frames >= self.min_speech_frames:
+                    self.in_speech = True
+                    self.silence_frames = 0
+                    self.utterance_frames = self.speech_frames
+                    self.utterances += 1
+                    return START
+            else:
+                self.speech_frames = max(0, self.speech_frames - 1)
+            return None
+
+        self.utterance_frames += 1
+        if rms > self.stop_threshold:
+            if self.silence_frames:
+                # A pause that speech resumed after: learn its length
+                self._pause_avg = 0.8 * self._pause_avg + 0.2 * self.silence_frames
+            self.silence_frames = 0
+        else:
+            self.silence_frames += 1
+
+        if self.silence_frames >= self.hangover_frames or self.utterance_frames >= self.max_utterance_frames:
+            self._end()
+            return END
+        return None
+
+    def _end(self):
+        self.in_speech = False
+        self.speech_frames = 0
+        self.silence_frames = 0
+        self.utterance_frames = 0
+
+    def reset(self):
+        """Forget the current utterance (e.g. while the agent is speaking); keeps the floor"""
+        self._end()
+
+
+def create_speech_detector_from_env(frame_ms: float) -> AdaptiveSpeechDetector:
+    """Detector tuned by SPEECH_START_RATIO, SPEECH_STOP_RATIO, SPEECH_MIN_RMS,
+    SPEECH_MIN_HANGOVER_MS and SPEECH_MAX_HANGOVER_MS"""
+    return AdaptiveSpeechDetector(
+        frame_ms,
+        start_ratio=float(os.getenv("SPEECH_START_RATIO", "3.0")),
+        stop_ratio=float(os.getenv("SPEECH_STOP_RATIO", "2.0")),
+        min_rms=float(os.getenv("SPEECH_MIN_RMS", "300")),
+        min_hangover_ms=float(os.getenv("SPEECH_MIN_HANGOVER_MS", "400")),
+        max_hangover_ms=float(os.getenv("SPEECH_MAX_HANGOVER_MS", "1200")),
+    )
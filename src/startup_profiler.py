@@ -0,0 +1,104 @@
+"""Import-time and startup phase breakdown for the CLI entry points (--profile-startup).
+
+Only the standard library is used here, so the entry points can enable the
+profiler before anything heavy is imported.
+"""
+import atexit
+import builtins
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+_active: Optional["StartupProfiler"] = None
+
+
+class StartupProfiler:
+    """Times every ``import`` statement and named startup phases.
+
+    ``builtins.__import__`` is wrapped so each import's own time (minus the
+    imports it triggers) is charged to its top-level package; ``report``
+    prints the heaviest packages next to the phase timeline.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.packages: Dict[str, float] = {}   # Top-level package -> seconds of import work
+        self.phases: List[Tuple[str, float]] = []  # (phase, seconds since start)
+        self._local = threading.local()  # Per-thread stack of child import time
+        self._original = None
+        self.reported = False
+
+    def install(self):
+        self._original = builtins.__import__
+        builtins.__import__ = self._import
+
+    def uninstall(self):
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0)
+        began = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - began
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            if level and globals:
+                # Relative import: charge it to the importing package
+                name = globals.get("__package__") or name
+            package = name.partition(".")[0] or "<relative>"
+            self.packages[package] = self.packages.get(package, 0.0) + elapsed - children
+
+    def mark(self, phase: str):
+        self.phases.append((phase, time.perf_counter() - self.started))
+
+    def format_report(self, top: int = 15) -> str:
+        lines = ["STARTUP PROFILE", f"  {'phase':<32}{'ms':>10}"]
+        for phase, at in self.phases:
+            lines.append(f"  {phase:<32}{at * 1000:>10.1f}")
+        total = sum(self.packages.values())
+        lines.append(f"  {'import (self time)':<32}{'ms':>10}")
+        heaviest = sorted(self.packages.items(), key=lambda item: item[1], reverse=True)
+        for package, seconds in heaviest[:top]:
+            lines.append(f"  {package:<32}{seconds * 1000:>10.1f}")
+        lines.append(f"  {'all imports':<32}{total * 1000:>10.1f}")
+        return "\n".join(lines)
+
+    def report(self, file=None):
+        """Print the breakdown once (also called at exit, e.g. after --help)"""
+        if self.reported:
+            return
+        self.reported = True
+        self.mark("report")
+        print("\n" + self.format_report(), file=file or sys.stderr)
+
+
+def enable_startup_profiling() -> StartupProfiler:
+    """Start profiling imports now; the report prints at exit if not before"""
+    global _active
+    if _active is None:
+        _active = StartupProfiler()
+        _active.install()
+        atexit.register(_active.report)
+    return _active
+
+
+def mark(phase: str):
+    """Record a startup phase; a no-op unless profiling is enabled"""
+    if _active is not None:
+        _active.mark(phase)
+
+
+def report():
+    """Print the startup report now if profiling is enabled"""
+    if _active is not None:
+        _active.report()
+        _active.uninstall()
@@ -1,61 +1,84 @@
+from .status_model import StatusPublisher, StatusSnapshot
 
 
-import time
+class StatusDisplay:
+    """Manages client status display.
 
+    Setters are called from the event loop and audio callbacks and only
+    write into a ``StatusSnapshot``. A publisher thread calls
+    ``_print_status`` with a consistent copy at ``rate_hz`` when something
+    changed; subclasses override it to render elsewhere.
+    """
+    def __init__(self, rate_hz: float = 10.0):
+        self.state = StatusSnapshot(
+            mic_level=0,
+            agent_speaking=False,
+            agent_listening=False,
+            connection_status="Connecting...",
+        )
+        self.publisher = StatusPublisher(self.state, rate_hz, name="client-status")
+        self.publisher.add_sink(self._print_status)
+        self.publisher.start()
 
-class StatusDisplay:
-    """Manages client status display"""
-    def __init__(self):
-        self.mic_level = 0
-        self.is_speaking = False
-        self.agent_speaking = False
-        self.agent_listening = False
-        self.connection_status = "Connecting..."
-        self.last_update = time.time()
-        
     def update_mic_level(self, rms):
         """Update microphone level"""
-        self.mic_level = rms
-        self.is_speaking = rms > 1000
-        self._print_status()
-        
+        self.state.set("mic_level", rms)
+
     def set_agent_speaking(self, speaking):
         """Set agent speaking status"""
-        self.agent_speaking = speaking
-        self._print_status()
-        
+        self.state.set("agent_speaking", speaking)
+
     def set_connection_status(self, status):
         """Set connection status"""
-        self.connection_status = status
-        self._print_status()
-        
-    def _print_status(self):
-        """Print status line"""
-        # Rate limit
-        if time.time() - self.last_update < 0.1:
-            return
-        self.last_update = time.time()
-        
+        self.state.set("connection_status", status)
+
+    @property
+    def mic_level(self):
+        return self.state.get("mic_level")
+
+    @property
+    def is_speaking(self):
+        return self.state.get("mic_level") > 1000
+
+    @property
+    def agent_speaking(self):
+        return self.state.get("agent_speaking")
+
+    @property
+    def agent_listening(self):
+        return self.state.get("agent_listening")
+
+    @property
+    def connection_status(self):
+        return self.state.get("connection_status")
+
+    def close(self):
+        """Stop the publisher thread"""
+        self.publisher.stop()
+
+    def _print_status(self, values):
+        """Print status line (publisher thread)"""
+        mic_level = values["mic_level"]
+
         # Build mic meter
-        meter_level = min(10, int(self.mic_level / 1000))
+        meter_level = min(10, int(mic_level / 1000))
         meter = "█" * meter_level + "░" * (10 - meter_level)
-        
+
         # Mic status
-        if self.mic_level < 300:
+        if mic_level < 300:
             mic_status = "🔇 Silent"
-        elif self.mic_level < 1000:
+        elif mic_level < 1000:
             mic_status = "🔉 Noise"
         else:
             mic_status = "🔊 SPEAKING"
-            
+
         # Agent status
-        if self.agent_speaking:
+        if values["agent_speaking"]:
             agent_status = "🤖 AGENT SPEAKING"
         else:
             agent_status = "👂 AGENT LISTENING"
-            
+
         # Status line
-        status_line = (f"\r{mic_status} [{meter}] {self.mic_level:4d} | "
-                      f"{agent_status} | {self.connection_status}")
+        status_line = (f"\r{mic_status} [{meter}] {mic_level:4d} | "
+                      f"{agent_status} | {values['connection_status']}")
         print(status_line + " " * 20, end="", flush=True)
-
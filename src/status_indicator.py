@@ -1,86 +1,118 @@
-import time
+from .status_model import StatusPublisher, StatusSnapshot
+
+
+PIPELINE_STATES = ("dictating", "recording", "transcribing", "thinking", "speaking")
 
 
 class StatusIndicator:
-    """Manages status display"""
-    def __init__(self):
-        self.current_status = ""
-        self.audio_level = 0
-        self.is_recording = False
-        self.is_transcribing = False
-        self.is_thinking = False
-        self.is_speaking = False
-        self.is_dictating = False
-        self.last_update = time.time()
-        
+    """Manages status display.
+
+    Setters only store the new value in a ``StatusSnapshot``; a single
+    publisher thread renders the status line (and, when given an
+    AgentMetrics instance, the pipeline state gauges) at ``rate_hz``, so
+    callers on the audio path never format or print anything.
+    """
+    def __init__(self, metrics=None, rate_hz: float = 10.0):
+        self.metrics = metrics
+        self.state = StatusSnapshot(audio_level=0, **{name: False for name in PIPELINE_STATES})
+        self.publisher = StatusPublisher(self.state, rate_hz, name="agent-status")
+        self.publisher.add_sink(self._print_status)
+        if metrics:
+            self.publisher.add_sink(self._export_metrics)
+        self.publisher.start()
+
     def update_audio_level(self, rms):
         """Update audio level indicator"""
-        self.audio_level = rms
-        self._print_status()
-        
+        self.state.set("audio_level", rms)
+
     def set_recording(self, recording):
         """Set recording status"""
-        self.is_recording = recording
-        self._print_status()
-        
+        self.state.set("recording", recording)
+
     def set_transcribing(self, transcribing):
         """Set transcribing status"""
-        self.is_transcribing = transcribing
-        self._print_status()
-        
+        self.state.set("transcribing", transcribing)
+
     def set_thinking(self, thinking):
         """Set LLM thinking status"""
-        self.is_thinking = thinking
-        self._print_status()
-        
+        self.state.set("thinking", thinking)
+
     def set_speaking(self, speaking):
         """Set TTS speaking status"""
-        self.is_speaking = speaking
-        self._print_status()
-        
+        self.state.set("speaking", speaking)
+
     def set_dictating(self, dictating):
         """Set dictation mode status"""
-        self.is_dictating = dictating
-        self._print_status()
-        
-    def _print_status(self):
-        """Print current status line"""
-        # Rate limit updates
-        if time.time() - self.last_update < 0.1:
-            return
-        self.last_update = time.time()
-        
+        self.state.set("dictating", dictating)
+
+    @property
+    def audio_level(self):
+        return self.state.get("audio_level")
+
+    @property
+    def is_recording(self):
+        return self.state.get("recording")
+
+    @property
+    def is_transcribing(self):
+        return self.state.get("transcribing")
+
+    @property
+    def is_thinking(self):
+        return self.state.get("thinking")
+
+    @property
+    def is_speaking(self):
+        return self.state.get("speaking")
+
+    @property
+    def is_dictating(self):
+        return self.state.get("dictating")
+
+    def close(self):
+        """Stop the publisher thread"""
+        self.publisher.stop()
+
+    def _export_metrics(self, values):
+        """Mirror the published state into the metrics gauges"""
+        self.metrics.audio_level.set(values["audio_level"])
+        for name in PIPELINE_STATES:
+            self.metrics.set_state(name, values[name])
+
+    def _print_status(self, values):
+        """Print current status line (publisher thread)"""
+        audio_level = values["audio_level"]
+
         # Build status line
-        meter_level = min(10, int(self.audio_level / 1000))
+        meter_level = min(10, int(audio_level / 1000))
         meter = "█" * meter_level + "░" * (10 - meter_level)
-        
+
         # Audio level indicator
-        if self.audio_level < 200:
+        if audio_level < 200:
             audio_status = "🔇"
-        elif self.audio_level < 1000:
+        elif audio_level < 1000:
             audio_status = "🔉"
         else:
             audio_status = "🔊"
-            
+
         # Pipeline status
         pipeline_parts = []
-        if self.is_dictating:
+        if values["dictating"]:
             pipeline_parts.append("📝 DICTATING")
-        if self.is_recording:
+        if values["recording"]:
             pipeline_parts.append("🔴 RECORDING")
-        if self.is_transcribing:
+        if values["transcribing"]:
             pipeline_parts.append("🎙️ TRANSCRIBING")
-        if self.is_thinking:
+        if values["thinking"]:
             pipeline_parts.append("🤔 THINKING")
-        if self.is_speaking:
+        if values["speaking"]:
             pipeline_parts.append("📢 SPEAKING")
-            
+
         if not pipeline_parts:
             pipeline_parts.append("⚪ LISTENING")
-            
+
         pipeline_status = " → ".join(pipeline_parts)
-        
+
         # Print status line
-        status_line = f"\r{audio_status} [{meter}] {self.audio_level:4d} | {pipeline_status}"
+        status_line = f"\r{audio_status} [{meter}] {audio_level:4d} | {pipeline_status}"
         print(status_line + " " * 20, end="", flush=True)
-
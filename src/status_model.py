@@ -0,0 +1,97 @@
+"""Lock-light status state with a single coalescing publisher"""
+import itertools
+import logging
+import threading
+from typing import Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StatusSnapshot:
+    """Fixed set of status fields written from any thread without locks.
+
+    Each field has one writer (the component that owns it). A write stores
+    the value and then publishes a new stamp; readers copy all fields and
+    retry if the stamp moved while they were copying, like a seqlock. Writes
+    that do not change the value are dropped so they never wake a sink.
+    """
+
+    def __init__(self, **fields):
+        self._values = dict(fields)
+        self._stamps = itertools.count(1)
+        self._stamp = 0
+
+    def set(self, field: str, value):
+        if field not in self._values:
+            raise KeyError(f"Unknown status field: {field}")
+        if self._values[field] == value:
+            return
+        self._values[field] = value
+        self._stamp = next(self._stamps)
+
+    def get(self, field: str):
+        return self._values[field]
+
+    @property
+    def stamp(self) -> int:
+        return self._stamp
+
+    def read(self) -> Tuple[int, Dict]:
+        """Consistent copy of all fields and the stamp it corresponds to"""
+        while True:
+            stamp = self._stamp
+            values = self._values.copy()
+            if self._stamp == stamp:
+                return stamp, values
+
+
+class StatusPublisher:
+    """Background thread that renders a snapshot to its sinks at ``rate_hz``.
+
+    Sinks are called with the copied field values, on this thread only and
+    only when the snapshot changed since the last publish, so any number of
+    writes between ticks costs a single render.
+    """
+
+    def __init__(self, snapshot: StatusSnapshot, rate_hz: float = 10.0, name: str = "status-publisher"):
+        self.snapshot = snapshot
+        self.interval = 1.0 / rate_hz
+        self.name = name
+        self.publishes = 0
+        self._sinks: List[Callable[[Dict], None]] = []
+        self._last_stamp = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add_sink(self, sink: Callable[[Dict], None]):
+        self._sinks.append(sink)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.publish()
+
+    def publish(self, force: bool = False):
+        """Render the current snapshot if it changed (or ``force``)"""
+        stamp, values = self.snapshot.read()
+        if stamp == self._last_stamp and not force:
+            return
+        self._last_stamp = stamp
+        self.publishes += 1
+        for sink in self._sinks:
+            try:
+                sink(values)
+            except Exception as e:
+                logger.error(f"Status sink failed: {e}")
+
+    def stop(self):
+        """Stop the thread after a final publish"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+        self.publish()
@@ -0,0 +1,195 @@
+"""Headless synthetic voice client for load testing the agent"""
+import asyncio
+import logging
+import random
+import time
+from typing import List, Optional
+
+import numpy as np
+from livekit import rtc
+
+from .voice_client import VoiceClient
+from .wav_utils import iter_frames
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+SAMPLES_PER_FRAME = 320  # 20ms at 16kHz, same as VoiceClient
+
+
+class NullStatus:
+    """Status sink that ignores all updates"""
+
+    def set_connection_status(self, status):
+        pass
+
+    def update_mic_level(self, rms):
+        pass
+
+    def set_agent_speaking(self, speaking):
+        pass
+
+
+class SyntheticVoiceClient(VoiceClient):
+    """VoiceClient that streams prerecorded utterances instead of a microphone.
+
+    After each utterance it keeps sending silence (so the agent can endpoint),
+    measures how long it takes for Ada's audio track to start responding,
+    waits for the reply to finish and then pauses before the next utterance.
+    Only agent tracks are subscribed so hundreds of clients can share rooms.
+    """
+
+    identity_prefix = "loadgen"
+
+    def __init__(
+        self,
+        utterances: List[np.ndarray],
+        *,
+        turns: Optional[int] = None,
+        pause_mean: float = 2.0,
+        pause_jitter: float = 1.0,
+        response_threshold: int = 300,
+        response_timeout: float = 15.0,
+        reply_end_silence: float = 0.8,
+        seed: Optional[int] = None,
+    ):
+        super().__init__(NullStatus())
+        self.utterances = utterances
+        self.turns = turns or len(utterances)
+        self.pause_mean = pause_mean
+        self.pause_jitter = pause_jitter
+        self.response_threshold = response_threshold
+        self.response_timeout = response_timeout
+        self.reply_end_silence = reply_end_silence
+        self._random = random.Random(seed)
+
+        self.latencies: List[float] = []
+        self.timeouts = 0
+        self.connected_at: Optional[float] = None
+        self._utterance_end: Optional[float] = None
+        self._response_started = asyncio.Event()
+        self._last_loud_frame = 0.0
+
+    def _create_audio(self):
+        return None
+
+    def _room_options(self):
+        # Subscribe explicitly to the agent only; other load clients are ignored
+        return rtc.RoomOptions(auto_subscribe=False)
+
+    def _register_room_handlers(self, room_name: str):
+        @self.room.on("track_published")
+        def on_track_published(publication, participant):
+            if (publication.kind == rtc.TrackKind.KIND_AUDIO and
+                    "agent" in participant.identity.lower()):
+                publication.set_subscribed(True)
+
+        @self.room.on("track_subscribed")
+        def on_track_subscribed(track, publication, participant):
+            if track.kind == rtc.TrackKind.KIND_AUDIO:
+                asyncio.create_task(self.receive_audio(track))
+
+    def start_playback(self):
+        """No speaker: received audio is only analysed"""
+        self.connected_at = time.monotonic()
+        # The agent may already be in the room
+        for participant in self.room.remote_participants.values():
+            if "agent" not in participant.identity.lower():
+                continue
+            for publication in participant.track_publications.values():
+                if publication.kind == rtc.TrackKind.KIND_AUDIO:
+                    publication.set_subscribed(True)
+
+    async def publish_microphone(self):
+        """Stream the utterances with pauses, measuring response latency"""
+        audio_source = rtc.AudioSource(SAMPLE_RATE, 1)
+        audio_track = rtc.LocalAudioTrack.create_audio_track("microphone", audio_source)
+        await self.room.local_participant.publish_track(audio_track)
+
+        frame = rtc.AudioFrame.create(SAMPLE_RATE, 1, SAMPLES_PER_FRAME)
+        frame_samples = np.frombuffer(frame.data, dtype=np.int16)
+        silence = np.zeros(SAMPLES_PER_FRAME, dtype=np.int16)
+        frame_seconds = SAMPLES_PER_FRAME / SAMPLE_RATE
+        next_deadline = time.monotonic()
+
+        async def send(samples):
+            nonlocal next_deadline
+            frame_samples[:] = samples
+            await audio_source.capture_frame(frame)
+            # Absolute schedule so pacing does not drift under load
+            next_deadline += frame_seconds
+            delay = next_deadline - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                next_deadline = time.monotonic()
+
+        async def send_silence_until(condition, timeout):
+            deadline = time.monotonic() + timeout
+            while not condition() and time.monotonic() < deadline:
+                if not self.running:
+                    return
+                await send(silence)
+
+        for turn in range(self.turns):
+            if not self.running:
+                break
+            utterance = self.utterances[turn % len(self.utterances)]
+            for samples in iter_frames(utterance, SAMPLES_PER_FRAME):
+                await send(samples)
+
+            self._response_started.clear()
+            self._utterance_end = time.monotonic()
+            await send_silence_until(self._response_started.is_set, self.response_timeout)
+            if not self._response_started.is_set():
+                self.timeouts += 1
+                self._utterance_end = None
+                logger.warning(f"{self.room.local_participant.identity}: no response within "
+                               f"{self.response_timeout:.0f}s")
+            else:
+                # Wait for the reply to finish playing
+                await send_silence_until(
+                    lambda: time.monotonic() - self._last_loud_frame > self.reply_end_silence,
+                    self.response_timeout,
+                )
+
+            # Think time before the next utterance
+            pause = max(0.2, self._random.gauss(self.pause_mean, self.pause_jitter))
+            await send_silence_until(lambda: False, pause)
+
+    async def receive_audio(self, track):
+        """Detect when Ada's audio starts responding"""
+        audio_stream = rtc.AudioStream(track)
+        async for event in audio_stream:
+            if not isinstance(event, rtc.AudioFrameEvent):
+                continue
+            samples = np.frombuffer(event.frame.data, dtype=np.int16)
+            if not len(samples):
+                continue
+            energy = np.dot(samples.astype(np.float32), samples.astype(np.float32)) / len(samples)
+            if energy < self.response_threshold ** 2:
+                continue
+            now = time.monotonic()
+            self._last_loud_frame = now
+            if self._utterance_end is not None and not self._response_started.is_set():
+                self.latencies.append(now - self._utterance_end)
+                self._utterance_end = None
+                self._response_started.set()
+
+    async def disconnect(self):
+        self.running = False
+        await self.room.disconnect()
+
+
+async def run_synthetic_client(client: SyntheticVoiceClient, room_name: str, start_delay: float = 0.0):
+    """Connect a synthetic client, run its turns and disconnect"""
+    if start_delay:
+        await asyncio.sleep(start_delay)
+    try:
+        await client.connect(room_name)
+    except Exception as e:
+        logger.error(f"Synthetic client failed in {room_name}: {e}")
+        client.running = False
+        raise
+    finally:
+        await client.disconnect()
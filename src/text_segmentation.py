@@ -0,0 +1,80 @@
+"""Sentence splitting for incremental speech synthesis"""
+import re
+import string
+from typing import List, Optional
+
+# Words whose trailing period does not end a sentence
+ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "e.g", "i.e",
+    "approx", "no", "fig", "inc", "ltd", "co",
+}
+
+# Terminal punctuation (plus closing quotes/brackets) followed by whitespace,
+# or a line break. Requiring the whitespace means "3.5" never splits, and a
+# period at the very end of streamed text waits for the next token.
+_BOUNDARY = re.compile(r"[.!?…]+[\"'”’)\]]*\s+|\n+")
+# Characters a boundary is made of; text before a trailing run of them is settled
+_BOUNDARY_CHARS = ".!?…\"'”’)]" + string.whitespace
+
+
+class SentenceBuffer:
+    """Accumulates streamed text and releases complete sentences.
+
+    Sentences shorter than ``min_chars`` are held and joined with the next
+    one, so a lone "Sure." does not cost a synthesis call of its own.
+    """
+
+    def __init__(self, min_chars: int = 10):
+        self.min_chars = min_chars
+        self._text = ""
+        self._scan = 0  # Boundaries before this offset were already considered
+
+    @property
+    def pending(self) -> str:
+        """Text not yet released as part of a sentence"""
+        return self._text
+
+    def push(self, text: str) -> List[str]:
+        """Add text; returns the sentences it completed"""
+        self._text += text
+        sentences = []
+        start = 0
+        for match in _BOUNDARY.finditer(self._text, self._scan):
+            if self._is_abbreviation(self._text[start:match.start()], match.group()):
+                continue
+            sentence = self._text[start:match.end()].strip()
+            if len(sentence) < self.min_chars:
+                continue
+            sentences.append(sentence)
+            start = match.end()
+        self._text = self._text[start:]
+        # Each push only scans new text, so a long reply costs linear time
+        self._scan = len(self._text.rstrip(_BOUNDARY_CHARS))
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        """Whatever is left once the text is complete"""
+        rest, self._text = self._text.strip(), ""
+        self._scan = 0
+        return rest or None
+
+    @staticmethod
+    def _is_abbreviation(prefix: str, boundary: str) -> bool:
+        if not boundary.startswith(".") or boundary.startswith(".."):
+            return False
+        words = prefix.split()
+        if not words:
+            return False
+        word = words[-1].lstrip("(\"'“‘")
+        # "Dr.", "e.g." and initials such as "J. Smith"
+        return word.lower() in ABBREVIATIONS or (len(word) == 1 and word.isupper())
+
+
+def split_sentences(text: str, min_chars: int = 10) -> List[str]:
+    """Split complete text into sentences for synthesis"""
+    buffer = SentenceBuffer(min_chars)
+    sentences = buffer.push(text)
+    rest = buffer.flush()
+    if rest:
+        sentences.append(rest)
+    return sentences
@@ -0,0 +1,116 @@
+"""Real-time transcript and reply streaming from the agent to room participants"""
+import asyncio
+import logging
+import os
+from typing import List, Optional
+
+from .data_protocol import FLAG_FINAL, HEADER, DataChannel, Message, MessageType
+
+logger = logging.getLogger(__name__)
+
+
+class MessageStream:
+    """One streamed message: an utterance's transcript or an agent reply.
+
+    ``update`` sends a partial (the transcript so far, or the next reply
+    token) and may be called from any thread; ``finish`` sends the final
+    text, which replaces everything sent before it on the client.
+    """
+
+    def __init__(self, streamer: "TranscriptStreamer", partial_type: MessageType,
+                 final_type: MessageType, msg_id: int):
+        self._streamer = streamer
+        self.partial_type = partial_type
+        self.final_type = final_type
+        self.msg_id = msg_id
+        self._seq = 0
+        self.finished = False
+
+    def _next_seq(self) -> int:
+        seq = self._seq
+        self._seq += 1
+        return seq
+
+    def update(self, text: str):
+        if text and not self.finished:
+            self._streamer.submit(Message(self.partial_type, text, self.msg_id, self._next_seq(), 0))
+
+    def finish(self, text: str):
+        if not self.finished:
+            self.finished = True
+            self._streamer.submit(
+                Message(self.final_type, text or "", self.msg_id, self._next_seq(), FLAG_FINAL))
+
+
+class TranscriptStreamer:
+    """Batches partial transcripts and reply tokens into data packets.
+
+    Messages are held until ``max_delay_ms`` has passed since the first one
+    in the batch or ``max_bytes`` are pending, then sent as one packet. A
+    final message flushes the batch immediately. Packets are sent one at a
+    time so clients always receive them in order.
+    """
+
+    def __init__(self, channel: DataChannel, *, max_delay_ms: float = 40, max_bytes: int = 1000):
+        self.channel = channel
+        self.max_delay = max_delay_ms / 1000
+        self.max_bytes = max_bytes
+        self.messages_sent = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: List[Message] = []
+        self._pending_bytes = 0
+        self._flush_handle = None
+        self._send_lock = asyncio.Lock()
+
+    def start(self):
+        """Bind to the running event loop"""
+        self._loop = asyncio.get_running_loop()
+
+    def transcript(self) -> MessageStream:
+        return MessageStream(self, MessageType.TRANSCRIPT_INTERIM, MessageType.TRANSCRIPT_FINAL,
+                             self.channel.next_id())
+
+    def reply(self) -> MessageStream:
+        return MessageStream(self, MessageType.AGENT_TOKEN, MessageType.AGENT_REPLY,
+                             self.channel.next_id())
+
+    def submit(self, message: Message):
+        """Queue a message for sending (thread-safe)"""
+        if self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._enqueue, message)
+
+    def _enqueue(self, message: Message):
+        self._pending.append(message)
+        self._pending_bytes += HEADER.size + len(message.text.encode("utf-8"))
+        if message.final or self._pending_bytes >= self.max_bytes:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(self.max_delay, self._flush)
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+        batch, self._pending, self._pending_bytes = self._pending, [], 0
+        asyncio.ensure_future(self._send(batch))
+
+    async def _send(self, batch: List[Message]):
+        # The lock queues sends in FIFO order so batches never overtake each other
+        async with self._send_lock:
+            try:
+                await self.channel.send_batch(batch)
+                self.messages_sent += len(batch)
+            except Exception as e:
+                logger.warning(f"Failed to stream {len(batch)} message(s): {e}")
+
+
+def create_streamer_from_env(channel: DataChannel) -> TranscriptStreamer:
+    """Streamer with budgets from TEXT_STREAM_DELAY_MS and TEXT_STREAM_MAX_BYTES"""
+    return TranscriptStreamer(
+        channel,
+        max_delay_ms=float(os.getenv("TEXT_STREAM_DELAY_MS", "40")),
+        max_bytes=int(os.getenv("TEXT_STREAM_MAX_BYTES", "1000")),
+    )
@@ -0,0 +1,84 @@
+"""Structured Whisper transcription results: segments, word timings and confidence"""
+import math
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass
+class TranscriptWord:
+    word: str           # As Whisper emits it, usually with a leading space
+    start: float        # Seconds from the start of the audio
+    end: float
+    probability: float
+
+
+@dataclass
+class TranscriptSegment:
+    text: str
+    start: float
+    end: float
+    avg_logprob: float
+    no_speech_prob: float
+    words: List[TranscriptWord] = field(default_factory=list)  # Empty unless word_timestamps
+
+    @property
+    def confidence(self) -> float:
+        """Mean token probability, from the segment's average log probability"""
+        return math.exp(min(0.0, self.avg_logprob))
+
+    @classmethod
+    def from_whisper(cls, segment) -> "TranscriptSegment":
+        """Copy a faster-whisper ``Segment``; its words are only set with word_timestamps"""
+        return cls(
+            text=segment.text.strip(),
+            start=float(segment.start),
+            end=float(segment.end),
+            avg_logprob=float(segment.avg_logprob),
+            no_speech_prob=float(segment.no_speech_prob),
+            words=[TranscriptWord(w.word, float(w.start), float(w.end), float(w.probability))
+                   for w in getattr(segment, "words", None) or ()],
+        )
+
+
+@dataclass
+class TranscriptionResult:
+    segments: List[TranscriptSegment]
+    language: Optional[str] = None
+    duration: float = 0.0  # Length of the decoded audio, in seconds
+
+    @property
+    def text(self) -> str:
+        return " ".join(s.text for s in self.segments if s.text)
+
+    @property
+    def words(self) -> List[TranscriptWord]:
+        return [w for s in self.segments for w in s.words]
+
+    @property
+    def confidence(self) -> float:
+        """Segment confidences weighted by segment length; 0.0 with no segments"""
+        if not self.segments:
+            return 0.0
+        weights = [max(s.end - s.start, 1e-3) for s in self.segments]
+        return sum(w * s.confidence for w, s in zip(weights, self.segments)) / sum(weights)
+
+    @property
+    def no_speech_prob(self) -> float:
+        """Highest no-speech probability of any segment; 1.0 with no segments"""
+        return max((s.no_speech_prob for s in self.segments), default=1.0)
+
+    @property
+    def speech_end(self) -> Optional[float]:
+        """When the last word (or segment, without word timings) ends"""
+        if not self.segments:
+            return None
+        last = self.segments[-1]
+        return last.words[-1].end if last.words else last.end
+
+    @classmethod
+    def from_whisper(cls, segments, info=None) -> "TranscriptionResult":
+        return cls(
+            segments=[TranscriptSegment.from_whisper(s) for s in segments],
+            language=getattr(info, "language", None),
+            duration=float(getattr(info, "duration", 0.0) or 0.0),
+        )
@@ -0,0 +1,208 @@
+"""TTS engines by name, built lazily, and a router that picks one per utterance"""
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from .text_segmentation import split_sentences
+
+logger = logging.getLogger(__name__)
+
+# Speaking rate used to estimate how much audio a piece of text becomes
+CHARS_PER_SECOND = 15.0
+
+
+@dataclass
+class TTSBackend:
+    name: str
+    factory: Callable[[int], object]  # sample_rate -> engine; imports its library only when called
+    streaming: bool = False           # Can yield audio before the whole text is synthesized
+    rtf: float = 0.1                  # Expected real-time factor until one is measured
+
+
+@dataclass
+class EngineProfile:
+    """What a built engine can do and how fast it has been"""
+    name: str
+    streaming: bool
+    native_sample_rate: int
+    rtf: float                        # Synthesis time / audio time, smoothed
+    first_chunk_s: Optional[float] = None
+    requests: int = 0
+
+    def record(self, synth_seconds: float, audio_seconds: float, first_chunk_seconds: Optional[float],
+               smoothing: float = 0.8):
+        self.requests += 1
+        if audio_seconds > 0:
+            self.rtf = smoothing * self.rtf + (1 - smoothing) * synth_seconds / audio_seconds
+        if first_chunk_seconds is not None:
+            self.first_chunk_s = first_chunk_seconds if self.first_chunk_s is None else \
+                smoothing * self.first_chunk_s + (1 - smoothing) * first_chunk_seconds
+
+    def predicted_latency(self, text: str) -> float:
+        """Expected time until audio for ``text`` can start playing"""
+        if self.streaming:
+            sentences = split_sentences(text)
+            text = sentences[0] if sentences else text
+        return self.rtf * len(text) / CHARS_PER_SECOND
+
+
+_BACKENDS: Dict[str, TTSBackend] = {}
+
+
+def register_backend(name: str, factory: Callable[[int], object], *, streaming: bool = False,
+                     rtf: float = 0.1):
+    """Make an engine available to TTS_BACKEND / TTS_FAST_BACKEND under ``name``"""
+    _BACKENDS[name] = TTSBackend(name, factory, streaming, rtf)
+
+
+def available_backends() -> List[str]:
+    return sorted(_BACKENDS)
+
+
+def _piper(sample_rate: int, prefix: str = "PIPER"):
+    from .local_piper_tts import LocalPiperTTS
+    return LocalPiperTTS(
+        model_path=os.getenv(f"{prefix}_MODEL_PATH"),
+        config_path=os.getenv(f"{prefix}_CONFIG_PATH"),
+        sample_rate=sample_rate,
+        num_channels=1,
+    )
+
+
+def _coqui(sample_rate: int):
+    from .local_coqui_tts import LocalCoquiTTS
+    return LocalCoquiTTS(
+        model_name=os.getenv("COQUI_MODEL", "tts_models/en/ljspeech/tacotron2-DDC"),
+        speaker_wav=os.getenv("COQUI_SPEAKER_WAV") or None,
+        device=os.getenv("COQUI_DEVICE", "cpu"),
+        sample_rate=sample_rate,
+    )
+
+
+register_backend("piper", _piper, rtf=0.1)
+register_backend("piper_fast", lambda rate: _piper(rate, "PIPER_FAST"), rtf=0.05)
+register_backend("coqui", _coqui, streaming=True, rtf=0.8)
+
+
+class TTSRouter:
+    """Synthesizes each utterance with the preferred engine, or a faster one when latency matters.
+
+    ``default`` is the preferred (higher quality) engine. With a ``fast``
+    engine configured, utterances of up to ``short_chars`` characters (acks,
+    short answers) always use it, and longer ones fall back to it when the
+    default engine's predicted time to first audio, from its measured
+    real-time factor, exceeds ``latency_budget`` seconds.
+
+    Engines are built on first use, so an unconfigured backend's library
+    is never imported. All engines produce audio at ``sample_rate``.
+    """
+
+    def __init__(self, default: str, fast: Optional[str] = None, *, sample_rate: int = 48000,
+                 short_chars: int = 60, latency_budget: float = 1.0):
+        for name in filter(None, (default, fast)):
+            if name not in _BACKENDS:
+                raise ValueError(f"Unknown TTS backend '{name}' (available: {', '.join(available_backends())})")
+        self.default = default
+        self.fast = fast if fast != default else None
+        self.sample_rate = sample_rate
+        self.short_chars = short_chars
+        self.latency_budget = latency_budget
+        self.engines: Dict[str, object] = {}
+        self.profiles: Dict[str, EngineProfile] = {}
+
+    def load(self):
+        """Build the configured engines now (blocking; run it in an executor)"""
+        for name in filter(None, (self.default, self.fast)):
+            self.engine(name)
+
+    def engine(self, name: str):
+        if name not in self.engines:
+            backend = _BACKENDS[name]
+            started = time.perf_counter()
+            engine = backend.factory(self.sample_rate)
+            self.engines[name] = engine
+            self.profiles[name] = EngineProfile(
+                name=name,
+                streaming=backend.streaming and hasattr(engine, "synthesize_stream"),
+                native_sample_rate=getattr(engine, "native_sample_rate", self.sample_rate),
+                rtf=backend.rtf,
+            )
+            logger.info(f"Loaded TTS backend {name} in {time.perf_counter() - started:.2f}s")
+        return self.engines[name]
+
+    def choose(self, text: str) -> str:
+        """Name of the engine to synthesize ``text`` with"""
+        if not self.fast:
+            return self.default
+        if len(text) <= self.short_chars:
+            return self.fast
+        self.engine(self.default)
+        self.engine(self.fast)
+        predicted = self.profiles[self.default].predicted_latency(text)
+        if predicted > self.latency_budget and self.profiles[self.fast].predicted_latency(text) < predicted:
+            return self.fast
+        return self.default
+
+    async def synthesize(self, text: str, *, engine: Optional[str] = None):
+        """Synthesize ``text`` as a single frame"""
+        name = engine or self.choose(text)
+        started = time.perf_counter()
+        result = await self.engine(name).synthesize(text)
+        elapsed = time.perf_counter() - started
+        self.profiles[name].record(elapsed, _frame_seconds(result.frame), elapsed)
+        return result
+
+    async def synthesize_stream(self, text: str, *, engine: Optional[str] = None) -> AsyncIterator:
+        """Synthesize ``text``, yielding audio chunk by chunk on streaming engines"""
+        name = engine or self.choose(text)
+        tts = self.engine(name)
+        profile = self.profiles[name]
+        if profile.streaming:
+            chunks = tts.synthesize_stream(text).__aiter__()
+        else:
+            chunks = _single(tts, text).__aiter__()
+
+        started = time.perf_counter()
+        busy = audio = 0.0
+        first = None
+        while True:
+            # Only time spent synthesizing counts, not the consumer's work between chunks
+            began = time.perf_counter()
+            try:
+                result = await chunks.__anext__()
+            except StopAsyncIteration:
+                break
+            busy += time.perf_counter() - began
+            if first is None:
+                first = time.perf_counter() - started
+            audio += _frame_seconds(result.frame)
+            yield result
+        profile.record(busy, audio, first)
+
+    def stats(self) -> Dict[str, dict]:
+        return {name: {"requests": p.requests, "rtf": round(p.rtf, 3), "streaming": p.streaming,
+                       "native_sample_rate": p.native_sample_rate,
+                       "first_chunk_s": None if p.first_chunk_s is None else round(p.first_chunk_s, 3)}
+                for name, p in self.profiles.items()}
+
+
+async def _single(tts, text: str):
+    yield await tts.synthesize(text)
+
+
+def _frame_seconds(frame) -> float:
+    return frame.samples_per_channel / frame.sample_rate
+
+
+def create_tts_router_from_env(sample_rate: int = 48000) -> TTSRouter:
+    """Router for TTS_BACKEND, with TTS_FAST_BACKEND (optional) for short or
+    latency-critical utterances, TTS_SHORT_CHARS and TTS_LATENCY_BUDGET_S"""
+    return TTSRouter(
+        os.getenv("TTS_BACKEND", "piper").strip().lower(),
+        (os.getenv("TTS_FAST_BACKEND") or "").strip().lower() or None,
+        sample_rate=sample_rate,
+        short_chars=int(os.getenv("TTS_SHORT_CHARS", "60")),
+        latency_budget=float(os.getenv("TTS_LATENCY_BUDGET_S", "1.0")),
+    )
@@ -0,0 +1,260 @@
+"""Per-room turn queue shared by every participant's voice and text input"""
+import asyncio
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# The microphone stays gated until the reply has played out, plus ECHO_TAIL_S
+# for the room echo to die down. When ``speak`` can't report playout, the
+# gate is held for max(MIN_HOLD_S, duration * HOLD_FACTOR) after queueing
+HOLD_FACTOR = 1.2
+MIN_HOLD_S = 1.0
+ECHO_TAIL_S = 0.5
+
+# Shorter transcripts are treated as noise; typed text only needs one character
+MIN_CHARS = {"voice": 3, "text": 1}
+
+
+@dataclass
+class Turn:
+    text: str
+    participant: str = ""
+    source: str = "voice"
+    trace: Optional[object] = None  # TurnTrace
+    segments: List = field(default_factory=list)  # Whisper segments, for dictation
+    utterance_start: Optional[float] = None
+    reply: Optional[str] = None  # Spoken as-is, skipping routing and the LLM (e.g. greeting)
+    trace_done: bool = False  # Trace finished, or handed to the playout queue which finishes it
+
+
+class TurnPipeline:
+    """Runs turns one at a time, in the order they were submitted.
+
+    Stages: normalize → command routing (or dictation) → LLM → TTS →
+    playout. Audio and data-channel input both ``submit`` here, so replies
+    never overlap in the playout queue. There is one queue per room, shared
+    by all participants. At most ``max_pending`` turns wait; further ones
+    are rejected. ``cancel`` aborts the running turn and drops the waiting
+    ones, or only one participant's.
+    """
+
+    def __init__(self, agent, status, tracer, metrics,
+                 speak: Callable[..., Awaitable[Tuple[float, Optional[Awaitable]]]], streamer=None, *, max_pending: int = 4, hold_factor: float = HOLD_FACTOR,
+                 min_hold: float = MIN_HOLD_S, echo_tail: float = ECHO_TAIL_S,
+                 ready: Optional[Awaitable] = None):
+        self.agent = agent
+        self.status = status
+        self.tracer = tracer
+        self.metrics = metrics
+        self.speak = speak
+        self.streamer = streamer
+        self.hold_factor = hold_factor
+        self.min_hold = min_hold
+        self.echo_tail = echo_tail
+        # Turns queue up but only run once this completes (e.g. models loaded)
+        self.ready = ready
+        self.turns_rejected = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._worker: Optional[asyncio.Task] = None
+        self._current: Optional[asyncio.Task] = None
+        self._outstanding: Dict[str, int] = {}  # participant -> turns queued or running
+        self._idle: Dict[str, asyncio.Event] = {}  # Set once a participant has none left
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _set_depth(self):
+        if self.metrics:
+            self.metrics.queue_depth.set(self._queue.qsize(), queue="turns")
+
+    def submit(self, turn: Turn) -> bool:
+        """Normalize and queue a turn; False if it was empty or the queue is full"""
+        turn.text = " ".join(turn.text.split())
+        if turn.reply is None and len(turn.text) < MIN_CHARS.get(turn.source, 1):
+            self.tracer.finish(turn.trace, "empty_transcript")
+            return False
+        if turn.trace:
+            turn.trace.mark("queued")
+        try:
+            self._queue.put_nowait(turn)
+        except asyncio.QueueFull:
+            self.turns_rejected += 1
+            logger.warning(f"Turn queue full, dropping {turn.source} turn from {turn.participant}: '{turn.text}'")
+            self.tracer.finish(turn.trace, "rejected")
+            return False
+        self._outstanding[turn.participant] = self._outstanding.get(turn.participant, 0) + 1
+        self._set_depth()
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._work())
+        return True
+
+    async def join(self, participant: Optional[str] = None):
+        """Wait until every submitted turn has finished, or every one from ``participant``"""
+        if participant is None:
+            await self._queue.join()
+        elif self._outstanding.get(participant):
+            await self._idle.setdefault(participant, asyncio.Event()).wait()
+
+    def _finished(self, turn: Turn):
+        self._queue.task_done()
+        left = self._outstanding.get(turn.participant, 1) - 1
+        if left:
+            self._outstanding[turn.participant] = left
+            return
+        self._outstanding.pop(turn.participant, None)
+        idle = self._idle.pop(turn.participant, None)
+        if idle:
+            idle.set()
+
+    def cancel(self, participant: Optional[str] = None) -> int:
+        """Abort the running turn and drop the waiting ones; returns how many were dropped.
+
+        With ``participant``, only that participant's waiting turns are
+        dropped and the others keep their place in the queue. The running
+        turn is aborted either way: it is the reply being talked over.
+        """
+        dropped = 0
+        kept = []
+        while not self._queue.empty():
+            turn = self._queue.get_nowait()
+            if participant is not None and turn.participant != participant:
+                kept.append(turn)
+                continue
+            self.tracer.finish(turn.trace, "cancelled")
+            self._finished(turn)
+            dropped += 1
+        for turn in kept:
+            # put_nowait counts the turn as unfinished a second time
+            self._queue.put_nowait(turn)
+            self._queue.task_done()
+        self._set_depth()
+        if self._current and not self._current.done():
+            self._current.cancel()
+        return dropped
+
+    async def close(self):
+        self.cancel()
+        if self._worker:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+
+    async def _work(self):
+        if self.ready is not None:
+            await asyncio.shield(self.ready)
+        while True:
+            turn = await self._queue.get()
+            self._set_depth()
+            self._current = asyncio.create_task(self._run(turn))
+            try:
+                # wait() rather than await: cancelling the turn must not stop the worker
+                await asyncio.wait([self._current])
+            finally:
+                if not self._current.done():
+                    self._current.cancel()
+                self._current = None
+                self._finished(turn)
+
+    async def _run(self, turn: Turn):
+        if turn.trace:
+            turn.trace.mark("dequeued")
+        try:
+            response = turn.reply if turn.reply is not None else await self._route(turn)
+            if response:
+                await self._play(response, turn)
+        except asyncio.CancelledError:
+            logger.info(f"Cancelled {turn.source} turn from {turn.participant}")
+            if not turn.trace_done:
+                self.tracer.finish(turn.trace, "cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"Error processing {turn.source} turn: {e}")
+            if not turn.trace_done:
+                self.tracer.finish(turn.trace, "error")
+
+    async def _route(self, turn: Turn) -> Optional[str]:
+        """Command, dictation or LLM. Returns the reply to speak, or None
+        once the turn's trace has been finished (dictated text, or no reply)."""
+        match, response = await self.agent.commands.dispatch(turn.text, self.agent.mode)
+        if match:
+            self._publish_reply(response)
+        elif self.agent.is_dictating:
+            await self.agent.add_to_dictation(turn.text, turn.segments, turn.utterance_start)
+            self.tracer.finish(turn.trace, "dictation")
+            return None  # Don't generate a response, just keep listening
+        else:
+            logger.info(f"Sending to LLM: '{turn.text}'")
+            response = await self._respond(turn.text, turn.trace, turn.participant)
+            logger.info(f"LLM response received: '{response}'")
+        if not response:
+            self.tracer.finish(turn.trace, "no_response")
+            return None
+        return response
+
+    async def _respond(self, text, trace, participant=""):
+        """Generate an LLM reply, streaming its tokens to participants.
+
+        The streamed reply is always finished, with the text streamed so
+        far if the turn is cancelled or fails, so clients drop the partial.
+        """
+        if not self.streamer:
+            return await self.agent.generate_response(text, turn=trace, participant=participant or None)
+        reply = self.streamer.reply()
+        streamed = []
+
+        def on_token(token):
+            streamed.append(token)
+            reply.update(token)
+
+        response = None
+        try:
+            response = await self.agent.generate_response(
+                text, turn=trace, on_token=on_token, participant=participant or None)
+        finally:
+            reply.finish(response if response is not None else "".join(streamed).strip())
+        return response
+
+    def _publish_reply(self, response):
+        """Publish a reply that did not come from the LLM (e.g. dictation)"""
+        if self.streamer and response:
+            self.streamer.reply().finish(response)
+
+    async def _play(self, response: str, turn: Turn):
+        """Synthesize and queue the reply, keeping the microphone gated until it has played"""
+        self.agent.is_agent_speaking = True
+        self.status.set_speaking(True)
+        logger.info(f"Agent started speaking ({turn.source} turn) - blocking audio processing")
+        try:
+            try:
+                audio_duration, played = await self.speak(response, turn.trace)
+                turn.trace_done = True
+                if played is not None:
+                    # Streaming engines are already part-way through playout
+                    logger.info(f"Audio duration: {audio_duration:.2f}s, waiting for playout + "
+                                f"{self.echo_tail:.2f}s echo clearance")
+                    await played
+                else:
+                    hold = max(self.min_hold, audio_duration * self.hold_factor)
+                    logger.info(f"Audio duration: {audio_duration:.2f}s, waiting {hold + self.echo_tail:.2f}s "
+                                f"for playback + echo clearance")
+                    await asyncio.sleep(hold)
+            except Exception as e:
+                logger.error(f"TTS error: {e}")
+                if not turn.trace_done:
+                    self.tracer.finish(turn.trace, "tts_error")
+                    turn.trace_done = True
+                await asyncio.sleep(self.min_hold)
+            await asyncio.sleep(self.echo_tail)
+        finally:
+            self.agent.is_agent_speaking = False
+            self.status.set_speaking(False)
+            logger.info("Agent finished speaking - resuming audio processing")
+
+
+def turn_queue_size_from_env() -> int:
+    """Pending-turn limit from TURN_QUEUE_SIZE"""
+    return max(1, int(os.getenv("TURN_QUEUE_SIZE", "4")))
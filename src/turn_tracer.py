@@ -0,0 +1,231 @@
+"""Per-turn latency tracing for the voice pipeline"""
+import itertools
+import json
+import logging
+import math
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# Pipeline events, in the order they normally occur within a turn
+EVENTS = (
+    "speech_start",
+    "endpoint",
+    "stt_start",
+    "stt_end",
+    "llm_start",
+    "llm_first_token",
+    "llm_last_token",
+    "tts_start",
+    "tts_first_chunk",
+    "tts_last_chunk",
+    "first_frame_published",
+    "last_frame_played",
+)
+
+# Stages derived from pairs of events: (name, start event, end event)
+STAGES = (
+    ("utterance", "speech_start", "endpoint"),
+    ("stt", "stt_start", "stt_end"),
+    ("queue", "queued", "dequeued"),
+    ("llm_first_token", "llm_start", "llm_first_token"),
+    ("llm", "llm_start", "llm_last_token"),
+    ("tts_first_chunk", "tts_start", "tts_first_chunk"),
+    ("tts", "tts_start", "tts_last_chunk"),
+    ("playout", "first_frame_published", "last_frame_played"),
+    ("response", "endpoint", "first_frame_published"),
+)
+
+
+def percentile(values, pct: float) -> Optional[float]:
+    """Nearest-rank percentile of a sequence, or None if it is empty"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class TurnTrace:
+    """Monotonic timestamps and attributes for a single conversational turn"""
+
+    __slots__ = ("turn_id", "participant", "source", "events", "attributes", "outcome")
+
+    def __init__(self, turn_id: int, participant: str = "", source: str = "voice"):
+        self.turn_id = turn_id
+        self.participant = participant
+        self.source = source
+        self.events: Dict[str, float] = {}
+        self.attributes: Dict[str, object] = {}
+        self.outcome = "ok"
+
+    def mark(self, event: str, timestamp: Optional[float] = None):
+        """Record an event; only the first occurrence of each event is kept"""
+        if event not in self.events:
+            self.events[event] = time.monotonic() if timestamp is None else timestamp
+
+    def set(self, key: str, value):
+        """Attach an attribute (token counts, audio duration, ...)"""
+        self.attributes[key] = value
+
+    def stages(self) -> Dict[str, float]:
+        """Stage durations in seconds for every stage with both events present"""
+        durations = {}
+        for name, start, end in STAGES:
+            if start in self.events and end in self.events:
+                durations[name] = self.events[end] - self.events[start]
+        return durations
+
+    def to_dict(self) -> dict:
+        return {
+            "turn_id": self.turn_id,
+            "participant": self.participant,
+            "source": self.source,
+            "outcome": self.outcome,
+            "events": dict(self.events),
+            "stages": self.stages(),
+            "attributes": dict(self.attributes),
+        }
+
+
+class JsonlSpanExporter:
+    """Appends one JSON object per finished turn to a file"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", buffering=1)
+
+    def export(self, trace: TurnTrace):
+        self._file.write(json.dumps(trace.to_dict()) + "\n")
+
+    def close(self):
+        self._file.close()
+
+
+class OpenTelemetrySpanExporter:
+    """Emits each turn as an OpenTelemetry span with one child span per stage.
+
+    Uses whatever tracer provider is configured globally (e.g. an OTLP exporter
+    set up through the standard OTEL_* environment variables).
+    """
+
+    def __init__(self, service_name: str = "ada-agent"):
+        try:
+            from opentelemetry import trace as otel_trace
+        except ImportError:
+            raise RuntimeError("OpenTelemetry not installed. Run: pip install opentelemetry-sdk")
+        self._otel_trace = otel_trace
+        self._tracer = otel_trace.get_tracer(service_name)
+        # Offset to convert monotonic timestamps into wall-clock nanoseconds
+        self._epoch_offset = time.time() - time.monotonic()
+
+    def _ns(self, monotonic_ts: float) -> int:
+        return int((monotonic_ts + self._epoch_offset) * 1e9)
+
+    def export(self, trace: TurnTrace):
+        if not trace.events:
+            return
+        start = min(trace.events.values())
+        end = max(trace.events.values())
+        attributes = {
+            "ada.turn_id": trace.turn_id,
+            "ada.participant": trace.participant,
+            "ada.source": trace.source,
+            "ada.outcome": trace.outcome,
+        }
+        for key, value in trace.attributes.items():
+            if isinstance(value, (str, bool, int, float)):
+                attributes[f"ada.{key}"] = value
+
+        root = self._tracer.start_span("turn", start_time=self._ns(start), attributes=attributes)
+        ctx = self._otel_trace.set_span_in_context(root)
+        for name, start_event, end_event in STAGES:
+            if start_event in trace.events and end_event in trace.events:
+                span = self._tracer.start_span(
+                    name, context=ctx, start_time=self._ns(trace.events[start_event])
+                )
+                span.end(end_time=self._ns(trace.events[end_event]))
+        root.end(end_time=self._ns(end))
+
+    def close(self):
+        pass
+
+
+class TurnTracer:
+    """Creates turn traces, exports finished ones and keeps per-stage statistics"""
+
+    def __init__(self, exporters: Optional[List] = None, history: int = 1000):
+        self.exporters = list(exporters or [])
+        self._ids = itertools.count(1)
+        self._durations: Dict[str, deque] = {name: deque(maxlen=history) for name, _, _ in STAGES}
+        self.turns_finished = 0
+
+    def add_exporter(self, exporter):
+        self.exporters.append(exporter)
+
+    def start_turn(self, participant: str = "", source: str = "voice") -> TurnTrace:
+        """Begin a new turn"""
+        return TurnTrace(next(self._ids), participant, source)
+
+    def finish(self, trace: Optional[TurnTrace], outcome: Optional[str] = None):
+        """Close a turn, record its stage durations and hand it to the exporters"""
+        if trace is None:
+            return
+        if outcome:
+            trace.outcome = outcome
+        for name, duration in trace.stages().items():
+            self._durations[name].append(duration)
+        self.turns_finished += 1
+        for exporter in self.exporters:
+            try:
+                exporter.export(trace)
+            except Exception as e:
+                logger.error(f"Trace export failed ({type(exporter).__name__}): {e}")
+
+    def summary(self) -> Dict[str, dict]:
+        """p50/p95 per stage, in milliseconds"""
+        result = {}
+        for name, values in self._durations.items():
+            if values:
+                result[name] = {
+                    "count": len(values),
+                    "p50_ms": percentile(values, 50) * 1000,
+                    "p95_ms": percentile(values, 95) * 1000,
+                }
+        return result
+
+    def format_summary(self) -> str:
+        """Human readable per-stage latency table"""
+        summary = self.summary()
+        if not summary:
+            return "No completed turns traced"
+        lines = [f"{'stage':<18}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}"]
+        for name, stats in summary.items():
+            lines.append(f"{name:<18}{stats['count']:>7}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}")
+        return "\n".join(lines)
+
+    def close(self):
+        for exporter in self.exporters:
+            exporter.close()
+
+
+def create_tracer_from_env() -> TurnTracer:
+    """Build a tracer with the exporters enabled in the environment"""
+    tracer = TurnTracer()
+    trace_file = os.getenv("TRACE_FILE")
+    if trace_file:
+        tracer.add_exporter(JsonlSpanExporter(trace_file))
+        logger.info(f"Writing turn traces to {trace_file}")
+    if os.getenv("TRACE_OTEL", "").lower() in ("1", "true", "yes"):
+        try:
+            tracer.add_exporter(OpenTelemetrySpanExporter())
+            logger.info("Exporting turn traces to OpenTelemetry")
+        except RuntimeError as e:
+            logger.warning(str(e))
+    return tracer
@@ -0,0 +1,165 @@
+"""Cheap accept/reject check for recorded utterances before they reach Whisper"""
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Segment statistics that mark a Whisper decode as junk / as confident speech
+NO_SPEECH_PROB = 0.6
+JUNK_LOGPROB = -1.0
+CONFIDENT_LOGPROB = -0.5
+
+
+@dataclass
+class GateDecision:
+    accepted: bool
+    reason: str             # "ok", "duration", "speech_ratio" or "flatness"
+    duration: float         # Seconds from the first to the last speech frame
+    speech_ratio: float     # Speech frames / frames in that span
+    flatness: float         # Median spectral flatness of the loudest frames
+
+
+class UtteranceGate:
+    """Rejects coughs, door slams and keyboard noise before an STT decode.
+
+    Three features, all computed from 20 ms frames with numpy in well under
+    a millisecond:
+
+    * duration of the active span (first to last frame above the speech
+      threshold), so the pre-roll does not count
+    * speech ratio: how much of that span is above the threshold; clicks
+      and knocks are spikes with gaps in between
+    * spectral flatness of the loudest few frames; voiced speech has
+      harmonics (low flatness), bursts of noise are flat
+
+    ``feedback`` nudges the ratio and flatness thresholds, within bounds,
+    using Whisper's ``no_speech_prob`` and ``avg_logprob``: clips that were
+    accepted but decoded as junk tighten them, confident speech near a
+    threshold relaxes them.
+    """
+
+    def __init__(self, *, min_duration: float = 0.25, min_speech_ratio: float = 0.35,
+                 max_flatness: float = 0.4, loudest_frames: int = 6, adapt_rate: float = 0.1,
+                 ratio_bounds=(0.15, 0.6), flatness_bounds=(0.25, 0.6),
+                 dump_dir: Optional[str] = None, metrics=None):
+        self.min_duration = min_duration
+        self.min_speech_ratio = min_speech_ratio
+        self.max_flatness = max_flatness
+        self.loudest_frames = loudest_frames
+        self.adapt_rate = adapt_rate
+        self.ratio_bounds = ratio_bounds
+        self.flatness_bounds = flatness_bounds
+        self.dump_dir = Path(dump_dir) if dump_dir else None
+        self.metrics = metrics
+        self.accepted = 0
+        self.rejected = 0
+        self._windows = {}  # FFT size -> Hann window
+
+    def _window(self, size: int) -> np.ndarray:
+        window = self._windows.get(size)
+        if window is None:
+            window = self._windows[size] = np.hanning(size).astype(np.float32)
+        return window
+
+    def check(self, audio: np.ndarray, sample_rate: int, speech_threshold: float) -> GateDecision:
+        """Decide whether ``audio`` (int16) is worth transcribing"""
+        frame = max(1, int(sample_rate * 0.02))
+        count = len(audio) // frame
+        if count == 0:
+            return self._decide(audio, sample_rate, GateDecision(False, "duration", 0.0, 0.0, 0.0))
+        frames = audio[:count * frame].reshape(count, frame).astype(np.float32)
+        levels = np.sqrt(np.mean(frames * frames, axis=1))
+
+        active = np.flatnonzero(levels > speech_threshold)
+        if len(active) == 0:
+            return self._decide(audio, sample_rate, GateDecision(False, "duration", 0.0, 0.0, 0.0))
+        span = active[-1] - active[0] + 1
+        duration = float(span * frame / sample_rate)
+        speech_ratio = len(active) / span
+
+        # Flatness on a power-of-two slice of the loudest frames
+        size = 1 << (frame.bit_length() - 1)
+        loudest = frames[np.argsort(levels)[-self.loudest_frames:], :size] * self._window(size)
+        power = np.abs(np.fft.rfft(loudest, axis=1))[:, 1:] ** 2 + 1e-10
+        flatness = float(np.median(np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)))
+
+        if duration < self.min_duration:
+            reason = "duration"
+        elif speech_ratio < self.min_speech_ratio:
+            reason = "speech_ratio"
+        elif flatness > self.max_flatness:
+            reason = "flatness"
+        else:
+            reason = "ok"
+        return self._decide(audio, sample_rate,
+                            GateDecision(reason == "ok", reason, duration, float(speech_ratio), flatness))
+
+    def _decide(self, audio, sample_rate, decision: GateDecision) -> GateDecision:
+        if decision.accepted:
+            self.accepted += 1
+            return decision
+        self.rejected += 1
+        logger.info(f"Gate rejected utterance ({decision.reason}): {decision.duration:.2f}s, "
+                    f"speech {decision.speech_ratio:.2f}, flatness {decision.flatness:.2f}")
+        if self.metrics:
+            self.metrics.gate_rejections.inc(reason=decision.reason)
+        if self.dump_dir:
+            self._dump(audio, sample_rate, decision)
+        return decision
+
+    def _dump(self, audio, sample_rate, decision: GateDecision):
+        from .wav_utils import save_wav
+        try:
+            self.dump_dir.mkdir(parents=True, exist_ok=True)
+            name = f"{time.strftime('%Y%m%d_%H%M%S')}_{self.rejected}_{decision.reason}.wav"
+            save_wav(self.dump_dir / name, audio, sample_rate)
+        except OSError as e:
+            logger.warning(f"Could not save rejected utterance: {e}")
+
+    def feedback(self, decision: GateDecision, segments: List):
+        """Adapt thresholds from the Whisper segments of an accepted clip"""
+        if not decision.accepted:
+            return
+        if segments:
+            no_speech = float(np.mean([s.no_speech_prob for s in segments]))
+            logprob = float(np.mean([s.avg_logprob for s in segments]))
+        else:
+            no_speech, logprob = 1.0, -float("inf")
+
+        rate = self.adapt_rate
+        if no_speech > NO_SPEECH_PROB and logprob < JUNK_LOGPROB:
+            # Junk that got through: move thresholds towards rejecting this clip
+            if decision.speech_ratio > self.min_speech_ratio:
+                self.min_speech_ratio += rate * (decision.speech_ratio - self.min_speech_ratio)
+            if decision.flatness < self.max_flatness:
+                self.max_flatness -= rate * (self.max_flatness - decision.flatness)
+        elif no_speech < 1 - NO_SPEECH_PROB and logprob > CONFIDENT_LOGPROB:
+            # Clear speech close to a threshold: keep a margin so similar clips pass
+            if decision.speech_ratio < self.min_speech_ratio * 1.25:
+                self.min_speech_ratio -= rate * (self.min_speech_ratio - decision.speech_ratio * 0.8)
+            if decision.flatness > self.max_flatness * 0.8:
+                self.max_flatness += rate * (decision.flatness * 1.25 - self.max_flatness)
+        else:
+            return
+        self.min_speech_ratio = float(np.clip(self.min_speech_ratio, *self.ratio_bounds))
+        self.max_flatness = float(np.clip(self.max_flatness, *self.flatness_bounds))
+        logger.debug(f"Gate thresholds: speech ratio >= {self.min_speech_ratio:.2f}, "
+                     f"flatness <= {self.max_flatness:.2f}")
+
+
+def create_gate_from_env(metrics=None) -> Optional[UtteranceGate]:
+    """Gate configured by UTTERANCE_GATE (set to 0 to disable), UTTERANCE_GATE_MIN_S
+    and UTTERANCE_GATE_DUMP_DIR"""
+    if os.getenv("UTTERANCE_GATE", "1").lower() in ("0", "false", "no", "off"):
+        return None
+    return UtteranceGate(
+        min_duration=float(os.getenv("UTTERANCE_GATE_MIN_S", "0.25")),
+        dump_dir=os.getenv("UTTERANCE_GATE_DUMP_DIR") or None,
+        metrics=metrics,
+    )
@@ -1,15 +1,22 @@
 import os
 import logging
 import asyncio
-import threading
-import queue
 import time
 import uuid
 import numpy as np
-import pyaudio
 from livekit import api, rtc
 from dotenv import load_dotenv
 
+from .data_protocol import DataChannel, MessageType, ProtocolError, decode
+from .metrics import MetricsRegistry
+from .microphone_capture import MicrophoneCapture
+from .speaker_playback import SpeakerPlayback
+
+try:
+    import pyaudio
+except ImportError:  # Headless hosts (e.g. load generators) have no PortAudio
+    pyaudio = None
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
@@ -17,48 +24,92 @@ logger = logging.getLogger(__name__)
 class VoiceClient:
     """Voice client with status indicators"""
     
-    def __init__(self, status, conversation_callback=None):
+    identity_prefix = "user"
+    
+    def __init__(self, status, conversation_callback=None, partial_callback=None):
         self.status = status
         self.conversation_callback = conversation_callback
+        # Called with (role, text so far) while a transcript or reply streams
+        # in, and with (role, "") once it is final
+        self.partial_callback = partial_callback
+        self._reply_tokens = {}  # msg_id -> tokens received so far
         self.room = rtc.Room()
-        self.audio = pyaudio.PyAudio()
+        self.audio = self._create_audio()
         self.mic_stream = None
-        self.speaker_stream = None
-        self.audio_queue = queue.Queue()
-        self.playback_thread = None
+        self.mic_capture = None
+        self.speaker = None
+        self.metrics = MetricsRegistry()
+        self.channel = DataChannel(self.room)
+        self.pending_acks = {}  # msg_id -> send time
         self.running = True
         
+    def _create_audio(self):
+        """Create the PyAudio instance used for the microphone and speaker"""
+        if pyaudio is None:
+            raise RuntimeError("PyAudio not installed. Run: pip install pyaudio")
+        return pyaudio.PyAudio()
+        
     async def send_text_message(self, message: str):
         """Send text message to agent via data channel"""
         try:
             if (self.room.connection_state ==
                 rtc.ConnectionState.CONN_CONNECTED):
-                data = message.encode('utf-8')
-                await self.room.local_participant.publish_data(data)
+                msg_id = self.channel.next_id()
+                self.pending_acks[msg_id] = time.monotonic()
+                await self.channel.send(MessageType.USER_TEXT, message, msg_id=msg_id)
                 logger.info(f"Sent text message to agent: {message}")
             else:
                 logger.warning("Cannot send message - not connected to room")
         except Exception as e:
             logger.error(f"Error sending text message: {e}")
         
-    async def connect(self, room_name: str = "test-room"):
-        """Connect to LiveKit room"""
-        url = os.getenv("LIVEKIT_URL", "ws://localhost:7880")
+    def _create_token(self, room_name: str) -> str:
+        """Create an access token with a unique participant identity"""
         api_key = os.getenv("LIVEKIT_API_KEY", "devkey")
         api_secret = os.getenv("LIVEKIT_API_SECRET", "secret")
         
-        import uuid
         unique_id = str(uuid.uuid4())[:8]
         
         token = api.AccessToken(api_key, api_secret)
-        token.with_identity(f"user-{unique_id}").with_name("User")
+        token.with_identity(f"{self.identity_prefix}-{unique_id}").with_name("User")
         token.with_grants(api.VideoGrants(
             room_join=True,
             room=room_name,
             can_publish=True,
             can_subscribe=True
         ))
+        return token.to_jwt()
+        
+    def _room_options(self):
+        """Options passed to Room.connect"""
+        return rtc.RoomOptions()
         
+    async def connect(self, room_name: str = "test-room"):
+        """Connect to LiveKit room"""
+        url = os.getenv("LIVEKIT_URL", "ws://localhost:7880")
+        token = self._create_token(room_name)
+        
+        self._register_room_handlers(room_name)
+        
+        print(f"📡 Connecting to {url}...")
+        self.status.set_connection_status("📡 Connecting...")
+        
+        await self.room.connect(url, token, options=self._room_options())
+        
+        # Log connection state after connect
+        print(f"🔗 Connection state: {self.room.connection_state}")
+        participant_sid = (self.room.local_participant.sid
+                          if self.room.local_participant else 'None')
+        print(f"🔗 Local participant SID: {participant_sid}")
+        
+        # Prepare playback
+        self.start_playback()
+        
+        # Start publishing microphone
+        await self.publish_microphone()
+        
+    def _register_room_handlers(self, room_name: str):
+        """Register LiveKit room event handlers"""
         @self.room.on("connected")
         def on_connected():
             self.status.set_connection_status("✅ Connected")
@@ -95,92 +146,57 @@ class VoiceClient:
         
         @self.room.on("data_received")
         def on_data_received(data):
+            if not self.channel.accepts(data):
+                return
             try:
-                message = data.data.decode('utf-8')
-                logger.info(f"Received data from {data.participant.identity}: {message}")
-                
-                # Check if this is an agent response and we have a callback
-                if (self.conversation_callback and
-                    data.participant and
-                    "agent" in data.participant.identity.lower()):
-                    self.conversation_callback("agent", message)
-                    
-                # Check if this is a user message (transcription)
-                elif (self.conversation_callback and
-                      data.participant and
-                      data.participant.identity == self.room.local_participant.identity):
-                    self.conversation_callback("user", message)
-                    
-            except Exception as e:
-                logger.error(f"Error handling data: {e}")
-        
-        print(f"📡 Connecting to {url}...")
-        self.status.set_connection_status("📡 Connecting...")
+                messages = decode(data.data)
+            except (ProtocolError, UnicodeDecodeError) as e:
+                logger.warning(f"Dropping malformed data packet: {e}")
+                return
+            for message in messages:
+                try:
+                    self._handle_message(message, data.participant)
+                except Exception as e:
+                    logger.error(f"Error handling data: {e}")
         
-        await self.room.connect(url, token.to_jwt())
+    def _handle_message(self, message, participant):
+        """Dispatch one received protocol message"""
+        if message.type == MessageType.ACK:
+            sent = self.pending_acks.pop(message.msg_id, None)
+            if sent is not None:
+                logger.debug(f"Message {message.msg_id} acknowledged in "
+                             f"{(time.monotonic() - sent) * 1000:.0f}ms")
+            return
         
-        # Log connection state after connect
-        print(f"🔗 Connection state: {self.room.connection_state}")
-        participant_sid = (self.room.local_participant.sid
-                          if self.room.local_participant else 'None')
-        print(f"🔗 Local participant SID: {participant_sid}")
+        if message.type == MessageType.TRANSCRIPT_INTERIM:
+            self._partial("user", message.text)
+        elif message.type == MessageType.AGENT_TOKEN:
+            tokens = self._reply_tokens.setdefault(message.msg_id, [])
+            tokens.append(message.text)
+            self._partial("agent", "".join(tokens))
+        elif message.type == MessageType.TRANSCRIPT_FINAL:
+            self._partial("user", "")
+            if self.conversation_callback and message.text:
+                self.conversation_callback("user", message.text)
+        elif message.type == MessageType.AGENT_REPLY:
+            self._reply_tokens.pop(message.msg_id, None)
+            self._partial("agent", "")
+            if self.conversation_callback and message.text:
+                self.conversation_callback("agent", message.text)
+        elif message.legacy and participant and self.conversation_callback:
+            # Raw text from an older peer: guess the role from the sender
+            if "agent" in participant.identity.lower():
+                self.conversation_callback("agent", message.text)
+            elif participant.identity == self.room.local_participant.identity:
+                self.conversation_callback("user", message.text)
         
-        # Start playback thread
-        self.start_playback_thread()
+    def _partial(self, role, text):
+        if self.partial_callback:
+            self.partial_callback(role, text)
         
-        # Start publishing microphone
-        await self.publish_microphone()
-        
-    def start_playback_thread(self):
-        """Start background thread for audio playback"""
-        def playback_worker():
-            logger.info("Starting audio playback thread")
-            
-            while self.running:
-                try:
-                    # Get audio from queue
-                    audio_data, sample_rate, channels = (
-                        self.audio_queue.get(timeout=0.1))
-                    
-                    self.status.set_agent_speaking(True)
-                    
-                    # Create/update speaker stream
-                    if self.speaker_stream is None:
-                        logger.info(f"Creating speaker stream: "
-                                   f"{sample_rate}Hz, {channels}ch")
-                        self.speaker_stream = self.audio.open(
-                            format=pyaudio.paInt16,
-                            channels=channels,
-                            rate=sample_rate,
-                            output=True,
-                            frames_per_buffer=len(audio_data) // 2
-                        )
-                    
-                    # Play audio
-                    self.speaker_stream.write(audio_data)
-                    
-                    # Check audio level
-                    audio_array = np.frombuffer(audio_data, dtype=np.int16)
-                    rms = int(np.sqrt(np.mean(audio_array.astype(float)**2)))
-                    logger.info(f"Played audio chunk: {len(audio_data)} bytes, "
-                               f"{sample_rate}Hz, {channels}ch, RMS: {rms}")
-                    
-                except queue.Empty:
-                    self.status.set_agent_speaking(False)
-                    continue
-                except Exception as e:
-                    logger.error(f"Playback error: {e}")
-                    if self.speaker_stream:
-                        try:
-                            self.speaker_stream.stop_stream()
-                            self.speaker_stream.close()
-                        except:
-                            pass
-                        self.speaker_stream = None
-        
-        self.playback_thread = threading.Thread(target=playback_worker,
-                                               daemon=True)
-        self.playback_thread.start()
+    def start_playback(self):
+        """Called once connected; the speaker opens on the first received frame"""
+        logger.info("Audio playback ready")
         
     async def publish_microphone(self):
         """Publish microphone audio"""
@@ -194,80 +210,105 @@ class VoiceClient:
         await self.room.local_participant.publish_track(audio_track)
         print("📡 Publishing microphone audio")
         
-        # Open mic stream
-        self.mic_stream = self.audio.open(
-            format=pyaudio.paInt16,
-            channels=1,
-            rate=16000,
-            input=True,
-            frames_per_buffer=320  # 20ms at 16kHz
+        # Open mic stream in callback mode; PortAudio fills a ring buffer
+        # and frames are pulled here without blocking the event loop
+        self.mic_capture = MicrophoneCapture(
+            self.audio,
+            sample_rate=16000,
+            samples_per_frame=320,  # 20ms at 16kHz
         )
+        self.mic_capture.start()
+        self.mic_stream = self.mic_capture.stream
         
         print("\n" + "="*60)
         print("VOICE CHAT ACTIVE")
         print("="*60)
         print()
         
+        frame = rtc.AudioFrame.create(16000, 1, 320)
+        frame_samples = np.frombuffer(frame.data, dtype=np.int16)
         frame_count = 0
         while self.room.connection_state == rtc.ConnectionState.CONN_CONNECTED:
             try:
-                # Read from mic
-                audio_data = self.mic_stream.read(
-                    320, exception_on_overflow=False)
-                
-                # Create frame
-                frame = rtc.AudioFrame.create(16000, 1, 320)
-                np.frombuffer(frame.data, dtype=np.int16)[:] = (
-                    np.frombuffer(audio_data, dtype=np.int16))
+                samples = await self.mic_capture.read_frame(timeout=1.0)
+                if samples is None:
+                    logger.warning("No microphone audio for 1s")
+                    continue
                 
                 # Send frame
+                frame_samples[:] = samples
                 await audio_source.capture_frame(frame)
                 
                 # Update status
                 frame_count += 1
                 if frame_count % 5 == 0:  # Every 100ms
-                    audio_array = np.frombuffer(
-                        audio_data, dtype=np.int16).astype(float)
-                    rms = int(np.sqrt(np.mean(audio_array**2)))
+                    audio_array = samples.astype(np.float32)
+                    rms = int(np.sqrt(np.dot(audio_array, audio_array) / len(audio_array)))
                     self.status.update_mic_level(rms)
+                if frame_count % 1500 == 0:  # Every 30s
+                    logger.info(f"Microphone timing: {self.mic_capture.stats()}")
                 
             except Exception as e:
                 logger.error(f"Microphone error: {e}")
                 break
                 
+    def _ensure_speaker(self, sample_rate: int, channels: int) -> SpeakerPlayback:
+        """Open the speaker for this format, reopening if the format changed"""
+        if self.speaker is None or not self.speaker.matches(sample_rate, channels):
+            if self.speaker is not None:
+                logger.info(f"Speaker format changed, reopening: {self.speaker.stats()}")
+                self.speaker.stop()
+            logger.info(f"Creating speaker stream: {sample_rate}Hz, {channels}ch")
+            self.speaker = SpeakerPlayback(self.audio, sample_rate, channels, registry=self.metrics)
+            self.speaker.start()
+        return self.speaker
+        
     async def receive_audio(self, track):
-        """Receive and queue audio"""
+        """Receive audio into the playback jitter buffer"""
         audio_stream = rtc.AudioStream(track)
         frame_count = 0
+        agent_speaking = False
         
         async for event in audio_stream:
-            if isinstance(event, rtc.AudioFrameEvent):
-                frame = event.frame
-                frame_count += 1
-                if frame_count % 50 == 0:  # Log every 50 frames
-                    logger.info(f"Received {frame_count} audio frames, "
-                               f"queue size: {self.audio_queue.qsize()}")
-                self.audio_queue.put((
-                    bytes(frame.data),
-                    frame.sample_rate,
-                    frame.num_channels
-                ))
+            if not isinstance(event, rtc.AudioFrameEvent):
+                continue
+            frame = event.frame
+            samples = np.frombuffer(frame.data, dtype=np.int16)
+            try:
+                self._ensure_speaker(frame.sample_rate, frame.num_channels).push(samples)
+            except Exception as e:
+                logger.error(f"Playback error: {e}")
+                break
+            
+            frame_count += 1
+            if frame_count % 5 == 0 and len(samples):
+                audio_array = samples.astype(np.float32)
+                speaking = np.dot(audio_array, audio_array) / len(audio_array) > 100 ** 2
+                if speaking != agent_speaking:
+                    agent_speaking = speaking
+                    self.status.set_agent_speaking(speaking)
+            if frame_count % 3000 == 0:
+                logger.info(f"Playback buffer: {self.speaker.stats()}")
+        
+        if agent_speaking:
+            self.status.set_agent_speaking(False)
                 
     async def disconnect(self):
         """Disconnect from room"""
         self.running = False
         
-        if self.mic_stream:
+        if self.mic_capture:
+            logger.info(f"Microphone timing: {self.mic_capture.stats()}")
+            self.mic_capture.stop()
+        elif self.mic_stream:
             self.mic_stream.stop_stream()
             self.mic_stream.close()
             
-        if self.speaker_stream:
-            self.speaker_stream.stop_stream()
-            self.speaker_stream.close()
+        if self.speaker:
+            logger.info(f"Playback buffer: {self.speaker.stats()}")
+            self.speaker.stop()
             
         await self.room.disconnect()
-        self.audio.terminate()
-        
-        if self.playback_thread:
-            self.playback_thread.join(timeout=1)
+        if self.audio:
+            self.audio.terminate()
 
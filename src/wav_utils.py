@@ -0,0 +1,55 @@
+"""Audio helpers: WAV files, sample format and sample rate conversion"""
+import wave
+from typing import Iterator
+
+import numpy as np
+
+
+def load_wav(path: str, sample_rate: int) -> np.ndarray:
+    """Read a 16-bit PCM WAV file as mono int16 at the requested sample rate"""
+    with wave.open(str(path), "rb") as wav_file:
+        if wav_file.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit PCM WAV files are supported")
+        channels = wav_file.getnchannels()
+        source_rate = wav_file.getframerate()
+        audio = np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype=np.int16)
+
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1).astype(np.int16)
+
+    return resample(audio, source_rate, sample_rate)
+
+
+def resample(audio: np.ndarray, from_rate: int, to_rate: int) -> np.ndarray:
+    """Polyphase-resample int16 audio; returns the input unchanged if the rates match"""
+    if from_rate == to_rate:
+        return audio
+    import scipy.signal
+    from math import gcd
+    g = gcd(from_rate, to_rate)
+    resampled = scipy.signal.resample_poly(audio.astype(np.float32), to_rate // g, from_rate // g)
+    return np.clip(resampled, -32768, 32767).astype(np.int16)
+
+
+def float_to_int16(samples) -> np.ndarray:
+    """Convert float samples in [-1, 1] (list or array) to int16 in one pass"""
+    audio = np.asarray(samples, dtype=np.float32)
+    return (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+
+
+def save_wav(path, audio: np.ndarray, sample_rate: int):
+    """Write mono int16 audio as a 16-bit PCM WAV file"""
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(np.asarray(audio, dtype=np.int16).tobytes())
+
+
+def iter_frames(audio: np.ndarray, samples_per_frame: int) -> Iterator[np.ndarray]:
+    """Split audio into fixed-size frames, zero-padding the last one"""
+    for start in range(0, len(audio), samples_per_frame):
+        frame = audio[start:start + samples_per_frame]
+        if len(frame) < samples_per_frame:
+            frame = np.pad(frame, (0, samples_per_frame - len(frame)))
+        yield frame
@@ -11,4 +11,5 @@ class WhisperOptions:
     language: str = "en"
     initial_prompt: Optional[str] = None
     vad_filter: bool = True
-    vad_parameters: Optional[dict] = None
\ No newline at end of file
+    vad_parameters: Optional[dict] = None
+    word_timestamps: bool = False  # Extra alignment pass; off unless a caller needs word timings
\ No newline at end of file
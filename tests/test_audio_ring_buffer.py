@@ -0,0 +1,48 @@
+import numpy as np
+
+from src.audio_ring_buffer import Int16RingBuffer
+from src.microphone_capture import FrameJitterStats
+
+
+def test_write_read_wraps_around():
+    ring = Int16RingBuffer(8)
+    out = np.zeros(4, dtype=np.int16)
+
+    assert ring.write(np.arange(6, dtype=np.int16)) == 0
+    assert ring.read(out) == 4
+    assert list(out) == [0, 1, 2, 3]
+
+    # This write wraps past the end of the backing array
+    assert ring.write(np.arange(10, 16, dtype=np.int16)) == 0
+    assert ring.available() == 8
+    out = np.zeros(8, dtype=np.int16)
+    assert ring.read(out) == 8
+    assert list(out) == [4, 5, 10, 11, 12, 13, 14, 15]
+
+
+def test_overflow_drops_newest_and_underrun_is_reported():
+    ring = Int16RingBuffer(4)
+    assert ring.write(np.arange(6, dtype=np.int16)) == 2
+    out = np.zeros(6, dtype=np.int16)
+    assert ring.read(out) == 4
+    assert list(out[:4]) == [0, 1, 2, 3]
+    assert ring.available() == 0
+
+
+def test_discard():
+    ring = Int16RingBuffer(8)
+    ring.write(np.arange(5, dtype=np.int16))
+    assert ring.discard(3) == 3
+    out = np.zeros(2, dtype=np.int16)
+    ring.read(out)
+    assert list(out) == [3, 4]
+
+
+def test_frame_jitter_stats():
+    stats = FrameJitterStats(period=0.02)
+    for t in (0.0, 0.02, 0.045, 0.06, 0.11):
+        stats.record(t)
+    summary = stats.summary()
+    assert summary["frames"] == 5
+    assert summary["late_frames"] == 1
+    assert abs(summary["max_jitter_ms"] - 30.0) < 1e-6
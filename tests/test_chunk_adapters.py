@@ -0,0 +1,86 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.chunk_adapters import livekit_delta, openai_choices, openai_dict, plain_text, select_adapter
+from src.llm_backends import OpenAICompatibleBackend
+
+
+def test_selects_adapter_by_chunk_shape():
+    assert select_adapter({"choices": []}) is openai_dict
+    assert select_adapter(SimpleNamespace(delta=None)) is livekit_delta
+    assert select_adapter(SimpleNamespace(choices=[])) is openai_choices
+    assert select_adapter(SimpleNamespace(text="hi")) is plain_text
+    with pytest.raises(TypeError):
+        select_adapter(object())
+
+
+def test_adapters_extract_text_deltas():
+    assert livekit_delta(SimpleNamespace(delta=SimpleNamespace(content="Hi"))) == "Hi"
+    assert livekit_delta(SimpleNamespace(delta=SimpleNamespace(content=None))) == ""
+    assert livekit_delta(SimpleNamespace(delta=None)) == ""
+
+    parts = [SimpleNamespace(text="a"), "b", SimpleNamespace(text=None)]
+    assert openai_choices(SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=parts))])) == "ab"
+    assert openai_choices(SimpleNamespace(choices=[])) == ""
+
+    assert openai_dict({"choices": [{"delta": {"content": "x"}}]}) == "x"
+    assert openai_dict({"choices": [{"delta": {"role": "assistant"}}]}) == ""
+    assert plain_text(SimpleNamespace(text=None)) == ""
+
+
+class ListBackend(OpenAICompatibleBackend):
+    def _chat(self, messages):
+        async def chunks():
+            for chunk in self.llm:
+                yield chunk
+        return chunks()
+
+
+def test_backend_picks_adapter_once():
+    chunks = [SimpleNamespace(delta=SimpleNamespace(content=c)) for c in ["Hel", None, "lo"]]
+    backend = ListBackend(chunks, "test")
+
+    async def run():
+        return [c.text async for c in backend.stream([])]
+
+    assert asyncio.run(run()) == ["Hel", "", "lo"]
+    assert backend.adapter is livekit_delta
+
+
+class ClosingStream:
+    """Stands in for the plugin's LLMStream, which must be closed to cancel the request"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._chunks)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def aclose(self):
+        self.closed = True
+
+
+def test_closing_the_backend_stream_closes_the_plugin_stream():
+    chat_stream = ClosingStream([SimpleNamespace(delta=SimpleNamespace(content=c)) for c in "abc"])
+
+    class PluginBackend(OpenAICompatibleBackend):
+        def _chat(self, messages):
+            return chat_stream
+
+    async def run():
+        stream = PluginBackend(None, "test").stream([])
+        first = await stream.__anext__()
+        await stream.aclose()
+        return first.text
+
+    assert asyncio.run(run()) == "a"
+    assert chat_stream.closed
@@ -0,0 +1,57 @@
+import pytest
+
+from src.command_router import CHAT, DICTATION, CommandRouter
+
+
+def make_router():
+    router = CommandRouter()
+    calls = []
+
+    @router.command("start_dictation", "{start} {dictation}", modes=(CHAT,))
+    def start(match):
+        calls.append(match)
+        return "started"
+
+    @router.command("save_dictation", "{save} {dictation} {filename}", modes=(DICTATION,))
+    async def save(match):
+        calls.append(match)
+        return match.args.get("filename", "dictation.txt")
+
+    return router, calls
+
+
+@pytest.mark.parametrize("text", [
+    "Ada, start dictation.",
+    "Ada, take the dictation please",
+    "Okay Ada begin dictating",
+    "Start diction",
+])
+def test_spelling_variants_match(text):
+    router, _ = make_router()
+    assert router.match(text, CHAT).name == "start_dictation"
+
+
+def test_modes_gate_commands():
+    router, _ = make_router()
+    assert router.match("save dictation", CHAT) is None
+    assert router.match("start dictation", DICTATION) is None
+    assert router.match("tell me about dictation", CHAT) is None
+
+
+@pytest.mark.parametrize("text, filename", [
+    ("Ada, save dictation as meeting notes.", "meeting notes.txt"),
+    ("Safe dictation as todo dot txt", "todo.txt"),
+    ("save dictation", "dictation.txt"),
+])
+async def test_filename_slot(text, filename):
+    router, calls = make_router()
+    match, reply = await router.dispatch(text, DICTATION)
+    assert match.name == "save_dictation"
+    assert reply == filename
+    assert calls == [match]
+
+
+async def test_dispatch_without_match():
+    router, calls = make_router()
+    assert await router.dispatch("what's the weather", CHAT) == (None, None)
+    assert calls == []
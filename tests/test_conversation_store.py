@@ -0,0 +1,41 @@
+import json
+
+from src.conversation_store import ConversationStore
+
+
+def test_capacity_and_recent():
+    store = ConversationStore(capacity=3)
+    for i in range(5):
+        store.append("user", f"message {i}")
+
+    assert len(store) == 3
+    assert [r.text for r in store.recent(2)] == ["message 3", "message 4"]
+    assert [r.seq for r in store.recent(10)] == [3, 4, 5]
+
+
+def test_since_returns_only_new_messages():
+    store = ConversationStore(capacity=10)
+    store.append("user", "hello")
+    records, cursor = store.since(0)
+    assert [r.text for r in records] == ["hello"]
+
+    records, cursor = store.since(cursor)
+    assert records == []
+
+    store.append("agent", "hi", source="voice")
+    store.append("system", "note")
+    records, cursor = store.since(cursor)
+    assert [(r.role, r.text) for r in records] == [("agent", "hi"), ("system", "note")]
+    assert cursor == store.last_seq == 3
+
+
+def test_transcript_keeps_messages_that_fell_out(tmp_path):
+    path = tmp_path / "logs" / "conversation.jsonl"
+    store = ConversationStore(capacity=1, transcript_path=str(path))
+    store.append("user", "first")
+    store.append("agent", "second")
+    store.close()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [(line["seq"], line["text"]) for line in lines] == [(1, "first"), (2, "second")]
+    assert len(store) == 1
@@ -0,0 +1,36 @@
+import pytest
+
+from src.data_protocol import (
+    FLAG_FINAL, HEADER, MAGIC, Message, MessageType, ProtocolError, decode, encode, encode_batch,
+)
+
+
+def test_round_trip_preserves_fields():
+    message = Message(MessageType.AGENT_TOKEN, "héllo", msg_id=42, seq=3, flags=0)
+    data = encode(message)
+    assert data[0] == MAGIC
+    assert len(data) == HEADER.size + len("héllo".encode())
+    assert decode(data) == [message]
+    assert not decode(data)[0].final
+
+
+def test_batch_decodes_in_order():
+    messages = [
+        Message(MessageType.AGENT_TOKEN, "Hel", msg_id=7, seq=0, flags=0),
+        Message(MessageType.AGENT_TOKEN, "lo", msg_id=7, seq=1, flags=FLAG_FINAL),
+        Message(MessageType.ACK, msg_id=3),
+    ]
+    assert decode(encode_batch(messages)) == messages
+
+
+def test_raw_utf8_is_legacy_user_text():
+    [message] = decode("Ada, start dictation".encode("utf-8"))
+    assert message.type == MessageType.USER_TEXT
+    assert message.legacy
+    assert message.text == "Ada, start dictation"
+
+
+def test_truncated_frame_is_rejected():
+    data = encode(Message(MessageType.USER_TEXT, "hello"))
+    with pytest.raises(ProtocolError):
+        decode(data[:-2])
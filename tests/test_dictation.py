@@ -0,0 +1,79 @@
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from src.conversation_agent import ConversationAgent
+from src.dictation import DictationEngine
+
+
+def test_save_streams_journal_and_removes_it(tmp_path):
+    engine = DictationEngine(str(tmp_path))
+    engine.start()
+    engine.add("First sentence.")
+    engine.add("Second sentence.")
+    journal = engine.journal.path
+
+    path = engine.save("notes.txt")
+
+    assert path.read_text() == "First sentence. Second sentence."
+    assert not journal.exists()
+    assert not engine.active
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_resume_after_restart(tmp_path):
+    engine = DictationEngine(str(tmp_path))
+    engine.start()
+    engine.add("Before the crash.")
+    # Simulate a crash: the journal is left behind, with a torn last line
+    engine.journal._file.write('{"type": "segm')
+    engine.journal._file.flush()
+
+    restarted = DictationEngine(str(tmp_path))
+    assert restarted.resume()
+    assert restarted.segments == 1
+    restarted.add("After the restart.")
+    assert restarted.save("resumed.txt").read_text() == "Before the crash. After the restart."
+
+
+def test_word_timings_are_exported(tmp_path):
+    engine = DictationEngine(str(tmp_path))
+    engine.start()
+    words = [SimpleNamespace(word=" Hello", start=0.0, end=0.4, probability=0.9),
+             SimpleNamespace(word=" world", start=0.5, end=0.9, probability=0.8)]
+    engine.add("Hello world", [SimpleNamespace(words=words)], utterance_start=engine.started_at + 2.0)
+
+    engine.save("timed.txt")
+
+    exported = json.loads((tmp_path / "timed.words.json").read_text())
+    [segment] = exported["segments"]
+    assert segment["start"] == 2.0
+    assert [(w["word"], w["start"], w["end"]) for w in segment["words"]] == [
+        ("Hello", 2.0, 2.4), ("world", 2.5, 2.9)]
+
+
+def test_save_without_content_fails(tmp_path):
+    engine = DictationEngine(str(tmp_path))
+    engine.start()
+    with pytest.raises(ValueError):
+        engine.save()
+    assert engine.active
+
+
+async def test_agent_journals_off_the_event_loop_with_batched_fsync(tmp_path, monkeypatch):
+    monkeypatch.setenv("DICTATION_DIR", str(tmp_path))
+    fsyncs = []
+    monkeypatch.setattr("src.dictation.os.fsync", lambda fd: fsyncs.append(threading.current_thread().name))
+    agent = ConversationAgent(SimpleNamespace(set_dictating=lambda active: None))
+
+    await agent.start_dictation()
+    for i in range(5):
+        await agent.add_to_dictation(f"Sentence {i}.")
+    assert fsyncs == []  # Six records, below the default batch of ten
+    ok, path = await agent.save_dictation("notes.txt")
+    await agent.aclose()
+
+    assert ok and path.endswith("notes.txt")
+    assert fsyncs and all(name.startswith("dictation") for name in fsyncs)
@@ -0,0 +1,54 @@
+import numpy as np
+
+from src.echo_canceller import EchoCanceller, FarEndReference
+
+RATE = 16000
+BLOCK = 160
+
+
+def echo_path(far, rng):
+    response = np.zeros(400)
+    response[80] = 0.3
+    response[80:] += rng.normal(0, 0.02, 320) * np.exp(-np.arange(320) / 80)
+    return np.convolve(far, response)[:len(far)]
+
+
+def run(aec, near, far):
+    return np.concatenate([aec.process(near[i:i + BLOCK], far[i:i + BLOCK])
+                           for i in range(0, len(far), BLOCK)])
+
+
+def test_cancels_echo():
+    rng = np.random.default_rng(0)
+    far = rng.normal(0, 3000, RATE * 4)
+    near = (echo_path(far, rng) + rng.normal(0, 5, len(far))).astype(np.int16)
+    out = run(EchoCanceller(BLOCK, RATE, tail_ms=50), near, far)
+    last = slice(-RATE, None)
+    assert EchoCanceller.erle_db(near[last], out[last]) > 20
+
+
+def test_double_talk_freezes_adaptation():
+    rng = np.random.default_rng(1)
+    far = rng.normal(0, 3000, RATE)
+    near_talker = rng.normal(0, 8000, RATE)
+    near = np.clip(echo_path(far, rng) + near_talker, -32768, 32767).astype(np.int16)
+    aec = EchoCanceller(BLOCK, RATE, tail_ms=50)
+    out = run(aec, near, far)
+    assert aec.double_talk
+    # The talker passes through untouched instead of being adapted away
+    assert abs(EchoCanceller.erle_db(near, out)) < 1
+
+
+def test_reference_timeline():
+    reference = FarEndReference(sample_rate=100)
+    reference.push(np.arange(1, 101, dtype=np.int16), now=10.0)
+    reference.push(np.full(50, 7, dtype=np.int16), now=10.2)  # Queued behind the first
+
+    assert list(reference.read(5, 100, end=10.05)) == [1, 2, 3, 4, 5]
+    assert list(reference.read(4, 100, end=11.02)) == [99, 100, 7, 7]
+    assert not reference.read(10, 100, end=9.5).any()
+    # Resampled to the near-end rate
+    assert len(reference.read(10, 200, end=10.5)) == 10
+
+    reference.clear(now=10.5)
+    assert not reference.read(10, 100, end=11.2).any()
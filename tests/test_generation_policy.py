@@ -0,0 +1,90 @@
+import asyncio
+from types import SimpleNamespace
+
+from src.conversation_agent import ConversationAgent
+from src.generation_policy import GenerationPolicy, ReplyLimiter
+from src.llm_backends import LLMBackend, LLMChunk
+
+
+def feed(limiter, tokens):
+    kept = []
+    for token in tokens:
+        kept.append(limiter.accept(token))
+        if limiter.stop:
+            break
+    return "".join(kept)
+
+
+TOKENS = ["First one is here", ".", " Second one is here", ".", " Third one is", " here", ".", " Fourth"]
+
+
+def test_sentence_limit_cuts_after_the_last_allowed_sentence():
+    limiter = ReplyLimiter(GenerationPolicy(max_tokens=0, max_sentences=2, deadline=0))
+    streamed = feed(limiter, TOKENS)
+    assert limiter.stop == "max_sentences"
+    assert limiter.sentences == 2
+    assert streamed.strip() == limiter.text == "First one is here. Second one is here."
+
+
+def test_token_budget_falls_back_to_complete_sentences():
+    limiter = ReplyLimiter(GenerationPolicy(max_tokens=6, max_sentences=0, deadline=0))
+    feed(limiter, TOKENS)
+    assert limiter.stop == "max_tokens" and limiter.tokens == 6
+    assert limiter.text == "First one is here. Second one is here."
+
+    # Nothing complete yet: keep the partial text
+    limiter = ReplyLimiter(GenerationPolicy(max_tokens=1, max_sentences=0, deadline=0))
+    feed(limiter, TOKENS)
+    assert limiter.text == "First one is here"
+
+
+def test_unlimited_reply_is_complete():
+    limiter = ReplyLimiter(GenerationPolicy(max_tokens=0, max_sentences=0, deadline=0))
+    assert feed(limiter, TOKENS) == "".join(TOKENS)
+    assert limiter.stop is None
+
+
+class StallingBackend(LLMBackend):
+    """Streams ``tokens`` and then hangs, as a stuck model would"""
+    name = "stalling"
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.closed = False
+
+    async def stream(self, messages, *, session="default", max_tokens=None):
+        try:
+            for token in self.tokens:
+                yield LLMChunk(token)
+            await asyncio.sleep(10)
+        finally:
+            self.closed = True
+
+
+def make_agent(backend, policy):
+    agent = ConversationAgent(SimpleNamespace(set_thinking=lambda thinking: None),
+                              conversation_callback=lambda role, text: None)
+    agent.llm = backend
+    agent.generation = policy
+    return agent
+
+
+def test_deadline_stops_the_stream_and_reports_truncation():
+    backend = StallingBackend(TOKENS[:3])
+    agent = make_agent(backend, GenerationPolicy(max_tokens=0, max_sentences=0, deadline=0.05))
+    reply = asyncio.run(agent.generate_response("hi"))
+    assert reply == "First one is here."
+    assert backend.closed
+    assert agent.messages[-1] == {"role": "assistant", "content": reply}
+    assert agent.generation.stats() == {"replies": 1, "truncation_rate": 1.0, "by_stop": {"deadline": 1}}
+
+
+def test_sentence_limit_closes_the_stream_early():
+    backend = StallingBackend(TOKENS)
+    agent = make_agent(backend, GenerationPolicy(max_sentences=1))
+    tokens = []
+    reply = asyncio.run(agent.generate_response("hi", on_token=tokens.append))
+    assert reply == "First one is here."
+    assert "".join(tokens).strip() == reply
+    assert backend.closed
+    assert agent.generation.truncation_rate == 1.0
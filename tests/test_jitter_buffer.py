@@ -0,0 +1,61 @@
+import numpy as np
+
+from src.jitter_buffer import JitterBuffer
+from src.metrics import MetricsRegistry
+
+
+def test_primes_to_target_then_plays():
+    buffer = JitterBuffer(1000, target_ms=30, max_ms=100)
+    out = np.zeros(10, dtype=np.int16)
+
+    buffer.push(np.ones(20, dtype=np.int16))
+    assert buffer.pull(out) == 0  # still priming
+    assert not out.any()
+
+    buffer.push(np.ones(10, dtype=np.int16))
+    assert buffer.pull(out) == 10
+    assert (out == 1).all()
+
+
+def test_overrun_drops_oldest_back_to_target():
+    registry = MetricsRegistry()
+    buffer = JitterBuffer(1000, target_ms=30, max_ms=100, registry=registry)
+
+    buffer.push(np.arange(90, dtype=np.int16))
+    buffer.push(np.arange(100, 120, dtype=np.int16))
+
+    assert buffer.overruns == 1
+    assert buffer.depth_ms() == 30
+    assert buffer._ring.read_pos == 0  # Only the reader moves the read position
+    out = np.zeros(30, dtype=np.int16)
+    buffer.pull(out)
+    assert list(out[-3:]) == [117, 118, 119]
+    assert "ada_client_playback_overruns_total 1" in registry.render()
+
+
+def test_underrun_fills_silence_and_reprimes():
+    buffer = JitterBuffer(1000, target_ms=20, max_ms=100, drift_tolerance_ms=50)
+    out = np.zeros(15, dtype=np.int16)
+
+    buffer.push(np.ones(20, dtype=np.int16))
+    assert buffer.pull(out) == 15
+    assert buffer.pull(out) == 5
+    assert not out[5:].any()
+    assert buffer.underruns == 1
+
+    buffer.push(np.ones(10, dtype=np.int16))
+    assert buffer.pull(out) == 0  # waits for target again
+
+
+def test_drift_above_target_consumes_faster():
+    buffer = JitterBuffer(1000, target_ms=20, max_ms=500, drift_tolerance_ms=5, stretch=0.1)
+    out = np.zeros(10, dtype=np.int16)
+
+    buffer.push(np.full(200, 1000, dtype=np.int16))
+    for _ in range(10):
+        buffer.pull(out)
+
+    # Stretched reads take 11 samples per 10 played
+    assert buffer.stretched_callbacks == 10
+    assert buffer.depth_ms() == 200 - 110
+    assert (out == 1000).all()
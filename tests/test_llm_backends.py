@@ -0,0 +1,81 @@
+import asyncio
+import time
+
+import pytest
+
+from src.llm_backends import LlamaCppBackend, create_llm_backend_from_env
+
+
+class FakeLlama:
+    """Stands in for llama_cpp.Llama: the 'KV state' is the list of prompts seen"""
+
+    def __init__(self, delay=0.0):
+        self.context = []
+        self.delay = delay
+        self.produced = 0
+
+    def save_state(self):
+        return list(self.context)
+
+    def load_state(self, state):
+        self.context = list(state)
+
+    def reset(self):
+        self.context = []
+
+    def create_chat_completion(self, messages, stream):
+        self.context.append(messages[-1]["content"])
+        yield {"choices": [{"delta": {"role": "assistant"}, "finish_reason": None}]}
+        for word in ["echo:", " ", messages[-1]["content"]]:
+            time.sleep(self.delay)
+            self.produced += 1
+            yield {"choices": [{"delta": {"content": word}, "finish_reason": None}]}
+        yield {"choices": [{"delta": {}, "finish_reason": "stop"}]}
+
+
+async def reply(backend, text, session):
+    chunks = [c async for c in backend.stream([{"role": "user", "content": text}], session=session)]
+    return "".join(c.text for c in chunks), chunks[-1].finish_reason
+
+
+async def test_llamacpp_streams_chunks_and_keeps_kv_state_per_session():
+    model = FakeLlama()
+    backend = LlamaCppBackend(model)
+    assert await reply(backend, "hi", "a") == ("echo: hi", "stop")
+    await reply(backend, "hello", "b")
+    assert model.context == ["hello"]  # Session b started from an empty cache
+    await reply(backend, "again", "a")
+    assert model.context == ["hi", "again"]  # Session a's state was restored
+
+
+async def test_llamacpp_drops_least_recently_used_sessions():
+    model = FakeLlama()
+    backend = LlamaCppBackend(model, max_sessions=1)
+    for session in ["a", "b", "c"]:
+        await reply(backend, session, session)
+    await reply(backend, "back", "a")
+    assert model.context == ["back"]
+
+
+async def test_cancelling_a_stream_stops_generation():
+    model = FakeLlama(delay=0.05)
+    backend = LlamaCppBackend(model)
+
+    async def consume():
+        async for _ in backend.stream([{"role": "user", "content": "slow"}]):
+            pass
+
+    task = asyncio.create_task(consume())
+    await asyncio.sleep(0.07)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert model.produced < 3
+    # The model is free again for the next request
+    assert await reply(backend, "next", "default") == ("echo: next", "stop")
+
+
+def test_unknown_backend_is_rejected(monkeypatch):
+    monkeypatch.setenv("LLM_BACKEND", "nope")
+    with pytest.raises(ValueError, match="available"):
+        create_llm_backend_from_env()
@@ -0,0 +1,92 @@
+import asyncio
+
+from src.metrics import AgentMetrics, MetricsRegistry, MetricsServer
+from src.status_indicator import StatusIndicator
+from src.turn_tracer import TurnTracer
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    frames = registry.counter("frames_total", "Frames", ["path"])
+    depth = registry.gauge("depth", "Depth")
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+
+    frames.inc(path="ingest")
+    frames.inc(2, path="ingest")
+    depth.set(3)
+    latency.observe(0.05)
+    latency.observe(0.5)
+
+    text = registry.render()
+    assert "# TYPE frames_total counter" in text
+    assert 'frames_total{path="ingest"} 3' in text
+    assert "depth 3" in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 2' in text
+    assert "latency_seconds_count 2" in text
+
+
+def test_turn_traces_feed_agent_metrics():
+    metrics = AgentMetrics()
+    tracer = TurnTracer([metrics])
+    turn = tracer.start_turn("user-1")
+    turn.mark("stt_start", 0.0)
+    turn.mark("stt_end", 0.2)
+    turn.mark("llm_start", 0.2)
+    turn.mark("llm_last_token", 1.2)
+    turn.set("llm_chunks", 40)
+    turn.mark("tts_start", 1.2)
+    turn.mark("tts_last_chunk", 1.7)
+    turn.set("tts_audio_seconds", 2.5)
+    tracer.finish(turn)
+
+    assert metrics.utterances.value(source="voice", outcome="ok") == 1
+    assert metrics.stt_latency.count() == 1
+    assert metrics.llm_tokens_per_second.count() == 1
+    assert metrics.tts_rtf.count() == 1
+
+
+def test_status_indicator_feeds_pipeline_state(capsys):
+    metrics = AgentMetrics()
+    status = StatusIndicator(metrics)
+    status.set_thinking(True)
+    status.publisher.publish()
+    assert metrics.pipeline_state.value(state="thinking") == 1
+    status.set_thinking(False)
+    status.close()
+    assert metrics.pipeline_state.value(state="thinking") == 0
+
+
+async def test_metrics_server_serves_endpoint():
+    metrics = AgentMetrics()
+    metrics.active_sessions.inc()
+    server = MetricsServer(metrics.registry, port=0)
+    await server.start()
+    try:
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        writer.write(b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        await writer.drain()
+        response = (await reader.read()).decode()
+        writer.close()
+    finally:
+        await server.stop()
+
+    assert response.startswith("HTTP/1.1 200 OK")
+    assert "ada_active_sessions 1" in response
+
+
+def test_false_triggers_count_wasted_stt():
+    metrics = AgentMetrics()
+    tracer = TurnTracer([metrics])
+    turn = tracer.start_turn("user-1")
+    turn.mark("stt_start", 0.0)
+    turn.mark("stt_end", 0.4)
+    turn.set("utterance_seconds", 1.5)
+    tracer.finish(turn, "empty_transcript")
+    tracer.finish(tracer.start_turn("user-1"), "too_short")
+
+    assert metrics.false_triggers.value(reason="empty_transcript") == 1
+    assert metrics.false_triggers.value(reason="too_short") == 1
+    assert metrics.wasted_stt_seconds.value() == 0.4
+    assert metrics.wasted_audio_seconds.value() == 1.5
@@ -0,0 +1,58 @@
+import asyncio
+
+from rich.layout import Layout
+from rich.panel import Panel
+from rich.text import Text
+
+from src.render_scheduler import IncrementalText, RenderScheduler
+
+
+class CountingLive:
+    def __init__(self):
+        self.refreshes = 0
+
+    def refresh(self):
+        self.refreshes += 1
+
+
+async def test_bursts_coalesce_and_only_dirty_panels_render():
+    layout = Layout()
+    layout.split_column(Layout(name="status"), Layout(name="conversation"))
+    scheduler = RenderScheduler(layout, max_fps=20)
+    rendered = []
+    scheduler.add_panel("status", lambda: rendered.append("status") or Panel("status"))
+    scheduler.add_panel("conversation", lambda: rendered.append("conversation") or Panel("chat"))
+
+    live = CountingLive()
+    task = asyncio.create_task(scheduler.run(live))
+    await asyncio.sleep(0.01)
+    rendered.clear()
+    refreshes = live.refreshes
+
+    for _ in range(50):
+        scheduler.mark_dirty("status")
+    await asyncio.sleep(0.1)
+
+    assert rendered == ["status"]
+    assert live.refreshes == refreshes + 1
+
+    # Idle: nothing renders
+    await asyncio.sleep(0.1)
+    assert rendered == ["status"]
+    task.cancel()
+
+
+def test_incremental_text_formats_each_item_once():
+    formatted = []
+
+    def formatter(item):
+        formatted.append(item)
+        return Text(item)
+
+    text = IncrementalText(formatter, max_items=2, placeholder=Text("empty"))
+    assert text.render().plain == "empty"
+
+    for item in ("a", "b", "c"):
+        text.append(item)
+    assert text.render().plain == "b\nc"
+    assert formatted == ["a", "b", "c"]
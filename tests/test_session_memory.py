@@ -0,0 +1,120 @@
+import asyncio
+import sqlite3
+import time
+from types import SimpleNamespace
+
+from src.conversation_agent import ConversationAgent
+from src.llm_backends import LLMBackend, LLMChunk
+from src.session_memory import BM25Index, Exchange, MemoryStore, SessionMemory
+
+
+def exchange(id, user, agent, session="old"):
+    return Exchange(id, "alice", session, 0.0, user, agent)
+
+
+def test_store_is_persistent_wal_log(tmp_path):
+    path = str(tmp_path / "memory.db")
+    store = MemoryStore(path)
+    store.append("alice", "s1", "My dog is called Rex", "Nice name!")
+    store.append("bob", "s1", "Hi", "Hello!")
+    store.close()
+
+    store = MemoryStore(path)
+    assert [e.user_text for e in store.load("alice")] == ["My dog is called Rex"]
+    store.close()
+    assert sqlite3.connect(path).execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_bm25_ranks_relevant_exchanges_and_excludes_session():
+    index = BM25Index()
+    index.add(exchange(1, "What's the weather like?", "Sunny and warm."))
+    index.add(exchange(2, "My dog Rex loves the park", "Rex sounds like a happy dog."))
+    index.add(exchange(3, "Remind me about the dentist", "Okay, dentist on Friday."))
+    index.add(exchange(4, "Rex chewed my shoe", "Oh no, Rex!", session="now"))
+
+    found, truncated = index.search("how is my dog Rex", 2, time.perf_counter() + 1)
+    assert not truncated
+    assert {e.id for e in found} == {2, 4}
+
+    found, _ = index.search("how is my dog Rex", 2, time.perf_counter() + 1, exclude_session="now")
+    assert [e.id for e in found] == [2]
+
+
+def test_search_stops_at_the_deadline():
+    index = BM25Index()
+    for i in range(5000):
+        index.add(exchange(i, f"note {i} about apples", "ok"))
+    found, truncated = index.search("apples note", 3, deadline=time.perf_counter())
+    assert truncated
+
+
+def test_recall_does_not_wait_for_history_to_load(tmp_path):
+    async def run():
+        memory = SessionMemory(MemoryStore(str(tmp_path / "memory.db")), top_k=2)
+        memory.remember("alice", "s1", "My favourite colour is green", "Green it is.")
+        await memory.aclose()
+
+        memory = SessionMemory(MemoryStore(str(tmp_path / "memory.db")), top_k=2)
+        assert memory.recall("alice", "what colour do I like").exchanges == []
+        await memory.preload("alice")
+        recall = memory.recall("alice", "what colour do I like")
+        await memory.aclose()
+        return recall
+
+    recall = asyncio.run(run())
+    assert [e.agent_text for e in recall.exchanges] == ["Green it is."]
+
+
+class FlakyStore(MemoryStore):
+    """Fails to load once, like a locked or briefly unavailable database"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.failures = 1
+
+    def load(self, identity):
+        if self.failures:
+            self.failures -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return super().load(identity)
+
+
+async def test_failed_history_load_is_retried(tmp_path):
+    memory = SessionMemory(FlakyStore(str(tmp_path / "memory.db")), top_k=2)
+    await memory.preload("alice")
+    memory.remember("alice", "s1", "My favourite colour is green", "Green it is.")
+    await asyncio.gather(*memory._writes)  # Retries the load before indexing
+    recall = memory.recall("alice", "what colour do I like")
+    await memory.aclose()
+    assert [e.agent_text for e in recall.exchanges] == ["Green it is."]
+
+
+class RecordingBackend(LLMBackend):
+    name = "recording"
+
+    def __init__(self):
+        self.prompts = []
+
+    async def stream(self, messages, *, session="default", max_tokens=None):
+        self.prompts.append(list(messages))
+        yield LLMChunk("Noted.")
+
+
+def test_agent_recalls_earlier_sessions_into_the_prompt(tmp_path, monkeypatch):
+    monkeypatch.setenv("MEMORY_DB", str(tmp_path / "memory.db"))
+    status = SimpleNamespace(set_thinking=lambda thinking: None)
+
+    async def session(*texts):
+        agent = ConversationAgent(status, conversation_callback=lambda role, text: None)
+        agent.llm = RecordingBackend()
+        await agent.memory.preload("alice")
+        for text in texts:
+            await agent.generate_response(text, participant="alice")
+        await agent.aclose()
+        return agent.llm.prompts
+
+    asyncio.run(session("My sister lives in Lisbon"))
+    prompts = asyncio.run(session("Where does my sister live?"))
+    note = prompts[0][-2]
+    assert note["role"] == "system" and "Lisbon" in note["content"]
+    assert prompts[0][-1] == {"role": "user", "content": "Where does my sister live?"}
@@ -0,0 +1,45 @@
+import random
+
+from src.speech_detector import END, START, AdaptiveSpeechDetector
+
+
+def run(detector, levels):
+    return [(i, event) for i, rms in enumerate(levels) if (event := detector.feed(rms))]
+
+
+def noise(level, frames, seed=0):
+    rng = random.Random(seed)
+    return [level * rng.uniform(0.7, 1.3) for _ in range(frames)]
+
+
+def test_detects_speech_over_a_quiet_floor():
+    detector = AdaptiveSpeechDetector(20)
+    levels = noise(50, 150) + [3000] * 50 + noise(50, 100)
+    events = run(detector, levels)
+    assert [event for _, event in events] == [START, END]
+    start, end = events[0][0], events[1][0]
+    assert 150 <= start < 165
+    # Ends within the hangover after speech stops
+    assert 200 + detector.min_hangover_frames - 1 <= end < 200 + detector.max_hangover_frames
+
+
+def test_loud_room_raises_the_floor_instead_of_triggering():
+    detector = AdaptiveSpeechDetector(20)
+    # Background noise well above the fixed 500 RMS threshold used before
+    events = run(detector, noise(50, 100) + noise(900, 1000, seed=1))
+    # At most the step itself triggers once; after that the floor has adapted
+    assert len([e for e in events if e[1] == START]) <= 1
+    assert detector.floor.value > 500
+    assert not detector.in_speech
+    # Speech well above the new floor is still detected
+    assert run(detector, [8000] * 20)[0][1] == START
+
+
+def test_hangover_grows_with_pauses_inside_utterances():
+    detector = AdaptiveSpeechDetector(20)
+    run(detector, noise(50, 150))
+    initial = detector.hangover_frames
+    # Speech with regular 300 ms pauses that stay shorter than the hangover
+    run(detector, ([3000] * 20 + noise(50, 15)) * 5)
+    assert detector.in_speech
+    assert detector.hangover_frames > initial
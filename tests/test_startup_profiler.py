@@ -0,0 +1,27 @@
+import sys
+
+from src.startup_profiler import StartupProfiler
+
+
+def test_imports_are_charged_to_their_top_level_package(tmp_path, monkeypatch):
+    package = tmp_path / "slowpkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("import time\ntime.sleep(0.02)\nfrom . import child\n")
+    (package / "child.py").write_text("import time\ntime.sleep(0.01)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    profiler = StartupProfiler()
+    profiler.install()
+    try:
+        import slowpkg  # noqa: F401
+        profiler.mark("imported")
+    finally:
+        profiler.uninstall()
+        sys.modules.pop("slowpkg", None)
+        sys.modules.pop("slowpkg.child", None)
+
+    # Both modules' own time lands on the package, not on "time"
+    assert profiler.packages["slowpkg"] >= 0.03
+    assert profiler.packages.get("time", 0.0) < 0.01
+    report = profiler.format_report()
+    assert "slowpkg" in report and "imported" in report
@@ -0,0 +1,54 @@
+import threading
+
+from src.status_model import StatusPublisher, StatusSnapshot
+
+
+def test_unchanged_writes_do_not_move_the_stamp():
+    snapshot = StatusSnapshot(level=0, speaking=False)
+    snapshot.set("level", 5)
+    stamp = snapshot.stamp
+    snapshot.set("level", 5)
+    assert snapshot.stamp == stamp
+
+    snapshot.set("speaking", True)
+    assert snapshot.stamp != stamp
+    assert snapshot.read()[1] == {"level": 5, "speaking": True}
+
+
+def test_unknown_field_is_rejected():
+    snapshot = StatusSnapshot(level=0)
+    try:
+        snapshot.set("typo", 1)
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("expected KeyError")
+
+
+def test_publisher_coalesces_writes_between_ticks():
+    snapshot = StatusSnapshot(level=0)
+    published = []
+    publisher = StatusPublisher(snapshot, rate_hz=10)
+    publisher.add_sink(published.append)
+
+    for level in range(100):
+        snapshot.set("level", level)
+    publisher.publish()
+    publisher.publish()  # nothing changed since
+
+    assert published == [{"level": 99}]
+
+
+def test_concurrent_writers_on_separate_fields():
+    snapshot = StatusSnapshot(a=0, b=0)
+
+    def write(field):
+        for i in range(1, 5001):
+            snapshot.set(field, i)
+
+    threads = [threading.Thread(target=write, args=(f,)) for f in ("a", "b")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert snapshot.read()[1] == {"a": 5000, "b": 5000}
@@ -0,0 +1,28 @@
+from src.text_segmentation import SentenceBuffer, split_sentences
+
+
+def test_splits_on_terminal_punctuation_but_not_abbreviations_or_numbers():
+    text = "Dr. Smith arrived at 3.5 minutes past. Was it late? J. Doe said no! Then we left"
+    assert split_sentences(text) == [
+        "Dr. Smith arrived at 3.5 minutes past.",
+        "Was it late?",
+        "J. Doe said no!",
+        "Then we left",
+    ]
+
+
+def test_short_sentences_are_joined_with_the_next():
+    assert split_sentences("Sure. The meeting is at three.") == ["Sure. The meeting is at three."]
+    assert split_sentences("Sure. The meeting is at three.", min_chars=0) == ["Sure.", "The meeting is at three."]
+
+
+def test_streamed_tokens_release_sentences_once_complete():
+    buffer = SentenceBuffer()
+    released = []
+    for token in ["Here is what", " I found.", " The library", " opens at 9.", "30 today."]:
+        released.append(buffer.push(token))
+    # A period at the end of the text waits for the next token ("9." + "30")
+    assert released == [[], [], ["Here is what I found."], [], []]
+    assert buffer.push(" Bye") == ["The library opens at 9.30 today."]
+    assert buffer.flush() == "Bye"
+    assert buffer.flush() is None
@@ -0,0 +1,65 @@
+import asyncio
+import threading
+
+from src.data_protocol import MessageType, decode, encode_batch
+from src.transcript_streamer import TranscriptStreamer
+
+
+class FakeChannel:
+    def __init__(self):
+        self.packets = []
+        self._ids = iter(range(1, 1000))
+
+    def next_id(self):
+        return next(self._ids)
+
+    async def send_batch(self, messages):
+        # Round-trip through the wire format like the real channel
+        self.packets.append(decode(encode_batch(messages)))
+
+
+async def test_tokens_are_batched_until_the_final_reply():
+    channel = FakeChannel()
+    streamer = TranscriptStreamer(channel, max_delay_ms=1000, max_bytes=10_000)
+    streamer.start()
+
+    reply = streamer.reply()
+    for token in ("Hel", "lo", " there"):
+        reply.update(token)
+    reply.finish("Hello there")
+    await asyncio.sleep(0.01)
+
+    assert len(channel.packets) == 1
+    [packet] = channel.packets
+    assert [m.type for m in packet] == [MessageType.AGENT_TOKEN] * 3 + [MessageType.AGENT_REPLY]
+    assert [m.seq for m in packet] == [0, 1, 2, 3]
+    assert packet[-1].final and packet[-1].text == "Hello there"
+
+
+async def test_time_budget_flushes_partials():
+    channel = FakeChannel()
+    streamer = TranscriptStreamer(channel, max_delay_ms=20, max_bytes=10_000)
+    streamer.start()
+
+    transcript = streamer.transcript()
+    # Interim results arrive from the STT executor thread
+    thread = threading.Thread(target=transcript.update, args=("hello",))
+    thread.start()
+    thread.join()
+    await asyncio.sleep(0.05)
+
+    assert [[(m.type, m.text) for m in p] for p in channel.packets] == [
+        [(MessageType.TRANSCRIPT_INTERIM, "hello")]]
+
+
+async def test_byte_budget_splits_packets():
+    channel = FakeChannel()
+    streamer = TranscriptStreamer(channel, max_delay_ms=1000, max_bytes=40)
+    streamer.start()
+
+    reply = streamer.reply()
+    for _ in range(4):
+        reply.update("x" * 15)
+    await asyncio.sleep(0.01)
+
+    assert [len(p) for p in channel.packets] == [2, 2]
@@ -0,0 +1,47 @@
+import math
+from types import SimpleNamespace
+
+from src.transcription import TranscriptionResult
+
+
+def whisper_segment(text, start, end, avg_logprob=-0.2, no_speech_prob=0.05, words=None):
+    return SimpleNamespace(text=text, start=start, end=end, avg_logprob=avg_logprob,
+                           no_speech_prob=no_speech_prob, words=words)
+
+
+def whisper_word(word, start, end, probability=0.9):
+    return SimpleNamespace(word=word, start=start, end=end, probability=probability)
+
+
+def test_from_whisper_keeps_timings_and_statistics():
+    words = [whisper_word(" hello", 0.1, 0.4), whisper_word(" there", 0.5, 0.9, 0.7)]
+    result = TranscriptionResult.from_whisper(
+        [whisper_segment(" hello there ", 0.0, 1.0, words=words)],
+        SimpleNamespace(language="en", duration=1.2),
+    )
+    assert result.text == "hello there"
+    assert (result.language, result.duration) == ("en", 1.2)
+    assert [w.word for w in result.words] == [" hello", " there"]
+    assert result.speech_end == 0.9
+    assert math.isclose(result.confidence, math.exp(-0.2))
+    assert result.no_speech_prob == 0.05
+
+
+def test_confidence_is_weighted_by_segment_length():
+    result = TranscriptionResult.from_whisper([
+        whisper_segment("long and sure", 0.0, 3.0, avg_logprob=0.0),
+        whisper_segment("mumble", 3.0, 4.0, avg_logprob=math.log(0.2), no_speech_prob=0.5),
+    ])
+    assert math.isclose(result.confidence, (3 * 1.0 + 1 * 0.2) / 4)
+    assert result.no_speech_prob == 0.5
+    # Without word timings the last segment bounds the speech
+    assert result.speech_end == 4.0
+    assert result.words == []
+
+
+def test_empty_result():
+    result = TranscriptionResult.from_whisper([])
+    assert result.text == ""
+    assert result.confidence == 0.0
+    assert result.no_speech_prob == 1.0
+    assert result.speech_end is None
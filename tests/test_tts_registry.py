@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src import tts_registry
+from src.tts_registry import TTSRouter, register_backend
+
+
+class FakeEngine:
+    def __init__(self):
+        self.calls = []
+
+    async def synthesize(self, text):
+        self.calls.append(text)
+        # One second of 48 kHz audio per 15 characters
+        samples = int(48000 * len(text) / 15)
+        return SimpleNamespace(frame=SimpleNamespace(samples_per_channel=samples, sample_rate=48000))
+
+
+class StreamingEngine(FakeEngine):
+    async def synthesize_stream(self, text):
+        for sentence in text.split(". "):
+            yield await self.synthesize(sentence)
+
+
+@pytest.fixture
+def backends(monkeypatch):
+    monkeypatch.setattr(tts_registry, "_BACKENDS", {})
+    built = []
+
+    def factory(engine):
+        def build(sample_rate):
+            built.append(engine)
+            return engine
+        return build
+
+    register_backend("quality", factory(StreamingEngine()), streaming=True, rtf=2.0)
+    register_backend("fast", factory(FakeEngine()), rtf=0.1)
+    register_backend("unused", factory(FakeEngine()))
+    return built
+
+
+def test_unconfigured_backends_are_never_built(backends):
+    router = TTSRouter("quality", "fast")
+    router.load()
+    assert len(backends) == 2
+    assert set(router.profiles) == {"quality", "fast"}
+    with pytest.raises(ValueError):
+        TTSRouter("missing")
+
+
+async def test_short_replies_use_the_fast_engine(backends):
+    router = TTSRouter("quality", "fast", short_chars=20, latency_budget=100)
+    assert router.choose("Okay.") == "fast"
+    long_reply = "Here is a much longer answer. It has two sentences in it."
+    assert router.choose(long_reply) == "quality"
+
+    chunks = [c async for c in router.synthesize_stream(long_reply)]
+    assert len(chunks) == 2  # The quality engine streams sentence by sentence
+    assert router.profiles["quality"].requests == 1
+
+
+def test_slow_default_engine_falls_back_on_predicted_latency(backends):
+    router = TTSRouter("quality", "fast", short_chars=0, latency_budget=1.0)
+    router.load()
+    # rtf 2.0 on a 45-character first sentence predicts 6 s to first audio
+    reply = "This first sentence is forty-five characters. Then more."
+    assert router.choose(reply) == "fast"
+    router.profiles["quality"].rtf = 0.1
+    assert router.choose(reply) == "quality"
+
+
+def test_without_fast_engine_everything_uses_the_default(backends):
+    router = TTSRouter("quality")
+    assert router.choose("Hi.") == "quality"
@@ -0,0 +1,177 @@
+import asyncio
+from types import SimpleNamespace
+
+from src.command_router import CHAT, CommandRouter
+from src.turn_pipeline import Turn, TurnPipeline
+from src.turn_tracer import TurnTracer
+
+
+class FakeAgent:
+    def __init__(self, llm_delay=0.0):
+        self.commands = CommandRouter()
+        self.mode = CHAT
+        self.is_dictating = False
+        self.is_agent_speaking = False
+        self.llm_delay = llm_delay
+
+        @self.commands.command("ping", "ping")
+        def ping(match):
+            return "pong"
+
+    async def generate_response(self, text, turn=None, on_token=None, participant=None):
+        await asyncio.sleep(self.llm_delay)
+        return f"reply to {text}"
+
+
+class Recorder:
+    def __init__(self):
+        self.exports = []
+
+    def export(self, trace):
+        self.exports.append(trace.outcome)
+
+
+def make_pipeline(agent, max_pending=4):
+    spoken = []
+    speaking = []
+
+    async def speak(response, turn=None):
+        # Overlapping replies would show up as two speakers at once
+        speaking.append(response)
+        assert len(speaking) == 1
+        await asyncio.sleep(0.01)
+        spoken.append(response)
+        speaking.remove(response)
+        return 0.01, None
+
+    recorder = Recorder()
+    status = SimpleNamespace(set_speaking=lambda speaking: None)
+    pipeline = TurnPipeline(agent, status, TurnTracer([recorder]), None, speak,
+                            max_pending=max_pending, min_hold=0, echo_tail=0)
+    return pipeline, spoken, recorder
+
+
+async def test_turns_run_in_submission_order_without_overlap():
+    pipeline, spoken, _ = make_pipeline(FakeAgent(llm_delay=0.01))
+    assert pipeline.submit(Turn("first", source="text"))
+    assert pipeline.submit(Turn("ping", source="text"))
+    assert pipeline.submit(Turn("third", source="text"))
+    await pipeline.join()
+    assert spoken == ["reply to first", "pong", "reply to third"]
+    await pipeline.close()
+
+
+async def test_short_voice_transcripts_are_dropped():
+    pipeline, spoken, recorder = make_pipeline(FakeAgent())
+    tracer = pipeline.tracer
+    assert not pipeline.submit(Turn(" uh ", trace=tracer.start_turn()))
+    assert pipeline.submit(Turn("ok", source="text"))
+    await pipeline.join()
+    assert recorder.exports == ["empty_transcript"]
+    assert spoken == ["reply to ok"]
+    await pipeline.close()
+
+
+async def test_full_queue_rejects_new_turns():
+    pipeline, spoken, recorder = make_pipeline(FakeAgent(llm_delay=0.05), max_pending=1)
+    tracer = pipeline.tracer
+    assert pipeline.submit(Turn("running", source="text"))
+    await asyncio.sleep(0)  # Worker picks up the first turn
+    assert pipeline.submit(Turn("waiting", source="text"))
+    assert not pipeline.submit(Turn("overflow", source="text", trace=tracer.start_turn()))
+    await pipeline.join()
+    assert spoken == ["reply to running", "reply to waiting"]
+    assert recorder.exports == ["rejected"]
+    assert pipeline.turns_rejected == 1
+    await pipeline.close()
+
+
+async def test_cancel_aborts_running_and_pending_turns():
+    agent = FakeAgent(llm_delay=1.0)
+    pipeline, spoken, recorder = make_pipeline(agent)
+    tracer = pipeline.tracer
+    pipeline.submit(Turn("slow", source="text", trace=tracer.start_turn()))
+    pipeline.submit(Turn("queued", source="text", trace=tracer.start_turn()))
+    await asyncio.sleep(0.01)
+    assert pipeline.cancel() == 1
+    await asyncio.wait_for(pipeline.join(), 0.5)
+    assert spoken == []
+    assert sorted(recorder.exports) == ["cancelled", "cancelled"]
+    assert not agent.is_agent_speaking
+
+    # The worker keeps serving turns after a cancel
+    agent.llm_delay = 0
+    pipeline.submit(Turn("again", source="text"))
+    await pipeline.join()
+    assert spoken == ["reply to again"]
+    await pipeline.close()
+
+
+class StreamingAgent(FakeAgent):
+    async def generate_response(self, text, turn=None, on_token=None, participant=None):
+        on_token("Half a")
+        on_token(" reply")
+        await asyncio.sleep(1.0)
+        return "never sent"
+
+
+class FakeStreamer:
+    def __init__(self):
+        self.replies = []
+
+    def reply(self):
+        stream = SimpleNamespace(tokens=[], final=None)
+        stream.update = stream.tokens.append
+        stream.finish = lambda text: setattr(stream, "final", text)
+        self.replies.append(stream)
+        return stream
+
+
+async def test_cancelled_reply_is_finished_with_the_streamed_text():
+    pipeline, spoken, _ = make_pipeline(StreamingAgent())
+    pipeline.streamer = streamer = FakeStreamer()
+    pipeline.submit(Turn("talk", source="text"))
+    await asyncio.sleep(0.01)
+    pipeline.cancel()
+    await asyncio.wait_for(pipeline.join(), 0.5)
+    [reply] = streamer.replies
+    assert reply.tokens == ["Half a", " reply"]
+    assert reply.final == "Half a reply"
+    assert spoken == []
+    await pipeline.close()
+
+
+async def test_cancel_for_one_participant_keeps_the_others_turns():
+    agent = FakeAgent(llm_delay=0.05)
+    pipeline, spoken, recorder = make_pipeline(agent)
+    tracer = pipeline.tracer
+    pipeline.submit(Turn("running", "alice", "text", tracer.start_turn()))
+    pipeline.submit(Turn("alice again", "alice", "text", tracer.start_turn()))
+    pipeline.submit(Turn("bob waits", "bob", "text"))
+    await asyncio.sleep(0.01)
+    assert pipeline.cancel("alice") == 1
+    await asyncio.wait_for(pipeline.join("alice"), 0.5)
+    assert recorder.exports == ["cancelled", "cancelled"]
+    await asyncio.wait_for(pipeline.join("bob"), 0.5)
+    assert spoken == ["reply to bob waits"]
+    await pipeline.join()
+    await pipeline.close()
+
+
+async def test_microphone_reopens_when_playout_ends_not_after_a_duration_hold():
+    agent = FakeAgent()
+    played = asyncio.get_running_loop().create_future()
+
+    async def speak(response, turn=None):
+        # A streaming engine: most of the reply has played by the time it is queued
+        return 10.0, played
+
+    status = SimpleNamespace(set_speaking=lambda speaking: None)
+    pipeline = TurnPipeline(agent, status, TurnTracer([]), None, speak, echo_tail=0.01)
+    pipeline.submit(Turn("hello", source="text"))
+    await asyncio.sleep(0.01)
+    assert agent.is_agent_speaking
+    played.set_result(None)
+    await asyncio.wait_for(pipeline.join(), 0.5)
+    assert not agent.is_agent_speaking
+    await pipeline.close()
@@ -0,0 +1,52 @@
+import json
+
+from src.turn_tracer import JsonlSpanExporter, TurnTracer, percentile
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile([], 50) is None
+
+
+def test_mark_keeps_first_occurrence():
+    tracer = TurnTracer()
+    turn = tracer.start_turn("user-1")
+    turn.mark("llm_first_token", 1.0)
+    turn.mark("llm_first_token", 2.0)
+    assert turn.events["llm_first_token"] == 1.0
+
+
+def test_stages_and_summary():
+    tracer = TurnTracer()
+    for offset in (0.1, 0.2, 0.3):
+        turn = tracer.start_turn("user-1")
+        turn.mark("stt_start", 10.0)
+        turn.mark("stt_end", 10.0 + offset)
+        turn.mark("endpoint", 9.9)
+        tracer.finish(turn)
+
+    summary = tracer.summary()
+    assert summary["stt"]["count"] == 3
+    assert abs(summary["stt"]["p50_ms"] - 200.0) < 1e-6
+    assert abs(summary["stt"]["p95_ms"] - 300.0) < 1e-6
+    # Stages without both events are not reported
+    assert "llm" not in summary
+    assert "stt" in tracer.format_summary()
+
+
+def test_jsonl_exporter(tmp_path):
+    path = tmp_path / "turns.jsonl"
+    tracer = TurnTracer([JsonlSpanExporter(str(path))])
+    turn = tracer.start_turn("user-1", source="text")
+    turn.mark("llm_start", 1.0)
+    turn.mark("llm_last_token", 1.5)
+    tracer.finish(turn, "no_response")
+    tracer.close()
+
+    record = json.loads(path.read_text().strip())
+    assert record["turn_id"] == turn.turn_id
+    assert record["source"] == "text"
+    assert record["outcome"] == "no_response"
+    assert record["stages"]["llm"] == 0.5
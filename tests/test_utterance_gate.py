@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.utterance_gate import UtteranceGate
+
+RATE = 16000
+THRESHOLD = 300
+
+
+def voiced(seconds, f0=150, amplitude=4000):
+    """Harmonic signal with a syllable-rate envelope, a stand-in for speech"""
+    t = np.arange(int(seconds * RATE)) / RATE
+    signal = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 8))
+    envelope = 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t)
+    return (amplitude * signal * envelope / 2).astype(np.int16)
+
+
+def test_accepts_voiced_audio():
+    decision = UtteranceGate().check(voiced(1.0), RATE, THRESHOLD)
+    assert decision.accepted, decision
+
+
+def test_rejects_noise_burst_on_flatness():
+    noise = np.random.default_rng(0).normal(0, 3000, RATE).astype(np.int16)
+    decision = UtteranceGate().check(noise, RATE, THRESHOLD)
+    assert (decision.accepted, decision.reason) == (False, "flatness")
+
+
+def test_rejects_clicks_and_short_clips():
+    gate = UtteranceGate()
+    clicks = np.zeros(RATE, dtype=np.int16)
+    clicks[::RATE // 8] = 30000  # Eight isolated keyboard-like clicks
+    assert gate.check(clicks, RATE, THRESHOLD).reason == "speech_ratio"
+    assert gate.check(voiced(0.1), RATE, THRESHOLD).reason == "duration"
+    assert gate.rejected == 2
+
+
+def test_whisper_feedback_moves_thresholds(tmp_path):
+    gate = UtteranceGate(dump_dir=str(tmp_path))
+    decision = gate.check(voiced(1.0), RATE, THRESHOLD)
+    ratio, flatness = gate.min_speech_ratio, gate.max_flatness
+
+    junk = [SimpleNamespace(no_speech_prob=0.9, avg_logprob=-1.5)]
+    gate.feedback(decision, junk)
+    assert gate.min_speech_ratio > ratio
+    assert gate.max_flatness < flatness
+
+    # Rejected clips are saved for tuning
+    gate.check(voiced(0.1), RATE, THRESHOLD)
+    assert len(list(tmp_path.glob("*_duration.wav"))) == 1